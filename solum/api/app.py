@@ -27,7 +27,10 @@ API_SERVICE_OPTS = [
                help='The port for the solum API server'),
     cfg.StrOpt('host',
                default='127.0.0.1',
-               help='The listen IP for the solum API server')
+               help='The listen IP for the solum API server'),
+    cfg.IntOpt('workers',
+               default=1,
+               help='Number of worker processes for the solum API server'),
 ]
 
 API_PLAN_OPTS = [
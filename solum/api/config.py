@@ -15,13 +15,14 @@
 # under the License.
 
 from solum.api import auth
+from solum.api.controllers.v1 import conditional
 
 # Pecan Application Configurations
 app = {
     'root': 'solum.api.controllers.root.RootController',
     'modules': ['solum.api'],
     'debug': False,
-    'hooks': [auth.AuthInformationHook()]
+    'hooks': [auth.AuthInformationHook(), conditional.NotModifiedHook()]
 }
 
 # Custom Configurations must be in Python dictionary format::
@@ -15,9 +15,12 @@
 import pecan
 from pecan import rest
 import wsme
+from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import assembly
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import assembly_handler
 from solum.common import exception
 from solum import objects
@@ -32,13 +35,22 @@ class AssemblyController(rest.RestController):
         self._id = assembly_id
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose(assembly.Assembly)
-    def get(self):
-        """Return this assembly."""
+    @wsme_pecan.wsexpose(assembly.Assembly, wtypes.text)
+    def get(self, wait_for_change=None):
+        """Return this assembly.
+
+        With wait_for_change set to the status the client last saw, the
+        request is long-polled: the response is held back until the
+        status moves on, or the watch times out.
+        """
         handler = assembly_handler.AssemblyHandler(
             pecan.request.security_context)
-        return assembly.Assembly.from_db_model(handler.get(self._id),
-                                               pecan.request.host_url)
+        if wait_for_change is None:
+            db_obj = handler.get(self._id)
+        else:
+            db_obj = handler.watch(self._id, wait_for_change)
+        conditional.check(db_obj)
+        return assembly.Assembly.from_db_model(db_obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(assembly.Assembly, body=assembly.Assembly)
@@ -97,10 +109,13 @@ class AssembliesController(rest.RestController):
             handler.create(js_data), pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose([assembly.Assembly])
-    def get_all(self):
+    @wsme_pecan.wsexpose([assembly.Assembly], wtypes.text, int, wtypes.text,
+                         wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all assemblies, based on the query provided."""
         handler = assembly_handler.AssemblyHandler(
             pecan.request.security_context)
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
         return [assembly.Assembly.from_db_model(assm, pecan.request.host_url)
-                for assm in handler.get_all()]
+                for assm in page]
@@ -12,9 +12,12 @@
 
 import pecan
 from pecan import rest
+from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import component
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import component_handler
 from solum.common import exception
 from solum import objects
@@ -33,8 +36,10 @@ class ComponentController(rest.RestController):
         """Return this component."""
         handler = component_handler.ComponentHandler(
             pecan.request.security_context)
-        return component.Component.from_db_model(handler.get(self._id),
-                                                 pecan.request.host_url)
+        db_obj = handler.get(self._id)
+        conditional.check(db_obj)
+        return component.Component.from_db_model(
+            db_obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(component.Component, body=component.Component)
@@ -76,10 +81,13 @@ class ComponentsController(rest.RestController):
             pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose([component.Component])
-    def get_all(self):
+    @wsme_pecan.wsexpose([component.Component], wtypes.text, int, wtypes.text,
+                         wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all components, based on the query provided."""
         handler = component_handler.ComponentHandler(
             pecan.request.security_context)
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
         return [component.Component.from_db_model(ser, pecan.request.host_url)
-                for ser in handler.get_all()]
+                for ser in page]
@@ -0,0 +1,115 @@
+# Copyright 2014 - Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Conditional GET of v1 resources and collections.
+
+Responses carry an ``ETag`` computed from the column values of the
+stored rows they are rendered from, and single resources a
+``Last-Modified`` date as well. When the ``If-None-Match`` (or, without
+one, ``If-Modified-Since``) header of a request shows that the client
+already has the current representation, NotModified is raised before
+anything is serialized and the request is answered with an empty 304.
+"""
+
+import calendar
+import datetime
+import email.utils
+import hashlib
+
+import pecan
+from pecan import hooks
+import six
+
+from solum.common import exception
+
+
+def _etag(objs):
+    # updated_at alone does not tell two saves within a second apart where
+    # the database keeps whole seconds, so the tag covers every column of
+    # the row. Only the row's own columns are read: unlike as_dict() this
+    # never loads related rows, and nothing is rendered.
+    digest = hashlib.md5()
+    for part in (pecan.request.host_url,
+                 pecan.request.pecan.get('content_type')):
+        digest.update(_bytes(part))
+    for obj in objs:
+        for value in _fields(obj):
+            digest.update(_bytes('%r\0' % (value,)))
+        digest.update(b'\n')
+    return '"%s"' % digest.hexdigest()
+
+
+def _fields(obj):
+    table = getattr(obj, '__table__', None)
+    if table is None:
+        return [getattr(obj, 'id', None), getattr(obj, 'uuid', None),
+                getattr(obj, 'updated_at', None) or
+                getattr(obj, 'created_at', None)]
+    return [getattr(obj, column.name, None) for column in table.columns]
+
+
+def _bytes(value):
+    return six.text_type(value).encode('utf-8')
+
+
+def _timestamp(obj):
+    stamp = getattr(obj, 'updated_at', None) or getattr(obj, 'created_at',
+                                                        None)
+    if isinstance(stamp, datetime.datetime):
+        return calendar.timegm(stamp.utctimetuple())
+    return None
+
+
+def _check(objs, modified):
+    etag = _etag(objs)
+    pecan.response.headers['ETag'] = etag
+    if modified is not None:
+        pecan.response.headers['Last-Modified'] = email.utils.formatdate(
+            modified, usegmt=True)
+
+    headers = pecan.request.headers
+    if_none_match = headers.get('If-None-Match')
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        if '*' in tags or etag in tags or 'W/' + etag in tags:
+            raise exception.NotModified()
+        return
+
+    since = headers.get('If-Modified-Since')
+    if since and modified is not None:
+        since = email.utils.parsedate_tz(since)
+        if since is not None and modified <= email.utils.mktime_tz(since):
+            raise exception.NotModified()
+
+
+def check(obj):
+    """Set the validators of a resource and honour the request's ones."""
+    _check([obj], _timestamp(obj))
+
+
+def check_list(objs):
+    """Set the ETag of a collection and honour If-None-Match.
+
+    Collections have no Last-Modified, as removing an item from one does
+    not move the timestamp of any of the remaining items.
+    """
+    _check(objs, None)
+
+
+class NotModifiedHook(hooks.PecanHook):
+    """Drop the body rendered for NotModified from 304 responses."""
+
+    def after(self, state):
+        if state.response.status_int == 304:
+            state.response.body = ''
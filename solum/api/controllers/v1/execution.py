@@ -17,6 +17,7 @@ from pecan import rest
 from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import execution
 from solum.api.handlers import pipeline_handler
 from solum.common import exception
@@ -31,6 +32,8 @@ class ExecutionsController(rest.RestController):
         """Return all executions, based on the provided pipeline_id."""
         handler = pipeline_handler.PipelineHandler(
             pecan.request.security_context)
+        executions = handler.get(pipeline_id).executions
+        conditional.check_list(executions)
         return [execution.Execution.from_db_model(obj,
                                                   pecan.request.host_url)
-                for obj in handler.get(pipeline_id).executions]
+                for obj in executions]
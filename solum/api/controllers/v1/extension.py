@@ -15,7 +15,9 @@ from pecan import rest
 from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import extension
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import extension_handler
 from solum.common import exception
 from solum import objects
@@ -33,8 +35,10 @@ class ExtensionController(rest.RestController):
         """Return this extension."""
         handler = extension_handler.ExtensionHandler(
             pecan.request.security_context)
-        return extension.Extension.from_db_model(handler.get(self._id),
-                                                 pecan.request.host_url)
+        db_obj = handler.get(self._id)
+        conditional.check(db_obj)
+        return extension.Extension.from_db_model(
+            db_obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(extension.Extension, wtypes.text,
@@ -77,10 +81,13 @@ class ExtensionsController(rest.RestController):
         return extension.Extension.from_db_model(obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose([extension.Extension])
-    def get_all(self):
+    @wsme_pecan.wsexpose([extension.Extension], wtypes.text, int, wtypes.text,
+                         wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all extensions, based on the query provided."""
         handler = extension_handler.ExtensionHandler(
             pecan.request.security_context)
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
         return [extension.Extension.from_db_model(obj, pecan.request.host_url)
-                for obj in handler.get_all()]
+                for obj in page]
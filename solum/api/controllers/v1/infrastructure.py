@@ -14,9 +14,12 @@
 
 import pecan
 from pecan import rest
+from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import infrastructure
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import infrastructure_handler
 from solum.common import exception
 from solum import objects
@@ -35,8 +38,10 @@ class InfrastructureStackController(rest.RestController):
         """Return this stack."""
         handler = infrastructure_handler.InfrastructureStackHandler(
             pecan.request.security_context)
+        db_obj = handler.get(self._id)
+        conditional.check(db_obj)
         return infrastructure.InfrastructureStack.from_db_model(
-            handler.get(self._id), pecan.request.host_url)
+            db_obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(infrastructure.InfrastructureStack,
@@ -82,13 +87,16 @@ class InfrastructureStacksController(rest.RestController):
             pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose([infrastructure.InfrastructureStack])
-    def get_all(self):
+    @wsme_pecan.wsexpose([infrastructure.InfrastructureStack], wtypes.text,
+                         int, wtypes.text, wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all stacks, based on the query provided."""
         handler = infrastructure_handler.InfrastructureStackHandler(
             pecan.request.security_context)
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
         return [infrastructure.InfrastructureStack.from_db_model(
-            assm, pecan.request.host_url) for assm in handler.get_all()]
+            assm, pecan.request.host_url) for assm in page]
 
 
 class InfrastructureController(rest.RestController):
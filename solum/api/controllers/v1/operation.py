@@ -15,7 +15,9 @@ from pecan import rest
 from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import operation
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import operation_handler
 from solum.common import exception
 from solum import objects
@@ -34,8 +36,10 @@ class OperationController(rest.RestController):
         """Return this operation."""
         handler = operation_handler.OperationHandler(
             pecan.request.security_context)
-        return operation.Operation.from_db_model(handler.get(self._id),
-                                                 pecan.request.host_url)
+        db_obj = handler.get(self._id)
+        conditional.check(db_obj)
+        return operation.Operation.from_db_model(
+            db_obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(operation.Operation, wtypes.text,
@@ -77,10 +81,13 @@ class OperationsController(rest.RestController):
             data.as_dict(objects.registry.Operation)), pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose([operation.Operation])
-    def get_all(self):
+    @wsme_pecan.wsexpose([operation.Operation], wtypes.text, int, wtypes.text,
+                         wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all operations, based on the query provided."""
         handler = operation_handler.OperationHandler(
             pecan.request.security_context)
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
         return [operation.Operation.from_db_model(obj, pecan.request.host_url)
-                for obj in handler.get_all()]
+                for obj in page]
@@ -0,0 +1,78 @@
+# Copyright 2014 - Rackspace
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Paging of v1 collection listings.
+
+Collections are paged with the ``marker``, ``limit``, ``sort_key`` and
+``sort_dir`` query parameters. When a page is full, the URL of the next
+page is advertised in a ``Link: <...>; rel="next"`` response header so
+that the response body remains a plain list.
+"""
+
+from oslo.config import cfg
+import pecan
+from six.moves import urllib
+
+from solum.api.controllers.v1 import conditional
+from solum.common import exception
+from solum.openstack.common.gettextutils import _
+
+PAGINATION_OPTS = [
+    cfg.IntOpt('default_page_size',
+               default=100,
+               help='Number of items returned by a collection listing '
+                    'when the request does not give a limit'),
+    cfg.IntOpt('max_page_size',
+               default=1000,
+               help='Maximum number of items returned by a collection '
+                    'listing'),
+]
+
+cfg.CONF.register_opts(PAGINATION_OPTS, group='api')
+
+
+def get_limit(limit):
+    """Return the page size to use for the requested limit."""
+    if limit is None:
+        limit = cfg.CONF.api.default_page_size
+    try:
+        limit = int(limit)
+    except ValueError:
+        limit = 0
+    if limit <= 0:
+        raise exception.BadRequest(
+            reason=_('Limit must be a positive integer.'))
+    return min(limit, cfg.CONF.api.max_page_size)
+
+
+def get_page(handler, marker=None, limit=None, sort_key=None,
+             sort_dir=None):
+    """Return one page of handler.get_all() and link the next one.
+
+    Raises NotModified when the client already has the page.
+    """
+    limit = get_limit(limit)
+    items = handler.get_all(marker=marker, limit=limit, sort_key=sort_key,
+                            sort_dir=sort_dir)
+    if items and len(items) == limit:
+        params = [('limit', limit), ('marker', items[-1].uuid)]
+        if sort_key:
+            params.append(('sort_key', sort_key))
+        if sort_dir:
+            params.append(('sort_dir', sort_dir))
+        next_url = '%s?%s' % (pecan.request.path_url,
+                              urllib.parse.urlencode(params))
+        pecan.response.headers['Link'] = '<%s>; rel="next"' % next_url
+    conditional.check_list(items)
+    return items
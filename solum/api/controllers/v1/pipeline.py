@@ -15,10 +15,13 @@
 import pecan
 from pecan import rest
 import wsme
+from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import pipeline
 from solum.api.controllers.v1 import execution
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import pipeline_handler
 from solum.common import exception
 from solum import objects
@@ -40,8 +43,9 @@ class PipelineController(rest.RestController):
         """Return this pipeline."""
         handler = pipeline_handler.PipelineHandler(
             pecan.request.security_context)
-        return pipeline.Pipeline.from_db_model(handler.get(self._id),
-                                               pecan.request.host_url)
+        db_obj = handler.get(self._id)
+        conditional.check(db_obj)
+        return pipeline.Pipeline.from_db_model(db_obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(pipeline.Pipeline, body=pipeline.Pipeline)
@@ -101,10 +105,13 @@ class PipelinesController(rest.RestController):
             handler.create(js_data), pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose([pipeline.Pipeline])
-    def get_all(self):
+    @wsme_pecan.wsexpose([pipeline.Pipeline], wtypes.text, int, wtypes.text,
+                         wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all pipelines."""
         handler = pipeline_handler.PipelineHandler(
             pecan.request.security_context)
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
         return [pipeline.Pipeline.from_db_model(obj, pecan.request.host_url)
-                for obj in handler.get_all()]
+                for obj in page]
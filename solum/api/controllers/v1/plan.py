@@ -12,19 +12,36 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import json
 import sys
 
+from oslo.config import cfg
 from oslo.db import exception as db_exc
 import pecan
 from pecan import rest
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import plan
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import plan_handler
 from solum.common import exception
 from solum.common import yamlutils
 from solum import objects
 
+PLAN_RESPONSE_OPTS = [
+    cfg.IntOpt('plan_response_cache_size',
+               default=4096,
+               help='Number of rendered plans each API process keeps for '
+                    'listing plans. 0 renders every plan on each request.'),
+]
+
+cfg.CONF.register_opts(PLAN_RESPONSE_OPTS, group='api')
+
+# (uuid, updated_at, host_url, format) -> (raw_content, rendered plan)
+_rendered = collections.OrderedDict()
+
 
 def init_plan_v1(yml_input_plan):
     plan_handler_v1 = plan_handler.PlanHandler(
@@ -52,6 +69,52 @@ def yaml_content(m):
     return ref_content
 
 
+def response_format():
+    """Return 'json' when the client asked for JSON, otherwise 'yaml'."""
+    if pecan.request.pecan.get('content_type') == 'application/json':
+        return 'json'
+    return 'yaml'
+
+
+def _render_list_item(m, fmt):
+    """Render plan m as an item of a list response, reusing past renders.
+
+    Loads of an unchanged plan share their raw_content object (see
+    solum.objects.sqlalchemy.plan), so a cached render is only used
+    while the raw_content it was made from is the plan's current one.
+    """
+    key = (m.uuid, m.updated_at, pecan.request.host_url, fmt)
+    raw_content = m.raw_content
+    entry = _rendered.pop(key, None)
+    if entry is None or entry[0] is not raw_content:
+        content = yaml_content(m)
+        if fmt == 'json':
+            text = json.dumps(content)
+        else:
+            text = yamlutils.dump([content])
+        entry = (raw_content, text)
+    cache_size = cfg.CONF.api.plan_response_cache_size
+    if cache_size > 0:
+        _rendered[key] = entry
+        while len(_rendered) > cache_size:
+            _rendered.popitem(last=False)
+    return entry[1]
+
+
+def render_plans(plans, fmt):
+    """Render a list response from the items of each plan."""
+    items = [_render_list_item(m, fmt) for m in plans if m and m.raw_content]
+    if fmt == 'json':
+        return '[%s]' % ', '.join(items)
+    return ''.join(items) or yamlutils.dump([])
+
+
+def render_plan(m, fmt):
+    if fmt == 'json':
+        return json.dumps(yaml_content(m))
+    return yamlutils.dump(yaml_content(m))
+
+
 class PlanController(rest.RestController):
     """Manages operations on a single plan."""
 
@@ -61,12 +124,15 @@ class PlanController(rest.RestController):
 
     @exception.wrap_pecan_controller_exception
     @pecan.expose(content_type='application/x-yaml')
+    @pecan.expose(content_type='application/json')
     def get(self):
         """Return this plan."""
         handler = plan_handler.PlanHandler(pecan.request.security_context)
-        plan_yml = yamlutils.dump(yaml_content(handler.get(self._id)))
+        db_obj = handler.get(self._id)
+        conditional.check(db_obj)
+        plan_serialized = render_plan(db_obj, response_format())
         pecan.response.status = 200
-        return plan_yml
+        return plan_serialized
 
     @exception.wrap_pecan_controller_exception
     @pecan.expose(content_type='application/x-yaml')
@@ -126,11 +192,12 @@ class PlansController(rest.RestController):
 
     @exception.wrap_pecan_controller_exception
     @pecan.expose(content_type='application/x-yaml')
-    def get_all(self):
+    @pecan.expose(content_type='application/json')
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all plans, based on the query provided."""
         handler = plan_handler.PlanHandler(pecan.request.security_context)
-        plan_yml = yamlutils.dump([yaml_content(obj)
-                                   for obj in handler.get_all()
-                                   if obj and obj.raw_content])
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
+        plans_serialized = render_plans(page, response_format())
         pecan.response.status = 200
-        return plan_yml
+        return plans_serialized
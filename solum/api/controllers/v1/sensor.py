@@ -15,7 +15,9 @@ from pecan import rest
 from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import sensor
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import sensor_handler
 from solum.common import exception
 from solum import objects
@@ -33,8 +35,9 @@ class SensorController(rest.RestController):
     def get(self):
         """Return this sensor."""
         handler = sensor_handler.SensorHandler(pecan.request.security_context)
-        return sensor.Sensor.from_db_model(handler.get(self._id),
-                                           pecan.request.host_url)
+        db_obj = handler.get(self._id)
+        conditional.check(db_obj)
+        return sensor.Sensor.from_db_model(db_obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(sensor.Sensor, wtypes.text, body=sensor.Sensor)
@@ -72,9 +75,12 @@ class SensorsController(rest.RestController):
         return sensor.Sensor.from_db_model(obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose([sensor.Sensor])
-    def get_all(self):
+    @wsme_pecan.wsexpose([sensor.Sensor], wtypes.text, int, wtypes.text,
+                         wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all sensors, based on the query provided."""
         handler = sensor_handler.SensorHandler(pecan.request.security_context)
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
         return [sensor.Sensor.from_db_model(obj, pecan.request.host_url)
-                for obj in handler.get_all()]
+                for obj in page]
@@ -12,9 +12,12 @@
 
 import pecan
 from pecan import rest
+from wsme import types as wtypes
 import wsmeext.pecan as wsme_pecan
 
+from solum.api.controllers.v1 import conditional
 from solum.api.controllers.v1.datamodel import service
+from solum.api.controllers.v1 import pagination
 from solum.api.handlers import service_handler
 from solum.common import exception
 from solum import objects
@@ -33,8 +36,9 @@ class ServiceController(rest.RestController):
         """Return this service."""
         handler = service_handler.ServiceHandler(
             pecan.request.security_context)
-        return service.Service.from_db_model(handler.get(self._id),
-                                             pecan.request.host_url)
+        db_obj = handler.get(self._id)
+        conditional.check(db_obj)
+        return service.Service.from_db_model(db_obj, pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
     @wsme_pecan.wsexpose(service.Service, body=service.Service)
@@ -76,10 +80,13 @@ class ServicesController(rest.RestController):
             pecan.request.host_url)
 
     @exception.wrap_wsme_controller_exception
-    @wsme_pecan.wsexpose([service.Service])
-    def get_all(self):
+    @wsme_pecan.wsexpose([service.Service], wtypes.text, int, wtypes.text,
+                         wtypes.text)
+    def get_all(self, marker=None, limit=None, sort_key=None, sort_dir=None):
         """Return all services, based on the query provided."""
         handler = service_handler.ServiceHandler(
             pecan.request.security_context)
+        page = pagination.get_page(handler, marker, limit, sort_key,
+                                   sort_dir)
         return [service.Service.from_db_model(ser, pecan.request.host_url)
-                for ser in handler.get_all()]
+                for ser in page]
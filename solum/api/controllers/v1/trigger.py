@@ -13,32 +13,27 @@
 
 import json
 
-import httplib2
 from oslo.config import cfg
 import pecan
 from pecan import rest
 import six
 
-from solum.api.handlers import assembly_handler
-from solum.api.handlers import pipeline_handler
+from solum.common import context
 from solum.common import exception
+from solum.conductor import api as conductor_api
+from solum import objects
 from solum.openstack.common import log as logging
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
 
-def _is_repo_collaborator(api_url, private_repo):
-    if private_repo:
-        # Only collaborators can review and comment on a private repo
-        return True
+def _check_trigger(trigger_id):
+    """Raise ResourceNotFound unless an assembly or pipeline has trigger_id."""
     try:
-        resp, _ = httplib2.Http().request(api_url)
-        if resp['status'] == '204':
-            return True
-    except httplib2.HttpLib2Error as ex:
-        LOG.info("Error in verifying collaborator %s" % ex)
-    return False
+        objects.registry.Assembly.get_by_trigger_id(None, trigger_id)
+    except exception.ResourceNotFound:
+        objects.registry.Pipeline.get_by_trigger_id(None, trigger_id)
 
 
 class TriggerController(rest.RestController):
@@ -50,6 +45,8 @@ class TriggerController(rest.RestController):
         """Trigger a new event on Solum."""
         commit_sha = ''
         status_url = None
+        collab_url = None
+        ref = None
         try:
             body = json.loads(pecan.request.body)
             if ('sender' in body and 'url' in body['sender'] and
@@ -61,29 +58,34 @@ class TriggerController(rest.RestController):
                     private_repo = body['repository']['private']
                     # An example of collab_url
                     # https://api.github.com/repos/:user/:repo/collaborators{/collaborator}
-                    collab_url = body['repository']['collaborators_url']
-                    api_collab_url = collab_url.format(
-                        **{'/collaborator': '/' + commenter})
-                    err_msg = None
                     if (phrase.strip('. ').lower() !=
                             CONF.api.rebuild_phrase.lower()):
                         err_msg = 'Rebuild phrase does not match'
-                    elif (not _is_repo_collaborator(api_collab_url,
-                                                    private_repo)):
-                        err_msg = 'User {0} not allowed to do rebuild'.format(
-                            commenter)
-                    else:
-                        commit_sha = body['comment']['commit_id']
-
-                    if err_msg:
                         LOG.info(err_msg)
                         pecan.response.status = 403
                         pecan.response.text = six.text_type(err_msg)
                         return
+                    if not private_repo:
+                        # Only collaborators can review and comment on a
+                        # private repo, anyone else is checked by the
+                        # conductor.
+                        collab_url = body['repository'][
+                            'collaborators_url'].format(
+                                **{'/collaborator': '/' + commenter})
+                    commit_sha = body['comment']['commit_id']
                 elif 'pull_request' in body:
                     # Process a GitHub pull request
                     commit_sha = body['pull_request']['head']['sha']
 
+                # The branch or pull request the event is for, events
+                # on one only supersede older events on the same one.
+                if 'pull_request' in body:
+                    ref = 'pull/%s' % body['pull_request']['number']
+                elif 'ref' in body:
+                    ref = body['ref']
+                else:
+                    ref = commit_sha or None
+
                 # An exmaple of Github statuses_url
                 # https://api.github.com/repos/:user/:repo/statuses/{sha}
                 if commit_sha:
@@ -92,11 +94,13 @@ class TriggerController(rest.RestController):
         except StandardError:
             LOG.info("Expected fields not found in request body.")
 
-        try:
-            handler = assembly_handler.AssemblyHandler(None)
-            handler.trigger_workflow(trigger_id, commit_sha, status_url)
-        except exception.ResourceNotFound:
-            handler = pipeline_handler.PipelineHandler(None)
-            handler.trigger_workflow(trigger_id)
+        # GitHub gives up on a webhook after 10 seconds and delivers it
+        # again, so only check the trigger exists and leave the rest of
+        # the work to the conductor.
+        _check_trigger(trigger_id)
+        conductor_api.API(context=context.RequestContext()).trigger_workflow(
+            trigger_id=trigger_id, commit_sha=commit_sha,
+            status_url=status_url, collab_url=collab_url,
+            event=pecan.request.headers.get('X-GitHub-Event'), ref=ref)
 
         pecan.response.status = 202
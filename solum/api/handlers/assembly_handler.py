@@ -12,14 +12,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import time
 import uuid
 
 from oslo.config import cfg
 
 from solum.api.handlers import handler
-from solum.common import context
+from solum.common import clients
 from solum.common import exception
+from solum.common import github
 from solum.common import solum_keystoneclient
+from solum.common import watch
 from solum.deployer import api as deploy_api
 from solum import objects
 from solum.objects import assembly
@@ -38,6 +41,16 @@ API_SERVICE_OPTS = [
     cfg.StrOpt('rebuild_phrase',
                default='solum retry tests',
                help='Comment phrase to trigger rebuilding'),
+    cfg.IntOpt('watch_timeout',
+               default=60,
+               help='Longest time in seconds a long-polling request for an '
+                    'assembly status change is held open'),
+    cfg.IntOpt('watch_poll_interval',
+               default=2,
+               help='Interval in seconds at which each API process reads '
+                    'the status of all assemblies its requests are '
+                    'waiting on, to pick up changes made by other '
+                    'services'),
 ]
 
 LOG = logging.getLogger(__name__)
@@ -50,6 +63,17 @@ CONF.register_opts(API_SERVICE_OPTS, opt_group)
 ASSEMBLY_STATES = assembly.States
 IMAGE_STATES = image.States
 
+_status_poller = None
+
+
+def _get_status_poller():
+    global _status_poller
+    if _status_poller is None:
+        _status_poller = watch.Poller(
+            objects.registry.Assembly.statuses_by_uuid,
+            CONF.api.watch_poll_interval)
+    return _status_poller
+
 
 class AssemblyHandler(handler.Handler):
     """Fulfills a request on the assembly resource."""
@@ -58,18 +82,43 @@ class AssemblyHandler(handler.Handler):
         """Return an assembly."""
         return objects.registry.Assembly.get_by_uuid(self.context, id)
 
+    def watch(self, id, status):
+        """Return an assembly once its status differs from status.
+
+        This is a long poll. Saves made by this process wake the request
+        up straight away, changes made by other services are noticed by
+        the status poller of the process within watch_poll_interval.
+        Gives up after watch_timeout and returns the unchanged assembly.
+        """
+        deadline = time.time() + CONF.api.watch_timeout
+        db_obj = self.get(id)
+        while db_obj.status == status:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            _get_status_poller().wait(db_obj.uuid, status, remaining)
+            db_obj = self.get(id)
+        return db_obj
+
     def _context_from_trust_id(self, trust_id):
-        cntx = context.RequestContext(trust_id=trust_id)
-        kc = solum_keystoneclient.KeystoneClientV3(cntx)
-        return kc.context
+        return clients.get_trust_context(trust_id)
 
     def trigger_workflow(self, trigger_id, commit_sha='',
-                         status_url=None):
-        """Get trigger by trigger id and start git workflow associated."""
+                         status_url=None, collab_url=None):
+        """Get trigger by trigger id and start git workflow associated.
+
+        A collab_url is given for rebuild requests from a comment on a
+        public repo, where the commenter must be a collaborator.
+        """
         # Note: self.context will be None at this point as this is a
         # non-authenticated request.
         db_obj = objects.registry.Assembly.get_by_trigger_id(None,
                                                              trigger_id)
+        if collab_url and not github.is_repo_collaborator(collab_url):
+            LOG.info('Commenter not allowed to do rebuild of trigger %s' %
+                     trigger_id)
+            return
+
         # get the trust context and authenticate it.
         try:
             self.context = self._context_from_trust_id(db_obj.trust_id)
@@ -85,7 +134,8 @@ class AssemblyHandler(handler.Handler):
             self._build_artifact(assem=db_obj, artifact=arti,
                                  commit_sha=commit_sha,
                                  status_url=status_url,
-                                 deploy_keys_ref=plan_obj.deploy_keys_uri)
+                                 deploy_keys_ref=plan_obj.deploy_keys_uri,
+                                 supersede=True)
 
     def update(self, id, data):
         """Modify a resource."""
@@ -105,6 +155,8 @@ class AssemblyHandler(handler.Handler):
         db_obj.status = ASSEMBLY_STATES.DELETING
         db_obj.save(self.context)
 
+        api.API(context=self.context).cancel(assembly_id=db_obj.id)
+
         deploy_api.API(context=self.context).destroy(
             assem_id=db_obj.id)
 
@@ -134,7 +186,8 @@ class AssemblyHandler(handler.Handler):
         return db_obj
 
     def _build_artifact(self, assem, artifact, verb='build', commit_sha='',
-                        status_url=None, deploy_keys_ref=None):
+                        status_url=None, deploy_keys_ref=None,
+                        supersede=False):
 
         # This is a tempory hack so we don't need the build client
         # in the requirments.
@@ -150,6 +203,11 @@ class AssemblyHandler(handler.Handler):
         image.project_id = self.context.tenant
         image.state = IMAGE_STATES.PENDING
         image.create(self.context)
+        if supersede:
+            # earlier builds of this artifact are of no use any more
+            api.API(context=self.context).cancel(
+                assembly_id=assem.id, name=image.name,
+                before_build_id=image.id)
         test_cmd = artifact.get('unittest_cmd')
         status_token = artifact.get('status_token')
 
@@ -172,6 +230,6 @@ class AssemblyHandler(handler.Handler):
             test_cmd=test_cmd,
             source_creds_ref=deploy_keys_ref)
 
-    def get_all(self):
+    def get_all(self, **kwargs):
         """Return all assemblies, based on the query provided."""
-        return objects.registry.AssemblyList.get_all(self.context)
+        return objects.registry.AssemblyList.get_all(self.context, **kwargs)
@@ -21,25 +21,25 @@ class LanguagePackHandler(handler.Handler):
 
     def get(self, id):
         """Return a language_pack image."""
-        osc = clients.OpenStackClients(self.context)
+        osc = clients.get_clients(self.context)
         return osc.glance().images.get(id)
 
     def get_all(self):
         """Return all language_packs images."""
-        osc = clients.OpenStackClients(self.context)
+        osc = clients.get_clients(self.context)
         return osc.glance().images.list(filters={'tag': ['solum::lp']})
 
     def create(self, data):
         """Create a new language_pack."""
-        osc = clients.OpenStackClients(self.context)
+        osc = clients.get_clients(self.context)
         return osc.glance().images.create(**data)
 
     def update(self, uuid, data):
         """Modify a language_pack."""
-        osc = clients.OpenStackClients(self.context)
+        osc = clients.get_clients(self.context)
         return osc.glance().images.update(uuid, **data)
 
     def delete(self, uuid):
         """Delete a language_pack."""
-        osc = clients.OpenStackClients(self.context)
+        osc = clients.get_clients(self.context)
         return osc.glance().images.delete(uuid)
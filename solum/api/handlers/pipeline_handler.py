@@ -21,7 +21,6 @@ from oslo.config import cfg
 from solum.api.handlers import handler
 from solum.common import catalog
 from solum.common import clients
-from solum.common import context
 from solum.common import exception
 from solum.common import heat_utils
 from solum.common import yamlutils
@@ -38,16 +37,16 @@ class PipelineHandler(handler.Handler):
         super(PipelineHandler, self).__init__(context)
         self._clients = None
         if context is not None:
-            self._clients = clients.OpenStackClients(context)
+            self._clients = clients.get_clients(context)
 
     def get(self, id):
         """Return an pipeline."""
         return objects.registry.Pipeline.get_by_uuid(self.context, id)
 
     def _context_from_trust_id(self, trust_id):
-        cntx = context.RequestContext(trust_id=trust_id)
-        self._clients = clients.OpenStackClients(cntx)
-        return self._clients.keystone().context
+        cntx = clients.get_trust_context(trust_id)
+        self._clients = clients.get_clients(cntx)
+        return cntx
 
     def trigger_workflow(self, trigger_id):
         """Get trigger by trigger id and execute the associated workbook."""
@@ -159,7 +158,7 @@ class PipelineHandler(handler.Handler):
         ex_obj.create(self.context)
 
     def _ensure_workbook(self, pipeline):
-        osc = clients.OpenStackClients(self.context)
+        osc = clients.get_clients(self.context)
         try:
             osc.mistral().workbooks.get(pipeline.workbook_name)
         except Exception as excp:
@@ -212,6 +211,6 @@ class PipelineHandler(handler.Handler):
 
         return db_obj
 
-    def get_all(self):
+    def get_all(self, **kwargs):
         """Return all pipelines, based on the query provided."""
-        return objects.registry.PipelineList.get_all(self.context)
+        return objects.registry.PipelineList.get_all(self.context, **kwargs)
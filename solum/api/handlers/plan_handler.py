@@ -18,11 +18,11 @@ import os
 import shelve
 import uuid
 
-from Crypto.PublicKey import RSA
 from oslo.config import cfg
 
 from solum.api.handlers import handler
 from solum.common import clients
+from solum.common import keypool
 from solum import objects
 
 cfg.CONF.import_opt('git_secrets_file', 'solum.common.clients',
@@ -45,7 +45,9 @@ class PlanHandler(handler.Handler):
         db_obj = objects.registry.Plan.get_by_uuid(self.context, id)
         if 'name' in data:
             db_obj.name = data['name']
-        db_obj.raw_content.update(data)
+        raw_content = dict(db_obj.raw_content)
+        raw_content.update(data)
+        db_obj.raw_content = raw_content
         db_obj.save(self.context)
         return db_obj
 
@@ -76,9 +78,7 @@ class PlanHandler(handler.Handler):
                     ('private' not in artifact['content']) or
                     (not artifact['content']['private'])):
                 continue
-            new_key = RSA.generate(2048)
-            public_key = new_key.publickey().exportKey("OpenSSH")
-            private_key = new_key.exportKey("PEM")
+            private_key, public_key = keypool.get_pool().get()
             artifact['content']['public_key'] = public_key
             deploy_keys.append({'source_url': artifact['content']['href'],
                                 'private_key': private_key})
@@ -107,6 +107,6 @@ class PlanHandler(handler.Handler):
         db_obj.create(self.context)
         return db_obj
 
-    def get_all(self):
+    def get_all(self, **kwargs):
         """Return all plans."""
-        return objects.registry.PlanList.get_all(self.context)
+        return objects.registry.PlanList.get_all(self.context, **kwargs)
@@ -45,6 +45,6 @@ class SensorHandler(handler.Handler):
         db_obj.create(self.context)
         return db_obj
 
-    def get_all(self):
+    def get_all(self, **kwargs):
         """Return all sensors."""
-        return objects.registry.SensorList.get_all(self.context)
+        return objects.registry.SensorList.get_all(self.context, **kwargs)
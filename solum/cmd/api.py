@@ -17,12 +17,13 @@
 import logging as std_logging
 import os
 import sys
-from wsgiref import simple_server
 
 from oslo.config import cfg
 
 from solum.api import app as api_app
+from solum.common import keypool
 from solum.common import service
+from solum.common import wsgi
 from solum.openstack.common.gettextutils import _
 from solum.openstack.common import log as logging
 
@@ -37,7 +38,9 @@ def main():
 
     # Create the WSGI server and start it
     host, port = cfg.CONF.api.host, cfg.CONF.api.port
-    srv = simple_server.make_server(host, port, app)
+    srv = wsgi.Server(app, host, port, workers=cfg.CONF.api.workers,
+                      initializer=keypool.prewarm)
+    srv.start()
 
     LOG.info(_('Starting server in PID %s') % os.getpid())
     LOG.debug("Configuration:")
@@ -51,4 +54,4 @@ def main():
         LOG.info(_('serving on http://%(host)s:%(port)s') %
                  dict(host=host, port=port))
 
-    srv.serve_forever()
+    srv.serve()
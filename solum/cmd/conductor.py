@@ -38,8 +38,10 @@ def main():
 
     cfg.CONF.import_opt('topic', 'solum.conductor.config', group='conductor')
     cfg.CONF.import_opt('host', 'solum.conductor.config', group='conductor')
+    handler = default_handler.Handler()
+    handler.resume_triggers()
     endpoints = [
-        default_handler.Handler(),
+        handler,
     ]
     server = service.Service(cfg.CONF.conductor.topic,
                              cfg.CONF.conductor.host, endpoints)
@@ -19,6 +19,7 @@ from oslo.config import cfg
 from oslo.db import options
 from oslo.db.sqlalchemy.migration_cli import manager
 
+from solum import objects
 from solum.openstack.common import log as logging
 
 LOG = logging.getLogger(__name__)
@@ -46,6 +47,12 @@ def do_revision(mgr):
                  autogenerate=CONF.command.autogenerate)
 
 
+def do_migrate_plans(mgr):
+    objects.load()
+    count = objects.registry.Plan.migrate_raw_content()
+    print('Migrated %d plans to JSON' % count)
+
+
 def add_command_parsers(subparsers):
     parser = subparsers.add_parser('version')
     parser.set_defaults(func=do_version)
@@ -67,6 +74,9 @@ def add_command_parsers(subparsers):
     parser.add_argument('--autogenerate', action='store_true')
     parser.set_defaults(func=do_revision)
 
+    parser = subparsers.add_parser('migrate-plans')
+    parser.set_defaults(func=do_migrate_plans)
+
 
 def get_manager():
     if cfg.CONF.database.connection is None:
@@ -18,6 +18,8 @@ import logging as std_logging
 import os
 import sys
 
+import eventlet
+from eventlet import corolocal
 from oslo.config import cfg
 
 import solum
@@ -25,6 +27,7 @@ from solum.common.rpc import service
 from solum.common import trace_data
 from solum.openstack.common.gettextutils import _
 from solum.openstack.common import log as logging
+from solum.worker import executor
 from solum.worker.handlers import noop as noop_handler
 from solum.worker.handlers import shell as shell_handler
 from solum.worker.handlers import shell_nobuild as shell_nobuild_handler
@@ -35,6 +38,9 @@ LOG = logging.getLogger(__name__)
 def main():
     cfg.CONF(sys.argv[1:], project='solum')
     logging.setup('solum')
+    # Jobs run concurrently on green threads, so trace storage has to be
+    # local to each green thread rather than shared by the OS thread.
+    solum.TLS = corolocal.local()
     solum.TLS.trace = trace_data.TraceData()
 
     LOG.info(_('Starting server in PID %s') % os.getpid())
@@ -42,6 +48,8 @@ def main():
     cfg.CONF.log_opt_values(LOG, std_logging.DEBUG)
 
     cfg.CONF.import_opt('topic', 'solum.worker.config', group='worker')
+    cfg.CONF.import_opt('control_topic', 'solum.worker.config',
+                        group='worker')
     cfg.CONF.import_opt('host', 'solum.worker.config', group='worker')
     cfg.CONF.import_opt('handler', 'solum.worker.config', group='worker')
 
@@ -52,9 +60,14 @@ def main():
     }
 
     endpoints = [
-        handlers[cfg.CONF.worker.handler](),
+        executor.FairShareExecutor(handlers[cfg.CONF.worker.handler]()),
     ]
 
+    # Build dispatch blocks while the queue is full, so cancels are
+    # consumed by a server of their own.
+    control = service.Service(cfg.CONF.worker.control_topic,
+                              cfg.CONF.worker.host, endpoints)
+    eventlet.spawn_n(control.serve)
     server = service.Service(cfg.CONF.worker.topic,
                              cfg.CONF.worker.host, endpoints)
     server.serve()
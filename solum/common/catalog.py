@@ -12,23 +12,59 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os.path
+import os
 
 from solum.common import exception
+from solum.common import yamlutils
 
+# file path -> [mtime, raw content, parsed content or None]
+_cache = {}
 
-def get(entity, name, content_type='yaml'):
-    """This reads a file's contents from local storage.
 
-    /etc/solum/<entity>/name.<content_type>
-    """
+def _path(entity, name, content_type):
     proj_dir = os.path.join(os.path.dirname(__file__), '..', '..')
     file_path = os.path.join(proj_dir, 'etc', 'solum', entity,
                              '%s.%s' % (name, content_type))
-    file_path = os.path.realpath(file_path)
+    return os.path.realpath(file_path)
+
+
+def _entry(entity, name, content_type):
+    """Return the cache entry of a file, reading it again if it changed."""
+    file_path = _path(entity, name, content_type)
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        mtime = None
+    entry = _cache.get(file_path)
+    if entry is not None and mtime is not None and entry[0] == mtime:
+        return entry
     try:
         with open(file_path) as fd:
-            return fd.read()
+            entry = [mtime, fd.read(), None]
     except Exception:
         raise exception.ObjectNotFound(
             name=entity, id=name)
+    if mtime is not None:
+        _cache[file_path] = entry
+    return entry
+
+
+def get(entity, name, content_type='yaml'):
+    """This reads a file's contents from local storage.
+
+    /etc/solum/<entity>/name.<content_type>
+
+    The contents are kept in memory until the file's mtime changes.
+    """
+    return _entry(entity, name, content_type)[1]
+
+
+def get_parsed(entity, name):
+    """Return the parsed contents of /etc/solum/<entity>/name.yaml.
+
+    Callers share the parsed document and must not modify it.
+    """
+    entry = _entry(entity, name, 'yaml')
+    if entry[2] is None:
+        entry[2] = yamlutils.load(entry[1])
+    return entry[2]
@@ -12,6 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import time
+
+import eventlet
 from glanceclient import client as glanceclient
 from heatclient import client as heatclient
 from mistralclient.api import client as mistralclient
@@ -20,6 +24,7 @@ from oslo.config import cfg
 from swiftclient import client as swiftclient
 from zaqarclient.queues.v1 import client as zaqarclient
 
+from solum.common import context as solum_context
 from solum.common import exception
 from solum.common import solum_barbicanclient
 from solum.common import solum_keystoneclient
@@ -125,6 +130,24 @@ mistral_client_opts = [
                 help=_("If set the server certificate will not be verified "
                        "while using Mistral."))]
 
+client_cache_opts = [
+    cfg.IntOpt('client_cache_ttl',
+               default=600,
+               help=_('Seconds for which OpenStack clients built for a token '
+                      'are reused when the expiry of the token is not '
+                      'known. Otherwise they are reused until the token is '
+                      'about to expire. 0 disables the cache.')),
+    cfg.IntOpt('client_cache_size',
+               default=256,
+               help=_('Maximum number of tokens or trusts to keep cached '
+                      'OpenStack clients for.')),
+    cfg.IntOpt('trust_token_refresh',
+               default=300,
+               help=_('Seconds before its expiry at which a cached trust '
+                      'scoped token is replaced in the background.')),
+]
+
+cfg.CONF.register_opts(client_cache_opts)
 cfg.CONF.register_opts(barbican_client_opts, group='barbican_client')
 cfg.CONF.register_opts(glance_client_opts, group='glance_client')
 cfg.CONF.register_opts(heat_client_opts, group='heat_client')
@@ -139,6 +162,7 @@ class OpenStackClients(object):
 
     def __init__(self, context):
         self.context = context
+        self._urls = {}
         self._barbican = None
         self._keystone = None
         self._glance = None
@@ -149,7 +173,18 @@ class OpenStackClients(object):
         self._mistral = None
 
     def url_for(self, **kwargs):
-        return self.keystone().client.service_catalog.url_for(**kwargs)
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._urls:
+            self._urls[key] = self.keystone().client.service_catalog.url_for(
+                **kwargs)
+        return self._urls[key]
+
+    @property
+    def auth_ref(self):
+        """The keystone auth_ref, if these clients authenticated yet."""
+        if self._keystone is None or self._keystone._client is None:
+            return None
+        return self._keystone._client.auth_ref
 
     @property
     def auth_url(self):
@@ -288,3 +323,112 @@ class OpenStackClients(object):
         }
         self._swift = swiftclient.Connection(**args)
         return self._swift
+
+
+class ClientCache(object):
+    """Process-wide OpenStackClients, one per token or trust.
+
+    Reusing the clients avoids authenticating and fetching the service
+    catalog from keystone again for every operation done on behalf of
+    the same token. Trust scoped tokens are replaced in the background
+    shortly before they expire, so triggers never wait for keystone.
+    """
+
+    # seconds before expiry at which a token is no longer handed out
+    STALE_TOKEN_DURATION = 60
+
+    def __init__(self):
+        self._entries = collections.OrderedDict()
+        self._refreshing = set()
+
+    @staticmethod
+    def _key(context):
+        if context.trust_id:
+            return ('trust', context.trust_id)
+        if context.auth_token:
+            return ('token', context.auth_token, context.tenant)
+        return None
+
+    def _fresh(self, created, osc, now):
+        auth_ref = osc.auth_ref
+        if auth_ref is None:
+            return now - created < cfg.CONF.client_cache_ttl
+        return not auth_ref.will_expire_soon(self.STALE_TOKEN_DURATION)
+
+    def get(self, context):
+        key = self._key(context) if context is not None else None
+        if key is None or cfg.CONF.client_cache_ttl <= 0:
+            return OpenStackClients(context)
+
+        now = time.time()
+        entry = self._entries.pop(key, None)
+        if entry is not None and self._fresh(entry[0], entry[1], now):
+            osc = entry[1]
+            self._entries[key] = entry
+            self._update_context(context, osc)
+            if (context.trust_id and osc.auth_ref is not None and
+                    osc.auth_ref.will_expire_soon(
+                        cfg.CONF.trust_token_refresh)):
+                self._refresh(key, context.trust_id)
+            return osc
+
+        osc = OpenStackClients(context)
+        self._add(key, (now, osc))
+        return osc
+
+    def _add(self, key, entry):
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > cfg.CONF.client_cache_size:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _update_context(context, osc):
+        # a trust context gets its trust scoped token filled in when it
+        # authenticates, so hand the cached token out to the caller too
+        if context is not osc.context and context.trust_id:
+            cached = osc.keystone().context
+            context.auth_token = cached.auth_token
+            context.auth_url = cached.auth_url
+            context.user = cached.user
+            context.tenant = cached.tenant
+            context.user_name = cached.user_name
+
+    def _refresh(self, key, trust_id):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        eventlet.spawn_n(self._refresh_trust, key, trust_id)
+
+    def _refresh_trust(self, key, trust_id):
+        try:
+            osc = OpenStackClients(
+                solum_context.RequestContext(trust_id=trust_id))
+            osc.keystone()
+            self._add(key, (time.time(), osc))
+        except Exception as ex:
+            LOG.warn(_('Could not refresh token of trust %(trust)s: '
+                       '%(ex)s') % {'trust': trust_id, 'ex': ex})
+        finally:
+            self._refreshing.discard(key)
+
+    def clear(self):
+        self._entries.clear()
+
+
+_client_cache = ClientCache()
+
+
+def get_clients(context):
+    """Return the cached OpenStackClients for the context's credentials."""
+    return _client_cache.get(context)
+
+
+def get_trust_context(trust_id):
+    """Return a context authenticated with a trust scoped token.
+
+    The token is shared with every other caller using the same trust.
+    """
+    context = solum_context.RequestContext(trust_id=trust_id)
+    get_clients(context).keystone()
+    return context
@@ -218,6 +218,11 @@ class SolumException(Exception):
         return self.message
 
 
+class NotModified(SolumException):
+    msg_fmt = _("The resource has not been modified.")
+    code = 304
+
+
 class BadRequest(SolumException):
     msg_fmt = _("The request is malformed. Reason: %(reason)s")
     code = 400
@@ -0,0 +1,92 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Helpers for talking to the GitHub API."""
+
+import collections
+import socket
+import time
+
+from eventlet import pools
+import httplib2
+from oslo.config import cfg
+
+from solum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+github_opts = [
+    cfg.IntOpt('github_api_timeout',
+               default=5,
+               help='Seconds to wait for a response from the GitHub API.'),
+    cfg.IntOpt('github_collaborator_cache_ttl',
+               default=300,
+               help='Seconds for which a user found to be a collaborator '
+                    'of a repo is remembered. 0 disables the cache.'),
+    cfg.IntOpt('github_collaborator_negative_ttl',
+               default=60,
+               help='Seconds for which a user found not to be a '
+                    'collaborator of a repo is remembered.'),
+    cfg.IntOpt('github_collaborator_cache_size',
+               default=1024,
+               help='Maximum number of collaborator lookups to remember.'),
+]
+
+cfg.CONF.register_opts(github_opts)
+
+# keep-alive connections to the GitHub API, shared by all green threads
+_http_pool = pools.Pool(
+    max_size=4,
+    create=lambda: httplib2.Http(timeout=cfg.CONF.github_api_timeout))
+
+# collaborators url -> (expiry time, is collaborator), oldest first
+_collaborators = collections.OrderedDict()
+
+
+def _check_collaborator(api_url):
+    """Ask GitHub, returning None when it could not tell."""
+    try:
+        with _http_pool.item() as http:
+            resp, _ = http.request(api_url)
+    except (httplib2.HttpLib2Error, socket.error) as ex:
+        LOG.info("Error in verifying collaborator %s" % ex)
+        return None
+    return resp['status'] == '204'
+
+
+def is_repo_collaborator(api_url):
+    """Whether api_url, a collaborators API url, names a collaborator.
+
+    Answers are remembered per url, which names both the repo and the
+    user, so repeated rebuild comments do not each wait on GitHub.
+    """
+    now = time.time()
+    entry = _collaborators.pop(api_url, None)
+    if entry is not None and entry[0] > now:
+        _collaborators[api_url] = entry
+        return entry[1]
+
+    collaborator = _check_collaborator(api_url)
+    if collaborator is None:
+        return False
+
+    if collaborator:
+        ttl = cfg.CONF.github_collaborator_cache_ttl
+    else:
+        ttl = cfg.CONF.github_collaborator_negative_ttl
+    if cfg.CONF.github_collaborator_cache_ttl > 0 and ttl > 0:
+        _collaborators[api_url] = (now + ttl, collaborator)
+        while len(_collaborators) > cfg.CONF.github_collaborator_cache_size:
+            _collaborators.popitem(last=False)
+    return collaborator
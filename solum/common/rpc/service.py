@@ -105,5 +105,9 @@ class API(object):
     def _cast(self, method, *args, **kwargs):
         self._client.cast(self._context, method, *args, **kwargs)
 
+    def _fanout_cast(self, topic, method, *args, **kwargs):
+        self._client.prepare(topic=topic, fanout=True).cast(
+            self._context, method, *args, **kwargs)
+
     def echo(self, message):
         self._cast('echo', message=message)
@@ -0,0 +1,114 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Change notification for long-polled resources.
+
+Saving a resource wakes up every green thread of the same process that
+is waiting on its key. Most changes are written by other services (the
+worker, deployer and conductor update assembly status), and those are
+only noticed by a Poller, which re-reads the state of every watched
+resource of the process in one query each interval. Waiters are
+expected to re-read the resource whenever they are woken up.
+"""
+
+import collections
+
+import eventlet
+from eventlet import event
+from eventlet import timeout as eventlet_timeout
+
+from solum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+_waiters = collections.defaultdict(set)
+
+
+def notify(key):
+    """Wake up everything waiting on key."""
+    for evt in _waiters.pop(key, ()):
+        evt.send()
+
+
+def wait(key, timeout):
+    """Block until key is notified or timeout seconds have passed.
+
+    :returns: True when woken up by notify(), False on timeout.
+    """
+    evt = event.Event()
+    _waiters[key].add(evt)
+    try:
+        with eventlet_timeout.Timeout(timeout, False):
+            evt.wait()
+            return True
+        return False
+    finally:
+        waiters = _waiters.get(key)
+        if waiters is not None:
+            waiters.discard(evt)
+            if not waiters:
+                del _waiters[key]
+
+
+class Poller(object):
+    """Watch the state of resources changed by other processes.
+
+    fetch(keys) returns a {key: state} dict for the keys that still
+    exist. While anything waits, one green thread calls it every interval
+    for all the keys waited on and notifies those whose state differs
+    from what a waiter last saw, so holding a request open costs no
+    query of its own.
+    """
+
+    def __init__(self, fetch, interval):
+        self.fetch = fetch
+        self.interval = interval
+        self._watched = collections.defaultdict(list)
+        self._thread = None
+
+    def wait(self, key, state, timeout):
+        """Block until key leaves state, is notified or timeout passes.
+
+        :returns: True when woken up, False on timeout.
+        """
+        self._watched[key].append(state)
+        if self._thread is None:
+            self._thread = eventlet.spawn(self._run)
+        try:
+            return wait(key, timeout)
+        finally:
+            states = self._watched.get(key)
+            if states is not None:
+                states.remove(state)
+                if not states:
+                    del self._watched[key]
+
+    def _run(self):
+        try:
+            while self._watched:
+                eventlet.sleep(self.interval)
+                keys = list(self._watched)
+                if not keys:
+                    break
+                try:
+                    current = self.fetch(keys)
+                except Exception as ex:
+                    LOG.warn("Could not poll watched resources: %s" % ex)
+                    continue
+                for key in keys:
+                    if any(state != current.get(key)
+                           for state in self._watched.get(key, ())):
+                        notify(key)
+        finally:
+            self._thread = None
@@ -0,0 +1,220 @@
+# Copyright 2014 - Rackspace Hosting
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Pre-forking WSGI server for the Solum API services."""
+
+import errno
+import os
+import signal
+
+import eventlet
+from eventlet import hubs
+from eventlet import wsgi
+from oslo.config import cfg
+
+from solum.openstack.common.gettextutils import _
+from solum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+WSGI_OPTS = [
+    cfg.IntOpt('wsgi_default_pool_size',
+               default=1000,
+               help=('Size of the pool of green threads each WSGI worker '
+                     'process serves requests from.')),
+    cfg.IntOpt('backlog',
+               default=4096,
+               help='Number of backlog requests to configure the socket '
+                    'with.'),
+]
+
+cfg.CONF.register_opts(WSGI_OPTS)
+
+
+def _raise_exit(signo, frame):
+    raise SystemExit()
+
+
+class Server(object):
+    """Serve a WSGI application from one or more processes.
+
+    The listening socket is opened once and shared by every worker.  Each
+    worker serves requests concurrently from its own green thread pool, so
+    one slow request no longer holds up the others. initializer, when
+    given, is called in each worker process before it starts serving.
+
+    With more than one worker the parent process only supervises: it
+    restarts workers that die and stops them all on SIGTERM or SIGINT. On
+    SIGHUP it reloads the configuration files, then replaces the workers
+    one at a time: it starts a new worker, tells one old worker to stop
+    accepting and exit once its in-flight requests finish, and moves on
+    to the next old worker when that one has exited.
+
+    A single worker serves from the process itself. On SIGTERM or SIGINT
+    it stops accepting and exits once in-flight requests finish. On
+    SIGHUP it stops accepting, lets in-flight requests finish, reloads the
+    configuration files and starts serving again.
+
+    The listening address is not changed by a reload.
+    """
+
+    def __init__(self, app, host, port, workers=1, pool_size=None,
+                 initializer=None):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.pool_size = pool_size or cfg.CONF.wsgi_default_pool_size
+        self.initializer = initializer
+        self.children = set()
+        self.running = False
+        self._socket = None
+        self._reload = False
+        # workers of the previous generation still to be replaced, and
+        # those told to stop that have not exited yet
+        self._stale = set()
+        self._stopping = set()
+
+    def start(self):
+        """Open the listening socket."""
+        self._socket = eventlet.listen((self.host, self.port),
+                                       backlog=cfg.CONF.backlog)
+
+    def serve(self):
+        """Serve requests until told to stop."""
+        if self._socket is None:
+            self.start()
+        if self.workers <= 1:
+            self._serve_single()
+            return
+
+        self.running = True
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        while self.running or self.children:
+            if self._reload:
+                self._reload = False
+                self._reload_config()
+                self._stale = self.children - self._stopping
+            while (self.running and
+                   len(self.children - self._stopping) < self.workers):
+                self._spawn_worker()
+            if self.running and self._stale and not self._stopping:
+                self._replace_worker(self._stale.pop())
+            self._wait_child()
+
+    def _serve_single(self):
+        self.running = True
+        signal.signal(signal.SIGTERM, self._handle_single_stop)
+        signal.signal(signal.SIGINT, self._handle_single_stop)
+        signal.signal(signal.SIGHUP, self._handle_single_reload)
+        while self.running:
+            if self._reload:
+                self._reload = False
+                self._reload_config()
+            # wsgi.server() closes the socket it is given, keep ours open
+            # for the next round.
+            self._serve_worker(self._socket.dup())
+
+    def _handle_single_stop(self, signo, frame):
+        self.running = False
+        raise SystemExit()
+
+    def _handle_single_reload(self, signo, frame):
+        self._reload = True
+        raise SystemExit()
+
+    def _reload_config(self):
+        LOG.info(_('Reloading configuration files'))
+        if not cfg.CONF.reload_config_files():
+            LOG.error(_('Could not reload configuration files, keeping '
+                        'the current configuration'))
+
+    def _serve_worker(self, sock=None):
+        if self.initializer is not None:
+            self.initializer()
+        pool = eventlet.GreenPool(self.pool_size)
+        wsgi.server(sock or self._socket, self.app, custom_pool=pool,
+                    log=logging.WritableLogger(LOG))
+        # Let in-flight requests finish before exiting.
+        pool.waitall()
+
+    def _spawn_worker(self):
+        pid = os.fork()
+        if pid == 0:
+            hubs.use_hub()
+            signal.signal(signal.SIGTERM, _raise_exit)
+            signal.signal(signal.SIGINT, _raise_exit)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            status = 0
+            try:
+                self._serve_worker()
+            except BaseException as ex:
+                LOG.exception(ex)
+                status = 1
+            finally:
+                os._exit(status)
+
+        LOG.info(_('Started WSGI worker %s') % pid)
+        self.children.add(pid)
+
+    def _replace_worker(self, pid):
+        # The new worker accepts on the shared socket before the old one
+        # stops, so capacity never drops during a reload.
+        self._spawn_worker()
+        LOG.info(_('Stopping WSGI worker %s') % pid)
+        self._stopping.add(pid)
+        self._kill(pid, signal.SIGTERM)
+
+    def _wait_child(self):
+        try:
+            pid, status = os.wait()
+        except OSError as ex:
+            if ex.errno not in (errno.EINTR, errno.ECHILD):
+                raise
+            if ex.errno == errno.ECHILD:
+                self.children.clear()
+                self._stale.clear()
+                self._stopping.clear()
+            return
+        if pid in self.children:
+            LOG.info(_('WSGI worker %(pid)s exited with status %(status)d') %
+                     {'pid': pid, 'status': status})
+            self.children.discard(pid)
+            self._stale.discard(pid)
+            self._stopping.discard(pid)
+
+    @staticmethod
+    def _kill(pid, signo):
+        try:
+            os.kill(pid, signo)
+        except OSError as ex:
+            if ex.errno != errno.ESRCH:
+                raise
+
+    def _signal_children(self, signo):
+        for pid in self.children:
+            self._kill(pid, signo)
+
+    def _handle_stop(self, signo, frame):
+        LOG.info(_('Stopping WSGI workers'))
+        self.running = False
+        self._signal_children(signal.SIGTERM)
+
+    def _handle_reload(self, signo, frame):
+        # Only flag the reload, the supervise loop replaces the workers
+        # once os.wait() is interrupted.
+        LOG.info(_('Reloading WSGI workers'))
+        self._reload = True
@@ -31,3 +31,9 @@ class API(service.API):
         self._cast('build_job_update', build_id=build_id, state=state,
                    description=description, created_image_id=created_image_id,
                    assembly_id=assembly_id)
+
+    def trigger_workflow(self, trigger_id, commit_sha='', status_url=None,
+                         collab_url=None, event=None, ref=None):
+        self._cast('trigger_workflow', trigger_id=trigger_id,
+                   commit_sha=commit_sha, status_url=status_url,
+                   collab_url=collab_url, event=event, ref=ref)
@@ -24,6 +24,17 @@ SERVICE_OPTS = [
     cfg.StrOpt('host',
                default='localhost',
                help='The location of the conductor rpc queue'),
+    cfg.IntOpt('trigger_debounce',
+               default=5,
+               help='Seconds a trigger event waits before its workflow '
+                    'starts. Repeats of the event within this window are '
+                    'dropped and a newer event for the same trigger '
+                    'replaces it. 0 starts workflows at once'),
+    cfg.IntOpt('trigger_claim_timeout',
+               default=600,
+               help='Seconds after which a trigger event claimed by a '
+                    'conductor that never finished its workflow is run '
+                    'again by the next conductor to start'),
 ]
 
 opt_group = cfg.OptGroup(
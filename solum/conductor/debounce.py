@@ -0,0 +1,82 @@
+# Copyright 2014 - Rackspace Hosting
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Collapse bursts of trigger events into a single workflow run."""
+
+import time
+
+import eventlet
+
+from solum.openstack.common.gettextutils import _
+from solum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class Debouncer(object):
+    """Delays trigger events, dropping duplicate and superseded ones.
+
+    Events are keyed by (trigger_id, ref, commit_sha, event) and run after
+    waiting `window` seconds. An event whose key was already seen within
+    the window is a duplicate, e.g. a webhook redelivery, and is dropped.
+    A newer event for the same trigger and ref (branch or pull request)
+    replaces the one still waiting, so a burst of pushes to a branch
+    builds only its last commit while other branches still build.
+
+    The delay only lives in this process. The conductor stores every event
+    as a TriggerEvent row before submitting it, and deletes the row once
+    its workflow ran, so waiting events survive a restart.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._pending = {}
+        self._seen = {}
+
+    def submit(self, key, func, *args, **kwargs):
+        """Run func(*args, **kwargs) for the event key unless collapsed.
+
+        Returns False when the event was dropped as a duplicate.
+        """
+        if self.window <= 0:
+            func(*args, **kwargs)
+            return True
+
+        now = time.time()
+        for seen_key, seen_at in list(self._seen.items()):
+            if now - seen_at >= self.window:
+                del self._seen[seen_key]
+        if key in self._seen:
+            LOG.info(_('Dropping duplicate trigger event %s') % (key,))
+            return False
+        self._seen[key] = now
+
+        slot = key[:2]
+        pending = self._pending.pop(slot, None)
+        if pending is not None:
+            LOG.info(_('Trigger event %(old)s superseded by %(new)s') %
+                     {'old': pending[0], 'new': key})
+            pending[1].cancel()
+        thread = eventlet.spawn_after(self.window, self._run, key, func,
+                                      args, kwargs)
+        self._pending[slot] = (key, thread)
+        return True
+
+    def _run(self, key, func, args, kwargs):
+        if self._pending.get(key[:2], (None,))[0] == key:
+            del self._pending[key[:2]]
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            LOG.exception(_('Trigger event %s failed') % (key,))
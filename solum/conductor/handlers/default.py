@@ -14,6 +14,12 @@
 
 """Solum Conductor default handler."""
 
+from oslo.config import cfg
+
+from solum.api.handlers import assembly_handler
+from solum.api.handlers import pipeline_handler
+from solum.common import exception
+from solum.conductor import debounce
 from solum import objects
 from solum.objects import image
 from solum.openstack.common import log as logging
@@ -27,6 +33,14 @@ class Handler(object):
     def __init__(self):
         super(Handler, self).__init__()
         objects.load()
+        cfg.CONF.import_opt('trigger_debounce', 'solum.conductor.config',
+                            group='conductor')
+        cfg.CONF.import_opt('trigger_claim_timeout', 'solum.conductor.config',
+                            group='conductor')
+        cfg.CONF.import_opt('host', 'solum.conductor.config',
+                            group='conductor')
+        self._debouncer = debounce.Debouncer(
+            cfg.CONF.conductor.trigger_debounce)
 
     def echo(self, ctxt, message):
         LOG.debug("%s" % message)
@@ -55,3 +69,53 @@ class Handler(object):
                                                              'Image Build job',
                                                              created_image_id,
                                                              stack_id)
+
+    def trigger_workflow(self, ctxt, trigger_id, commit_sha='',
+                         status_url=None, collab_url=None, event=None,
+                         ref=None):
+        pending = objects.registry.TriggerEvent.enqueue(
+            None, trigger_id, ref, commit_sha, event, status_url, collab_url)
+        if pending is None:
+            LOG.info("Dropping duplicate trigger event %s" %
+                     ((trigger_id, ref, commit_sha, event),))
+            return
+        self._submit(pending)
+
+    def resume_triggers(self):
+        """Debounce the trigger events stored before this conductor started.
+
+        Events another conductor is still waiting on are submitted too;
+        whichever conductor claims an event first runs its workflow.
+        """
+        for pending in objects.registry.TriggerEventList.get_all(None):
+            self._submit(pending)
+
+    def _submit(self, pending):
+        key = (pending.trigger_id, pending.ref, pending.commit_sha,
+               pending.event)
+        if not self._debouncer.submit(key, self._run_trigger, pending):
+            pending.destroy(None)
+
+    def _run_trigger(self, pending):
+        conf = cfg.CONF.conductor
+        if not pending.claim(None, conf.host, conf.trigger_claim_timeout):
+            # replaced by a newer event or run by another conductor
+            return
+        try:
+            self._trigger_workflow(pending.trigger_id, pending.commit_sha,
+                                   pending.status_url, pending.collab_url)
+        finally:
+            pending.destroy(None)
+
+    def _trigger_workflow(self, trigger_id, commit_sha, status_url,
+                          collab_url):
+        try:
+            handler = assembly_handler.AssemblyHandler(None)
+            handler.trigger_workflow(trigger_id, commit_sha, status_url,
+                                     collab_url)
+        except exception.ResourceNotFound:
+            try:
+                handler = pipeline_handler.PipelineHandler(None)
+                handler.trigger_workflow(trigger_id)
+            except exception.ResourceNotFound:
+                LOG.warn("Trigger %s no longer exists" % trigger_id)
@@ -14,11 +14,14 @@
 
 """Solum Deployer Heat handler."""
 
+import collections
+import functools
+import heapq
+import itertools
 import time
 
-from heatclient import exc
+import eventlet
 from oslo.config import cfg
-import yaml
 
 from solum.common import catalog
 from solum.common import clients
@@ -57,10 +60,115 @@ cfg.CONF.import_opt('image_format', 'solum.api.handlers.assembly_handler',
                     group='api')
 
 
+class StackWatch(object):
+    """A stack being waited on, with its callbacks and backoff state."""
+
+    def __init__(self, osc, stack_id, on_status, on_timeout):
+        self.osc = osc
+        self.tenant = getattr(osc.context, 'tenant', None)
+        self.stack_id = stack_id
+        self.on_status = on_status
+        self.on_timeout = on_timeout
+        self.attempts = 0
+        self.interval = cfg.CONF.deployer.wait_interval
+
+
+class StackWatcher(object):
+    """Poll every in-flight Heat stack from a single green thread.
+
+    Instead of sleeping in a loop per deployment, callers register the
+    stack with watch() and return.  Pending checks are kept in a heap
+    ordered by when they are next due; one loop wakes up at most every
+    wait_interval seconds, runs the checks that are due and reschedules
+    the ones that have not settled, backing off by growth_factor.
+
+    The stacks due for a tenant are fetched with a single stacks.list
+    call filtered by id, rather than one stacks.get per stack.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._counter = itertools.count()
+        self._running = False
+
+    def __len__(self):
+        return len(self._pending)
+
+    def watch(self, osc, stack_id, on_status, on_timeout):
+        """Wait for a stack to settle without blocking the caller.
+
+        on_status is called with the stack, or None once Heat no longer
+        knows it, each time the stack is polled and returns True when the
+        stack has settled.  on_timeout is called if that has not happened
+        after max_attempts polls.
+        """
+        self._schedule(StackWatch(osc, stack_id, on_status, on_timeout),
+                       time.time())
+        if not self._running:
+            self._running = True
+            eventlet.spawn_n(self._run)
+
+    def _schedule(self, watch, due):
+        heapq.heappush(self._pending, (due, next(self._counter), watch))
+
+    def _run(self):
+        try:
+            while self._pending:
+                delay = self._pending[0][0] - time.time()
+                eventlet.sleep(max(0, min(delay,
+                                          cfg.CONF.deployer.wait_interval)))
+                self.poll()
+        finally:
+            self._running = False
+
+    def poll(self):
+        """Check every stack that is due and reschedule the others."""
+        now = time.time()
+        due = collections.defaultdict(list)
+        while self._pending and self._pending[0][0] <= now:
+            watch = heapq.heappop(self._pending)[2]
+            due[watch.tenant].append(watch)
+
+        for watches in due.values():
+            try:
+                stacks = self._list_stacks(watches)
+            except Exception as ex:
+                LOG.exception(ex)
+                stacks = None
+            for watch in watches:
+                self._check(watch, stacks)
+
+    def _list_stacks(self, watches):
+        # Stacks that Heat no longer lists have been deleted.
+        ids = [watch.stack_id for watch in watches]
+        heat = watches[0].osc.heat()
+        return dict((stack.id, stack)
+                    for stack in heat.stacks.list(filters={'id': ids}))
+
+    def _check(self, watch, stacks):
+        watch.attempts += 1
+        try:
+            if (stacks is not None and
+                    watch.on_status(stacks.get(watch.stack_id))):
+                return
+        except Exception as ex:
+            LOG.exception(ex)
+
+        if watch.attempts >= cfg.CONF.deployer.max_attempts:
+            try:
+                watch.on_timeout()
+            except Exception as ex:
+                LOG.exception(ex)
+            return
+        self._schedule(watch, time.time() + watch.interval)
+        watch.interval *= cfg.CONF.deployer.growth_factor
+
+
 class Handler(object):
     def __init__(self):
         super(Handler, self).__init__()
         objects.load()
+        self.stack_watcher = StackWatcher()
 
     def echo(self, ctxt, message):
         LOG.debug("%s" % message)
@@ -72,33 +180,34 @@ class Handler(object):
                         assembly.uuid])
 
     def destroy(self, ctxt, assem_id):
-        osc = clients.OpenStackClients(ctxt)
+        osc = clients.get_clients(ctxt)
         assem = objects.registry.Assembly.get_by_id(ctxt, assem_id)
         stack_id = self._find_id_if_stack_exists(osc, assem)
 
-        if stack_id is not None:
-            osc.heat().stacks.delete(stack_id)
-
-            wait_interval = cfg.CONF.deployer.wait_interval
-            growth_factor = cfg.CONF.deployer.growth_factor
-            stack_name = self._get_stack_name(assem)
-            for count in range(cfg.CONF.deployer.max_attempts):
-                stack_id = self._get_stack_id_from_heat(osc, stack_name)
-                if stack_id is None:
-                    break
-                time.sleep(wait_interval)
-                wait_interval *= growth_factor
-
         if stack_id is None:
             assem.destroy(ctxt)
             return
 
-        if stack_id is not None:
-            assem.status = STATES.ERROR_STACK_DELETE_FAILED
-            assem.save(ctxt)
+        osc.heat().stacks.delete(stack_id)
+        self.stack_watcher.watch(
+            osc, stack_id,
+            functools.partial(self._check_stack_deleted, ctxt, assem),
+            functools.partial(self._set_status, ctxt, assem,
+                              STATES.ERROR_STACK_DELETE_FAILED))
+
+    def _check_stack_deleted(self, ctxt, assem, stack):
+        if stack is None or (stack.action == 'DELETE' and
+                             stack.status == 'COMPLETE'):
+            assem.destroy(ctxt)
+            return True
+        return False
+
+    def _set_status(self, ctxt, assem, status):
+        assem.status = status
+        assem.save(ctxt)
 
     def deploy(self, ctxt, assembly_id, image_id):
-        osc = clients.OpenStackClients(ctxt)
+        osc = clients.get_clients(ctxt)
 
         assem = objects.registry.Assembly.get_by_id(ctxt,
                                                     assembly_id)
@@ -135,7 +244,8 @@ class Handler(object):
 
             comp_name = 'Heat_Stack_for_%s' % assem.name
             comp_description = 'Heat Stack %s' % (
-                yaml.load(template).get('description'))
+                catalog.get_parsed('templates',
+                                   template_flavor).get('description'))
             objects.registry.Component.assign_and_create(ctxt, assem,
                                                          comp_name,
                                                          'Heat Stack',
@@ -149,33 +259,29 @@ class Handler(object):
         self._update_assembly_status(ctxt, assem, osc, stack_id)
 
     def _update_assembly_status(self, ctxt, assem, osc, stack_id):
-
-        wait_interval = cfg.CONF.deployer.wait_interval
-        growth_factor = cfg.CONF.deployer.growth_factor
-        got_stack_status = False
-
-        for count in range(cfg.CONF.deployer.max_attempts):
-            stack = osc.heat().stacks.get(stack_id)
-            if stack.status == 'COMPLETE':
-                host_url = self._parse_server_url(stack)
-                if host_url is not None:
-                    assem.status = STATES.READY
-                    assem.application_uri = host_url
-                    assem.save(ctxt)
-                    got_stack_status = True
-                    break
-            elif stack.status == 'FAILED':
-                assem.status = STATES.ERROR
+        self.stack_watcher.watch(
+            osc, stack_id,
+            functools.partial(self._check_stack_deployed, ctxt, assem, osc),
+            functools.partial(self._set_status, ctxt, assem,
+                              STATES.ERROR_STACK_CREATE_FAILED))
+
+    def _check_stack_deployed(self, ctxt, assem, osc, stack):
+        if stack is None:
+            return False
+        if stack.status == 'COMPLETE':
+            if 'outputs' not in stack._info:
+                # Stack listings do not include the outputs.
+                stack = osc.heat().stacks.get(stack.id)
+            host_url = self._parse_server_url(stack)
+            if host_url is not None:
+                assem.status = STATES.READY
+                assem.application_uri = host_url
                 assem.save(ctxt)
-                got_stack_status = True
-                break
-
-            time.sleep(wait_interval)
-            wait_interval *= growth_factor
-
-        if not got_stack_status:
-            assem.status = STATES.ERROR_STACK_CREATE_FAILED
-            assem.save(ctxt)
+                return True
+        elif stack.status == 'FAILED':
+            self._set_status(ctxt, assem, STATES.ERROR)
+            return True
+        return False
 
     def _parse_server_url(self, heat_output):
         """Parse server url from heat-stack-show output."""
@@ -187,11 +293,3 @@ class Handler(object):
         if assem.heat_stack_component is not None:
             return assem.heat_stack_component.heat_stack_id
         return None
-
-    def _get_stack_id_from_heat(self, osc, stack_name):
-        try:
-            stack = osc.heat().stacks.get(stack_name)
-            if stack is not None:
-                return stack.identifier.split('/')[-1]
-        except exc.HTTPNotFound:
-            return None
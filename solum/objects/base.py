@@ -46,8 +46,10 @@ class CrudMixin(object):
 
 class CrudListMixin(object):
     @classmethod
-    def get_all(cls, context):
+    def get_all(cls, context, marker=None, limit=None, sort_key=None,
+                sort_dir=None):
         """Retrieve all applications for the active context.
 
-        Context may be global or tenant scoped.
+        Context may be global or tenant scoped. The result is ordered by
+        sort_key/sort_dir and starts after the item whose uuid is marker.
         """
@@ -29,6 +29,7 @@ class States(object):
     BUILDING = 'BUILDING'
     ERROR = 'ERROR'
     COMPLETE = 'COMPLETE'
+    CANCELLED = 'CANCELLED'
 
     @classmethod
     def as_dict(cls):
@@ -19,6 +19,14 @@ class Plan(base.CrudMixin):
     # Version 1.0: Initial version
     VERSION = '1.0'
 
+    @classmethod
+    def migrate_raw_content(cls, batch_size=100):
+        """Copy the content of plans stored as YAML to the JSON column.
+
+        Meant to run while services are in the 'transition' schema mode.
+        Returns the number of plans migrated.
+        """
+
 
 class PlanList(list, base.CrudListMixin):
     """List of Plan."""
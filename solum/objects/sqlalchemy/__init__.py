@@ -71,7 +71,9 @@ def load():
     from solum.objects.sqlalchemy import plan
     from solum.objects.sqlalchemy import sensor
     from solum.objects.sqlalchemy import service
+    from solum.objects.sqlalchemy import trigger_event
     from solum.objects.sqlalchemy import userlog
+    from solum.objects import trigger_event as abstract_trigger_event
     from solum.objects import userlog as abstract_userlog
 
     objects.registry.add(abstract_assembly.Assembly, assembly.Assembly)
@@ -104,3 +106,7 @@ def load():
     objects.registry.add(abstract_image.ImageList, image.ImageList)
     objects.registry.add(abstract_userlog.Userlog, userlog.Userlog)
     objects.registry.add(abstract_userlog.UserlogList, userlog.UserlogList)
+    objects.registry.add(abstract_trigger_event.TriggerEvent,
+                         trigger_event.TriggerEvent)
+    objects.registry.add(abstract_trigger_event.TriggerEventList,
+                         trigger_event.TriggerEventList)
@@ -15,6 +15,7 @@
 import sqlalchemy as sa
 
 from solum.common import exception
+from solum.common import watch
 from solum import objects
 from solum.objects import assembly as abstract
 from solum.objects.sqlalchemy import component
@@ -26,7 +27,10 @@ class Assembly(sql.Base, abstract.Assembly):
 
     __tablename__ = 'assembly'
     __resource__ = 'assemblies'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sa.Index('ix_assembly_uuid', 'uuid', unique=True),
+        sa.Index('ix_assembly_trigger_id', 'trigger_id', unique=True),
+        sa.Index('ix_assembly_project_id', 'project_id', 'created_at'))
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     uuid = sa.Column(sa.String(36), nullable=False)
@@ -54,14 +58,21 @@ class Assembly(sql.Base, abstract.Assembly):
         except sa.orm.exc.NoResultFound:
             cls._raise_trigger_not_found(trigger_id)
 
+    @classmethod
+    def statuses_by_uuid(cls, uuids):
+        """Return a {uuid: status} dict of the given assemblies."""
+        session = sql.Base.get_session()
+        return dict(session.query(cls.uuid, cls.status).filter(
+            cls.uuid.in_(uuids)))
+
     @property
     def plan_uuid(self):
-        return objects.registry.Plan.get_by_id(None, self.plan_id).uuid
+        return sql.referenced_uuid(self, 'plan_id', objects.registry.Plan)
 
     @plan_uuid.setter
     def plan_uuid(self, value):
-        plan = objects.registry.Plan.get_by_uuid(None, value)
-        self.plan_id = plan.id
+        sql.set_referenced_uuid(self, 'plan_id', objects.registry.Plan,
+                                value)
 
     @property
     def _extra_keys(self):
@@ -73,6 +84,10 @@ class Assembly(sql.Base, abstract.Assembly):
         return session.query(component.Component).filter_by(
             assembly_id=self.id).all()
 
+    def save(self, context):
+        super(Assembly, self).save(context)
+        watch.notify(self.uuid)
+
     def destroy(self, context):
         session = sql.Base.get_session()
         with session.begin():
@@ -80,6 +95,7 @@ class Assembly(sql.Base, abstract.Assembly):
                 assembly_id=self.id).delete()
             session.query(self.__class__).filter_by(
                 id=self.id).delete()
+        watch.notify(self.uuid)
 
     @property
     def heat_stack_component(self):
@@ -92,5 +108,9 @@ class AssemblyList(abstract.AssemblyList):
     """Represent a list of assemblies in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return AssemblyList(sql.model_query(context, Assembly))
+    def get_all(cls, context, **kwargs):
+        assemblies = AssemblyList(sql.paginate_query(context, Assembly,
+                                                     **kwargs))
+        sql.prime_referenced_uuids(assemblies, 'plan_id',
+                                   objects.registry.Plan)
+        return assemblies
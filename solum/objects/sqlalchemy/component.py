@@ -26,7 +26,10 @@ class Component(sql.Base, abstract.Component):
 
     __tablename__ = 'component'
     __resource__ = 'components'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sa.Index('ix_component_uuid', 'uuid', unique=True),
+        sa.Index('ix_component_assembly_id', 'assembly_id', 'component_type'),
+        sa.Index('ix_component_project_id', 'project_id', 'created_at'))
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     uuid = sa.Column(sa.String(36))
@@ -43,14 +46,13 @@ class Component(sql.Base, abstract.Component):
 
     @property
     def assembly_uuid(self):
-        if self.assembly_id is None:
-            return None
-        return objects.registry.Assembly.get_by_id(None, self.assembly_id).uuid
+        return sql.referenced_uuid(self, 'assembly_id',
+                                   objects.registry.Assembly)
 
     @assembly_uuid.setter
     def assembly_uuid(self, assembly_uuid):
-        assembly = objects.registry.Assembly.get_by_uuid(None, assembly_uuid)
-        self.assembly_id = assembly.id
+        sql.set_referenced_uuid(self, 'assembly_id',
+                                objects.registry.Assembly, assembly_uuid)
 
     @property
     def _extra_keys(self):
@@ -78,5 +80,9 @@ class ComponentList(abstract.ComponentList):
     """Represent a list of components in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return ComponentList(sql.model_query(context, Component))
+    def get_all(cls, context, **kwargs):
+        components = ComponentList(sql.paginate_query(context, Component,
+                                                      **kwargs))
+        sql.prime_referenced_uuids(components, 'assembly_id',
+                                   objects.registry.Assembly)
+        return components
@@ -23,7 +23,9 @@ class Execution(sql.Base, abstract.Execution):
 
     __tablename__ = 'execution'
     __resource__ = 'executions'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sa.Index('ix_execution_uuid', 'uuid', unique=True),
+        sa.Index('ix_execution_pipeline_id', 'pipeline_id', 'created_at'))
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     uuid = sa.Column(sa.String(36))
@@ -34,5 +36,5 @@ class ExecutionList(abstract.ExecutionList):
     """Represent a list of executions in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return ExecutionList(sql.model_query(context, Execution))
+    def get_all(cls, context, **kwargs):
+        return ExecutionList(sql.paginate_query(context, Execution, **kwargs))
@@ -21,7 +21,10 @@ class Extension(sql.Base, abstract.Extension):
 
     __resource__ = 'extensions'
     __tablename__ = 'extension'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sqlalchemy.Index('ix_extension_uuid', 'uuid', unique=True),
+        sqlalchemy.Index('ix_extension_project_id', 'project_id',
+                         'created_at'))
 
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True,
                            autoincrement=True)
@@ -38,5 +41,5 @@ class ExtensionList(abstract.ExtensionList):
     """Represent a list of extensions in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return ExtensionList(sql.model_query(context, Extension))
+    def get_all(cls, context, **kwargs):
+        return ExtensionList(sql.paginate_query(context, Extension, **kwargs))
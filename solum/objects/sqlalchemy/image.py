@@ -23,7 +23,9 @@ class Image(sql.Base, abstract.Image):
 
     __tablename__ = 'image'
     __resource__ = 'images'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sa.Index('ix_image_uuid', 'uuid', unique=True),
+        sa.Index('ix_image_project_id', 'project_id', 'created_at'))
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     uuid = sa.Column(sa.String(36), nullable=False)
@@ -44,5 +46,5 @@ class ImageList(abstract.ImageList):
     """Represent a list of images in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return ImageList(sql.model_query(context, Image))
+    def get_all(cls, context, **kwargs):
+        return ImageList(sql.paginate_query(context, Image, **kwargs))
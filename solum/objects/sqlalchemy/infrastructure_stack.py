@@ -23,7 +23,10 @@ class InfrastructureStack(sql.Base, abstract.InfrastructureStack):
 
     __tablename__ = 'infrastructure_stack'
     __resource__ = 'infrastructure/stacks'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sa.Index('ix_infrastructure_stack_uuid', 'uuid', unique=True),
+        sa.Index('ix_infrastructure_stack_project_id', 'project_id',
+                 'created_at'))
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     uuid = sa.Column(sa.String(36), nullable=False)
@@ -40,6 +43,6 @@ class InfrastructureStackList(abstract.InfrastructureStackList):
     """Represent a list of infrastructure_stacks in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return InfrastructureStackList(sql.model_query(context,
-                                                       InfrastructureStack))
+    def get_all(cls, context, **kwargs):
+        return InfrastructureStackList(
+            sql.paginate_query(context, InfrastructureStack, **kwargs))
@@ -0,0 +1,54 @@
+# Copyright 2014 - Rackspace
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add trigger events table
+
+Revision ID: 1f6c2a9d4e07
+Revises: 5583c6e78156
+Create Date: 2014-10-17 09:40:12.418236
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from solum.openstack.common import timeutils
+
+# revision identifiers, used by Alembic.
+revision = '1f6c2a9d4e07'
+down_revision = '5583c6e78156'
+
+
+def upgrade():
+    op.create_table(
+        'trigger_events',
+        sa.Column('id', sa.Integer, primary_key=True, nullable=False),
+        sa.Column('created_at', sa.DateTime, default=timeutils.utcnow,
+                  nullable=False),
+        sa.Column('updated_at', sa.DateTime, default=timeutils.utcnow,
+                  nullable=False),
+        sa.Column('trigger_id', sa.String(36), nullable=False),
+        sa.Column('ref', sa.String(255)),
+        sa.Column('commit_sha', sa.String(40)),
+        sa.Column('event', sa.String(64)),
+        sa.Column('status_url', sa.String(1024)),
+        sa.Column('collab_url', sa.String(1024)),
+        sa.Column('claimed_by', sa.String(255)),
+        sa.Column('claimed_at', sa.DateTime),
+        )
+    op.create_index('ix_trigger_events_trigger_id_ref', 'trigger_events',
+                    ['trigger_id', 'ref'])
+
+
+def downgrade():
+    op.drop_table('trigger_events')
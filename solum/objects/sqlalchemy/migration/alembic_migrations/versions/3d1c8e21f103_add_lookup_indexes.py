@@ -0,0 +1,57 @@
+# Copyright 2014 - Rackspace
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add lookup indexes
+
+Revision ID: 3d1c8e21f103
+Revises: 450600086a09
+Create Date: 2014-10-14 16:12:05.210318
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3d1c8e21f103'
+down_revision = '450600086a09'
+
+PROJECT_TABLES = ['sensor', 'operation', 'image', 'extension', 'plan',
+                  'assembly', 'pipeline', 'infrastructure_stack',
+                  'component', 'service']
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ('ix_%s_uuid' % table, table, ['uuid'], True)
+    for table in PROJECT_TABLES + ['execution']
+] + [
+    ('ix_%s_project_id' % table, table, ['project_id', 'created_at'], False)
+    for table in PROJECT_TABLES
+] + [
+    ('ix_assembly_trigger_id', 'assembly', ['trigger_id'], True),
+    ('ix_pipeline_trigger_id', 'pipeline', ['trigger_id'], True),
+    ('ix_component_assembly_id', 'component',
+     ['assembly_id', 'component_type'], False),
+    ('ix_execution_pipeline_id', 'execution',
+     ['pipeline_id', 'created_at'], False),
+    ('ix_userlogs_assembly_uuid', 'userlogs', ['assembly_uuid'], False),
+]
+
+
+def upgrade():
+    for name, table, columns, unique in INDEXES:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for name, table, columns, unique in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,46 @@
+# Copyright 2014 - Rackspace
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add plan raw_content_json
+
+Plans keep being written as YAML as well until the move is finished,
+which has to happen in this order:
+
+1. Upgrade the schema to this revision.
+2. Upgrade every service, running with schema_mode transition or new.
+3. Run 'solum-db-manage migrate-plans' to copy existing plans.
+4. Set plan_json_only to stop writing YAML.
+
+Setting plan_json_only any earlier breaks services that only read the
+YAML column.
+
+Revision ID: 5583c6e78156
+Revises: 3d1c8e21f103
+Create Date: 2014-10-16 11:02:44.630125
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5583c6e78156'
+down_revision = '3d1c8e21f103'
+
+
+def upgrade():
+    op.add_column('plan', sa.Column('raw_content_json', sa.Text))
+
+
+def downgrade():
+    op.drop_column('plan', 'raw_content_json')
@@ -21,6 +21,7 @@ import json
 from oslo.config import cfg
 from oslo.db import exception as db_exc
 from oslo.db.sqlalchemy import models
+from oslo.db.sqlalchemy import utils as db_utils
 import six
 from six import moves
 from sqlalchemy.ext import declarative
@@ -31,21 +32,25 @@ from solum.common import exception
 from solum.common import yamlutils
 from solum import objects
 from solum.objects import sqlalchemy as object_sqla
+from solum.openstack.common.gettextutils import _
 
 
-def table_args():
+def table_args(*indexes):
+    """Build ``__table_args__`` from the given indexes and engine options."""
     cfg.CONF.import_opt('connection', 'oslo.db.options',
                         group='database')
-    if cfg.CONF.database.connection is None:
-        # this is only within some object tests where
+    options = None
+    if cfg.CONF.database.connection is not None:
+        # the connection is only unset within some object tests where
         # the object classes are directly imported.
-        return None
-    engine_name = moves.urllib.parse.urlparse(
-        cfg.CONF.database.connection).scheme
-    if engine_name == 'mysql':
-        return {'mysql_engine': 'InnoDB',
-                'mysql_charset': "utf8"}
-    return None
+        engine_name = moves.urllib.parse.urlparse(
+            cfg.CONF.database.connection).scheme
+        if engine_name == 'mysql':
+            options = {'mysql_engine': 'InnoDB',
+                       'mysql_charset': "utf8"}
+    if indexes:
+        return indexes + (options or {},)
+    return options
 
 
 def model_query(context, model, *args, **kwargs):
@@ -61,6 +66,99 @@ def model_query(context, model, *args, **kwargs):
     return query
 
 
+def paginate_query(context, model, marker=None, limit=None, sort_key=None,
+                   sort_dir=None):
+    """Return a tenant scoped, keyset paginated list of a model.
+
+    Rows are restricted to the context's project (when the model has one)
+    and ordered by sort_key with the id as tie-breaker, so that the uuid
+    of the last row of a page can be passed back as the marker of the
+    next one.
+
+    :param context: context to query under
+    :param marker: uuid (or id, for models without one) of the last row
+                   of the previous page
+    :param limit: maximum number of rows to return
+    :param sort_key: column to sort on, defaults to created_at
+    :param sort_dir: 'asc' (the default) or 'desc'
+    """
+    sort_key = sort_key or 'created_at'
+    sort_dir = sort_dir or 'asc'
+    columns = model.__table__.columns
+    if sort_key not in columns:
+        raise exception.BadRequest(reason=_('Invalid sort key %s.') %
+                                   sort_key)
+    if sort_dir not in ('asc', 'desc'):
+        raise exception.BadRequest(reason=_('Invalid sort direction %s.') %
+                                   sort_dir)
+    sort_keys = [sort_key]
+    if sort_key != 'id':
+        sort_keys.append('id')
+
+    query = model_query(context, model)
+    if (context is not None and context.tenant and
+            'project_id' in columns):
+        query = query.filter_by(project_id=context.tenant)
+
+    marker_obj = None
+    if marker is not None:
+        marker_key = 'uuid' if 'uuid' in columns else 'id'
+        marker_obj = query.filter_by(**{marker_key: marker}).first()
+        if marker_obj is None:
+            raise exception.BadRequest(reason=_('Invalid marker %s.') %
+                                       marker)
+
+    return db_utils.paginate_query(query, model, limit, sort_keys,
+                                   marker=marker_obj, sort_dir=sort_dir).all()
+
+
+def uuids_by_id(model, ids):
+    """Return a {id: uuid} dict for the given rows of model in one query."""
+    ids = set(item_id for item_id in ids if item_id is not None)
+    if not ids:
+        return {}
+    session = object_sqla.get_session()
+    return dict(session.query(model.id, model.uuid).filter(
+        model.id.in_(ids)))
+
+
+def _ref_attr(fk):
+    return '_%s_ref' % fk
+
+
+def referenced_uuid(row, fk, model):
+    """Return the uuid of the model row that row's fk column refers to.
+
+    Uses the reference primed by prime_referenced_uuids() while fk still
+    matches it, and looks the referenced row up otherwise.
+    """
+    ref_id = getattr(row, fk)
+    if ref_id is None:
+        return None
+    cached = getattr(row, _ref_attr(fk), None)
+    if cached is None or cached[0] != ref_id:
+        ref = model.get_by_id(None, ref_id)
+        cached = (ref.id, ref.uuid)
+        setattr(row, _ref_attr(fk), cached)
+    return cached[1]
+
+
+def set_referenced_uuid(row, fk, model, uuid):
+    """Point row's fk column at the model row with the given uuid."""
+    ref = model.get_by_uuid(None, uuid)
+    setattr(row, fk, ref.id)
+    setattr(row, _ref_attr(fk), (ref.id, ref.uuid))
+
+
+def prime_referenced_uuids(rows, fk, model):
+    """Resolve referenced_uuid() for a whole list of rows in one query."""
+    uuids = uuids_by_id(model, [getattr(row, fk) for row in rows])
+    for row in rows:
+        ref_id = getattr(row, fk)
+        if ref_id in uuids:
+            setattr(row, _ref_attr(fk), (ref_id, uuids[ref_id]))
+
+
 class SolumBase(models.TimestampMixin, models.ModelBase):
 
     metadata = None
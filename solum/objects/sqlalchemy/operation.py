@@ -21,7 +21,9 @@ class Operation(sql.Base, abstract.Operation):
 
     __resource__ = 'operations'
     __tablename__ = 'operation'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sa.Index('ix_operation_uuid', 'uuid', unique=True),
+        sa.Index('ix_operation_project_id', 'project_id', 'created_at'))
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     uuid = sa.Column(sa.String(36), nullable=False)
@@ -38,5 +40,5 @@ class OperationList(abstract.OperationList):
     """Represent a list of operations in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return OperationList(sql.model_query(context, Operation))
+    def get_all(cls, context, **kwargs):
+        return OperationList(sql.paginate_query(context, Operation, **kwargs))
@@ -29,7 +29,10 @@ class Pipeline(sql.Base, abstract.Pipeline):
 
     __resource__ = 'pipelines'
     __tablename__ = 'pipeline'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sqlalchemy.Index('ix_pipeline_uuid', 'uuid', unique=True),
+        sqlalchemy.Index('ix_pipeline_trigger_id', 'trigger_id', unique=True),
+        sqlalchemy.Index('ix_pipeline_project_id', 'project_id', 'created_at'))
 
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True,
                            autoincrement=True)
@@ -48,12 +51,12 @@ class Pipeline(sql.Base, abstract.Pipeline):
 
     @property
     def plan_uuid(self):
-        return objects.registry.Plan.get_by_id(None, self.plan_id).uuid
+        return sql.referenced_uuid(self, 'plan_id', objects.registry.Plan)
 
     @plan_uuid.setter
     def plan_uuid(self, value):
-        plan = objects.registry.Plan.get_by_uuid(None, value)
-        self.plan_id = plan.id
+        sql.set_referenced_uuid(self, 'plan_id', objects.registry.Plan,
+                                value)
 
     @property
     def _extra_keys(self):
@@ -97,5 +100,9 @@ class PipelineList(abstract.PipelineList):
     """Represent a list of pipelines in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return PipelineList(sql.model_query(context, Pipeline))
+    def get_all(cls, context, **kwargs):
+        pipelines = PipelineList(sql.paginate_query(context, Pipeline,
+                                                    **kwargs))
+        sql.prime_referenced_uuids(pipelines, 'plan_id',
+                                   objects.registry.Plan)
+        return pipelines
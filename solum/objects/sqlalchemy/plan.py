@@ -12,18 +12,100 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import datetime
+import json
+
+from oslo.config import cfg
 import sqlalchemy
 
+from solum.common import exception
+from solum.common import yamlutils
+from solum import objects
 from solum.objects import plan as abstract
 from solum.objects.sqlalchemy import models as sql
+from solum.openstack.common.gettextutils import _
+from solum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+PLAN_OPTS = [
+    cfg.IntOpt('plan_cache_size',
+               default=1024,
+               help='Number of parsed plans each process keeps in memory. '
+                    '0 parses the plan every time it is loaded.'),
+    cfg.BoolOpt('plan_json_only',
+                default=False,
+                help='Stop writing plan content as YAML when schema_mode '
+                     'is new. Only enable this once every service runs '
+                     'with schema_mode transition or new and '
+                     '\'solum-db-manage migrate-plans\' has completed, as '
+                     'services from before the move to JSON only read '
+                     'the YAML.'),
+]
+
+cfg.CONF.register_opts(PLAN_OPTS, 'database')
+
+_UNSET = object()
+
+# (uuid, updated_at) -> (stored text, parsed raw_content), oldest first
+_parsed = collections.OrderedDict()
+
+
+def _parse(plan_uuid, updated_at, text, loads):
+    """Parse stored plan content, sharing the result between loads.
+
+    The stored text is compared as well as the key, so an update within
+    the timestamp resolution of the database is never served stale.
+    """
+    cache_size = cfg.CONF.database.plan_cache_size
+    if plan_uuid is None or cache_size <= 0:
+        return loads(text)
+    key = (plan_uuid, updated_at)
+    entry = _parsed.pop(key, None)
+    if entry is None or entry[0] != text:
+        entry = (text, loads(text))
+    _parsed[key] = entry
+    while len(_parsed) > cache_size:
+        _parsed.popitem(last=False)
+    return entry[1]
+
+
+def _json_default(value):
+    # YAML reads unquoted dates and times as such, JSON has no type for
+    # them, so they are stored as the ISO 8601 text they were written as.
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    raise exception.BadRequest(
+        reason=_('Plan content of type %s cannot be stored.') %
+        type(value).__name__)
+
+
+def _dumps(content):
+    return json.dumps(content, default=_json_default)
+
+
+def _json_only():
+    return (objects.new_schema() and not objects.transition_schema() and
+            cfg.CONF.database.plan_json_only)
 
 
 class Plan(sql.Base, abstract.Plan):
-    """Represent a plan in sqlalchemy."""
+    """Represent a plan in sqlalchemy.
+
+    raw_content used to be stored as YAML in the raw_content column and
+    is moving to JSON in raw_content_json, following schema_mode: 'old'
+    only writes YAML, 'transition' and 'new' write both. YAML is read
+    first, as services not yet upgraded only update that column. Once
+    plan_json_only is set as well, 'new' only writes and reads JSON.
+    Either column is read when the preferred one is empty.
+    """
 
     __resource__ = 'plans'
     __tablename__ = 'plan'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sqlalchemy.Index('ix_plan_uuid', 'uuid', unique=True),
+        sqlalchemy.Index('ix_plan_project_id', 'project_id', 'created_at'))
 
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True,
                            autoincrement=True)
@@ -32,18 +114,106 @@ class Plan(sql.Base, abstract.Plan):
     user_id = sqlalchemy.Column(sqlalchemy.String(36))
     name = sqlalchemy.Column(sqlalchemy.String(255))
     description = sqlalchemy.Column(sqlalchemy.String(255))
-    raw_content = sqlalchemy.Column(sql.YAMLEncodedDict(2048))
+    raw_content_yaml = sqlalchemy.Column('raw_content',
+                                         sqlalchemy.String(2048))
+    raw_content_json = sqlalchemy.Column(sqlalchemy.Text)
     deploy_keys_uri = sqlalchemy.Column(sqlalchemy.String(1024))
 
+    @property
+    def raw_content(self):
+        """The plan document.
+
+        The parsed document is shared with other loads of the same plan,
+        so assign a new one instead of modifying it in place.
+        """
+        content = self.__dict__.get('_raw_content', _UNSET)
+        if content is _UNSET:
+            content = self._load_raw_content()
+            self._raw_content = content
+        return content
+
+    @raw_content.setter
+    def raw_content(self, value):
+        self._raw_content = value
+
+    def _load_raw_content(self):
+        stored = [(self.raw_content_yaml, yamlutils.load),
+                  (self.raw_content_json, json.loads)]
+        if _json_only():
+            stored.reverse()
+        for text, loads in stored:
+            if text is not None:
+                return _parse(self.uuid, self.updated_at, text, loads)
+        return None
+
+    def _store_raw_content(self):
+        content = self.__dict__.get('_raw_content', _UNSET)
+        if content is _UNSET:
+            return
+        if _json_only():
+            self.raw_content_yaml = None
+        else:
+            self.raw_content_yaml = (None if content is None
+                                     else yamlutils.dump(content))
+        if objects.new_schema():
+            self.add_forward_schema_changes()
+
+    def add_forward_schema_changes(self):
+        content = self.raw_content
+        self.raw_content_json = (None if content is None
+                                 else _dumps(content))
+
+    def save(self, context):
+        self._store_raw_content()
+        super(Plan, self).save(context)
+
+    def create(self, context):
+        self._store_raw_content()
+        super(Plan, self).create(context)
+
     def refined_content(self):
-        if self.raw_content and self.uuid:
-            self.raw_content['uuid'] = self.uuid
-        return self.raw_content
+        if self.raw_content is None:
+            return None
+        content = dict(self.raw_content)
+        if self.uuid:
+            content['uuid'] = self.uuid
+        return content
+
+    @classmethod
+    def migrate_raw_content(cls, batch_size=100):
+        session = cls.get_session()
+        last_id = 0
+        count = 0
+        while True:
+            with session.begin():
+                rows = session.query(cls.id, cls.raw_content_yaml).filter(
+                    cls.id > last_id,
+                    cls.raw_content_json == sqlalchemy.null(),
+                    cls.raw_content_yaml != sqlalchemy.null()).order_by(
+                    cls.id).limit(batch_size).all()
+                for plan_id, text in rows:
+                    try:
+                        content = _dumps(yamlutils.load(text))
+                    except exception.BadRequest as ex:
+                        # still read from the YAML, which is kept
+                        LOG.warn(_('Plan %(id)s not migrated: %(err)s') %
+                                 {'id': plan_id, 'err': ex})
+                        continue
+                    # only if no transition mode writer got there first
+                    count += session.query(cls).filter(
+                        cls.id == plan_id,
+                        cls.raw_content_json == sqlalchemy.null(),
+                        cls.raw_content_yaml == text).update(
+                        {'raw_content_json': content},
+                        synchronize_session=False)
+            if len(rows) < batch_size:
+                return count
+            last_id = rows[-1][0]
 
 
 class PlanList(abstract.PlanList):
     """Represent a list of plans in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return PlanList(sql.model_query(context, Plan))
+    def get_all(cls, context, **kwargs):
+        return PlanList(sql.paginate_query(context, Plan, **kwargs))
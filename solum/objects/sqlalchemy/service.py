@@ -23,7 +23,9 @@ class Service(sql.Base, abstract.Service):
 
     __resource__ = 'services'
     __tablename__ = 'service'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sa.Index('ix_service_uuid', 'uuid', unique=True),
+        sa.Index('ix_service_project_id', 'project_id', 'created_at'))
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     uuid = sa.Column(sa.String(36), nullable=False)
@@ -40,5 +42,5 @@ class ServiceList(abstract.ServiceList):
     """Represent a list of services in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return ServiceList(sql.model_query(context, Service))
+    def get_all(cls, context, **kwargs):
+        return ServiceList(sql.paginate_query(context, Service, **kwargs))
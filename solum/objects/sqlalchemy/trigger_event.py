@@ -0,0 +1,97 @@
+# Copyright 2014 - Rackspace
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+
+import sqlalchemy as sa
+
+from solum.objects.sqlalchemy import models as sql
+from solum.objects import trigger_event as abstract
+from solum.openstack.common import timeutils
+
+
+class TriggerEvent(sql.Base, abstract.TriggerEvent):
+    """A trigger event waiting for its workflow to run.
+
+    Events are stored when the conductor receives them and deleted once
+    their workflow has run, so that events still waiting when a conductor
+    stops are picked up again. A conductor claims an event before running
+    it, so that only one of several conductors ever does.
+    """
+
+    __tablename__ = 'trigger_events'
+    __table_args__ = sql.table_args(
+        sa.Index('ix_trigger_events_trigger_id_ref', 'trigger_id', 'ref'))
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    trigger_id = sa.Column(sa.String(36), nullable=False)
+    ref = sa.Column(sa.String(255))
+    commit_sha = sa.Column(sa.String(40))
+    event = sa.Column(sa.String(64))
+    status_url = sa.Column(sa.String(1024))
+    collab_url = sa.Column(sa.String(1024))
+    claimed_by = sa.Column(sa.String(255))
+    claimed_at = sa.Column(sa.DateTime)
+
+    @classmethod
+    def enqueue(cls, context, trigger_id, ref, commit_sha, event,
+                status_url=None, collab_url=None):
+        """Store an event, replacing unclaimed ones on the same ref.
+
+        Returns None when the same event is already waiting or running,
+        e.g. when the webhook was delivered again.
+        """
+        session = sql.Base.get_session()
+        with session.begin():
+            slot = session.query(cls).filter_by(trigger_id=trigger_id,
+                                                ref=ref)
+            if slot.filter_by(commit_sha=commit_sha, event=event).count():
+                return None
+            slot.filter(cls.claimed_at.is_(None)).delete(
+                synchronize_session=False)
+            pending = cls(trigger_id=trigger_id, ref=ref,
+                          commit_sha=commit_sha, event=event,
+                          status_url=status_url, collab_url=collab_url)
+            session.add(pending)
+        return pending
+
+    def claim(self, context, host, timeout):
+        """Take the event for host, unless it was replaced or taken.
+
+        A claim older than timeout seconds belongs to a conductor that
+        stopped while running the workflow, and is taken over.
+        """
+        now = timeutils.utcnow()
+        stale = now - datetime.timedelta(seconds=timeout)
+        cls = self.__class__
+        session = sql.Base.get_session()
+        with session.begin():
+            # the id of a replaced event may be reused by the new one
+            claimed = session.query(cls).filter_by(
+                id=self.id, commit_sha=self.commit_sha,
+                event=self.event).filter(
+                sa.or_(cls.claimed_at.is_(None),
+                       cls.claimed_at < stale)).update(
+                {'claimed_by': host, 'claimed_at': now},
+                synchronize_session=False)
+        return claimed == 1
+
+
+class TriggerEventList(abstract.TriggerEventList):
+    """Represent a list of trigger events in sqlalchemy."""
+
+    @classmethod
+    def get_all(cls, context):
+        return TriggerEventList(sql.model_query(context, TriggerEvent).
+                                order_by(TriggerEvent.id).all())
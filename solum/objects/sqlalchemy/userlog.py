@@ -23,7 +23,8 @@ class Userlog(sql.Base, abstract.Userlog):
 
     __tablename__ = 'userlogs'
     __resource__ = 'userlogs'
-    __table_args__ = sql.table_args()
+    __table_args__ = sql.table_args(
+        sa.Index('ix_userlogs_assembly_uuid', 'assembly_uuid'))
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
     assembly_uuid = sa.Column(sa.String(36), nullable=False)
@@ -37,5 +38,5 @@ class UserlogList(abstract.UserlogList):
     """Represent a list of userlogs in sqlalchemy."""
 
     @classmethod
-    def get_all(cls, context):
-        return UserlogList(sql.model_query(context, Userlog))
+    def get_all(cls, context, **kwargs):
+        return UserlogList(sql.paginate_query(context, Userlog, **kwargs))
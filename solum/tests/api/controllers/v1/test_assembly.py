@@ -49,6 +49,18 @@ class TestAssemblyController(base.BaseTestCase):
         hand_get.assert_called_with('test_id')
         self.assertEqual(200, resp_mock.status)
 
+    def test_assembly_get_wait_for_change(self, AssemblyHandler,
+                                          resp_mock, request_mock):
+        hand_watch = AssemblyHandler.return_value.watch
+        fake_assembly = fakes.FakeAssembly()
+        hand_watch.return_value = fake_assembly
+        cont = assembly.AssemblyController('test_id')
+        resp = cont.get(wait_for_change='BUILDING')
+        self.assertEqual(fake_assembly.status, resp['result'].status)
+        hand_watch.assert_called_with('test_id', 'BUILDING')
+        self.assertFalse(AssemblyHandler.return_value.get.called)
+        self.assertEqual(200, resp_mock.status)
+
     def test_assembly_get_not_found(self, AssemblyHandler,
                                     resp_mock, request_mock):
         hand_get = AssemblyHandler.return_value.get
@@ -158,7 +170,8 @@ class TestAssembliesController(base.BaseTestCase):
         self.assertEqual(fake_assembly.user_id, resp['result'][0].user_id)
         self.assertEqual(fake_assembly.application_uri,
                          resp['result'][0].application_uri)
-        hand_get.assert_called_with()
+        hand_get.assert_called_with(marker=None, limit=100,
+                                    sort_key=None, sort_dir=None)
         self.assertEqual(200, resp_mock.status)
         self.assertIsNotNone(resp)
 
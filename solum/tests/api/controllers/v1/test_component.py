@@ -123,7 +123,8 @@ class TestComponentsController(base.BaseTestCase):
         hand_get_all.return_value = [fake_component]
         obj = component.ComponentsController()
         resp = obj.get_all()
-        hand_get_all.assert_called_with()
+        hand_get_all.assert_called_with(marker=None, limit=100,
+                                        sort_key=None, sort_dir=None)
         self.assertIsNotNone(resp)
         self.assertEqual(fake_component.name, resp['result'][0].name)
         self.assertEqual(fake_component.description,
@@ -0,0 +1,144 @@
+# Copyright 2014 - Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+
+import mock
+
+from solum.api.controllers.v1 import assembly
+from solum.api.controllers.v1 import conditional
+from solum.common import exception
+from solum.objects.sqlalchemy import component
+from solum.tests import base
+from solum.tests import fakes
+
+
+def _fake_obj(microsecond=0, id=1):
+    obj = mock.Mock(id=id, uuid='test_uuid')
+    obj.updated_at = datetime.datetime(2014, 10, 1, 12, 0, 0, microsecond)
+    return obj
+
+
+@mock.patch('pecan.request', new_callable=fakes.FakePecanRequest)
+@mock.patch('pecan.response', new_callable=fakes.FakePecanResponse)
+class TestConditional(base.BaseTestCase):
+
+    def test_check_sets_validators(self, resp_mock, request_mock):
+        request_mock.headers = {}
+        conditional.check(_fake_obj())
+        self.assertIn('ETag', resp_mock.headers)
+        self.assertEqual('Wed, 01 Oct 2014 12:00:00 GMT',
+                         resp_mock.headers['Last-Modified'])
+
+    def test_etag_follows_updates(self, resp_mock, request_mock):
+        request_mock.headers = {}
+        obj = _fake_obj()
+        conditional.check(obj)
+        etag = resp_mock.headers['ETag']
+        self.assertFalse(obj.as_dict.called)
+        conditional.check(_fake_obj())
+        self.assertEqual(etag, resp_mock.headers['ETag'])
+        conditional.check(_fake_obj(microsecond=1))
+        self.assertNotEqual(etag, resp_mock.headers['ETag'])
+        conditional.check(_fake_obj(id=2))
+        self.assertNotEqual(etag, resp_mock.headers['ETag'])
+        request_mock.pecan['content_type'] = 'application/xml'
+        conditional.check(_fake_obj())
+        self.assertNotEqual(etag, resp_mock.headers['ETag'])
+
+    def test_etag_follows_changes_within_a_second(self, resp_mock,
+                                                  request_mock):
+        request_mock.headers = {}
+        stamp = datetime.datetime(2014, 10, 1, 12, 0, 0)
+        comp = component.Component(id=1, uuid='test_uuid', name='web',
+                                   description='old', updated_at=stamp)
+        conditional.check(comp)
+        etag = resp_mock.headers['ETag']
+        conditional.check(comp)
+        self.assertEqual(etag, resp_mock.headers['ETag'])
+        # saved again within the same whole second
+        comp.description = 'new'
+        conditional.check(comp)
+        self.assertNotEqual(etag, resp_mock.headers['ETag'])
+
+    def test_if_none_match(self, resp_mock, request_mock):
+        request_mock.headers = {}
+        conditional.check(_fake_obj())
+        etag = resp_mock.headers['ETag']
+
+        for header in (etag, '"other", %s' % etag, 'W/%s' % etag, '*'):
+            request_mock.headers = {'If-None-Match': header}
+            self.assertRaises(exception.NotModified, conditional.check,
+                              _fake_obj())
+        request_mock.headers = {'If-None-Match': '"other"'}
+        conditional.check(_fake_obj())
+
+    def test_if_modified_since(self, resp_mock, request_mock):
+        request_mock.headers = {
+            'If-Modified-Since': 'Wed, 01 Oct 2014 12:00:00 GMT'}
+        self.assertRaises(exception.NotModified, conditional.check,
+                          _fake_obj())
+        request_mock.headers = {
+            'If-Modified-Since': 'Wed, 01 Oct 2014 11:59:59 GMT'}
+        conditional.check(_fake_obj())
+        request_mock.headers = {'If-Modified-Since': 'garbage'}
+        conditional.check(_fake_obj())
+
+    def test_if_none_match_wins(self, resp_mock, request_mock):
+        request_mock.headers = {
+            'If-None-Match': '"other"',
+            'If-Modified-Since': 'Wed, 01 Oct 2014 12:00:00 GMT'}
+        conditional.check(_fake_obj())
+
+    def test_check_list(self, resp_mock, request_mock):
+        request_mock.headers = {}
+        conditional.check_list([_fake_obj(), _fake_obj(id=2)])
+        etag = resp_mock.headers['ETag']
+        self.assertNotIn('Last-Modified', resp_mock.headers)
+        conditional.check_list([_fake_obj()])
+        self.assertNotEqual(etag, resp_mock.headers['ETag'])
+
+        request_mock.headers = {
+            'If-Modified-Since': 'Wed, 01 Oct 2014 12:00:00 GMT'}
+        conditional.check_list([_fake_obj()])
+        request_mock.headers = {'If-None-Match': resp_mock.headers['ETag']}
+        self.assertRaises(exception.NotModified, conditional.check_list,
+                          [_fake_obj()])
+
+    @mock.patch('solum.api.handlers.assembly_handler.AssemblyHandler')
+    def test_controller_not_modified(self, AssemblyHandler, resp_mock,
+                                     request_mock):
+        request_mock.headers = {}
+        AssemblyHandler.return_value.get.return_value = fakes.FakeAssembly()
+        controller = assembly.AssemblyController('test_id')
+        controller.get()
+        self.assertEqual(200, resp_mock.status)
+
+        request_mock.headers = {'If-None-Match': resp_mock.headers['ETag']}
+        controller.get()
+        self.assertEqual(304, resp_mock.status)
+
+
+class TestNotModifiedHook(base.BaseTestCase):
+
+    def test_after(self):
+        state = mock.Mock()
+        state.response.status_int = 304
+        conditional.NotModifiedHook().after(state)
+        self.assertEqual('', state.response.body)
+
+        state.response.status_int = 200
+        state.response.body = 'body'
+        conditional.NotModifiedHook().after(state)
+        self.assertEqual('body', state.response.body)
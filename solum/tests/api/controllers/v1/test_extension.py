@@ -142,7 +142,8 @@ class TestExtensionsController(base.BaseTestCase):
                          resp['result'][0].project_id)
         self.assertEqual(fake_extension.uuid, resp['result'][0].uuid)
         self.assertEqual(fake_extension.version, resp['result'][0].version)
-        hand_get_all.assert_called_with()
+        hand_get_all.assert_called_with(marker=None, limit=100,
+                                        sort_key=None, sort_dir=None)
         self.assertEqual(200, resp_mock.status)
 
     def test_extensions_post(self, handler_mock, resp_mock, request_mock):
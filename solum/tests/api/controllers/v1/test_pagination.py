@@ -0,0 +1,61 @@
+# Copyright 2014 - Rackspace
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from oslo.config import cfg
+
+from solum.api.controllers.v1 import pagination
+from solum.common import exception
+from solum.tests import base
+from solum.tests import fakes
+
+
+@mock.patch('pecan.request', new_callable=fakes.FakePecanRequest)
+@mock.patch('pecan.response', new_callable=fakes.FakePecanResponse)
+class TestPagination(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestPagination, self).setUp()
+        cfg.CONF.set_override('max_page_size', 5, group='api')
+
+    def test_get_limit(self, resp_mock, request_mock):
+        cfg.CONF.set_override('default_page_size', 4, group='api')
+        self.assertEqual(4, pagination.get_limit(None))
+        self.assertEqual(3, pagination.get_limit('3'))
+        self.assertEqual(5, pagination.get_limit(50))
+        self.assertRaises(exception.BadRequest, pagination.get_limit, 0)
+        self.assertRaises(exception.BadRequest, pagination.get_limit, 'x')
+
+    def test_get_page_links_next(self, resp_mock, request_mock):
+        request_mock.path_url = 'http://test_url:8080/v1/assemblies'
+        resp_mock.headers = {}
+        handler = mock.MagicMock()
+        handler.get_all.return_value = [fakes.FakeAssembly(),
+                                        fakes.FakeAssembly()]
+        items = pagination.get_page(handler, limit=2, sort_key='name')
+        self.assertEqual(handler.get_all.return_value, items)
+        handler.get_all.assert_called_once_with(marker=None, limit=2,
+                                                sort_key='name',
+                                                sort_dir=None)
+        self.assertEqual(
+            '<http://test_url:8080/v1/assemblies?limit=2&marker=%s'
+            '&sort_key=name>; rel="next"' % items[-1].uuid,
+            resp_mock.headers['Link'])
+
+    def test_get_page_last_page(self, resp_mock, request_mock):
+        resp_mock.headers = {}
+        handler = mock.MagicMock()
+        handler.get_all.return_value = [fakes.FakeAssembly()]
+        pagination.get_page(handler, limit=2)
+        self.assertNotIn('Link', resp_mock.headers)
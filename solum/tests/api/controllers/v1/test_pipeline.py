@@ -148,7 +148,8 @@ class TestPipelinesController(base.BaseTestCase):
                          resp['result'][0].project_id)
         self.assertEqual(fake_pipeline.uuid, resp['result'][0].uuid)
         self.assertEqual(fake_pipeline.user_id, resp['result'][0].user_id)
-        hand_get.assert_called_with()
+        hand_get.assert_called_with(marker=None, limit=100,
+                                    sort_key=None, sort_dir=None)
         self.assertEqual(200, resp_mock.status)
         self.assertIsNotNone(resp)
 
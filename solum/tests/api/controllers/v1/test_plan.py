@@ -12,7 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+
 import mock
+from oslo.config import cfg
 from oslo.db import exception as db_exc
 import pecan
 import yaml
@@ -35,6 +38,46 @@ class TestPlanModuleFunctions(base.BaseTestCase):
         self.assertEqual(ref_content['uri'], '%s/v1/plans/%s' %
                                              (pecan.request.host_url, m.uuid))
 
+    @mock.patch('pecan.request', new_callable=fakes.FakePecanRequest)
+    def test_render_plans_yaml(self, mock_req):
+        self.addCleanup(plan._rendered.clear)
+        plans = [fakes.FakePlan(), fakes.FakePlan()]
+        plans[1].uuid = 'other_uuid'
+        self.assertEqual(yaml.safe_dump([plan.yaml_content(m)
+                                         for m in plans]),
+                         plan.render_plans(plans, 'yaml'))
+        self.assertEqual('[]\n', plan.render_plans([], 'yaml'))
+
+    @mock.patch('pecan.request', new_callable=fakes.FakePecanRequest)
+    def test_render_plans_json(self, mock_req):
+        self.addCleanup(plan._rendered.clear)
+        plans = [fakes.FakePlan(), fakes.FakePlan()]
+        plans[1].uuid = 'other_uuid'
+        resp = json.loads(plan.render_plans(plans, 'json'))
+        self.assertEqual(['test_uuid', 'other_uuid'],
+                         [p['uuid'] for p in resp])
+        self.assertEqual([], json.loads(plan.render_plans([], 'json')))
+
+    @mock.patch('pecan.request', new_callable=fakes.FakePecanRequest)
+    def test_render_plans_cached(self, mock_req):
+        self.addCleanup(plan._rendered.clear)
+        m = fakes.FakePlan()
+        m.refined_content = mock.MagicMock(return_value={'name': 'faker'})
+        plan.render_plans([m], 'yaml')
+        plan.render_plans([m], 'yaml')
+        self.assertEqual(1, m.refined_content.call_count)
+
+        # a reload of a changed plan has a new raw_content
+        m.raw_content = {'name': 'changed'}
+        plan.render_plans([m], 'yaml')
+        self.assertEqual(2, m.refined_content.call_count)
+
+        cfg.CONF.set_override('plan_response_cache_size', 0, group='api')
+        plan._rendered.clear()
+        plan.render_plans([m], 'yaml')
+        plan.render_plans([m], 'yaml')
+        self.assertEqual(4, m.refined_content.call_count)
+
     @mock.patch('solum.api.controllers.v1.plan.init_plan_v1')
     def test_init_plan_by_version(self, init_plan_v1):
         yml_input_plan = {'version': 1, 'name': 'plan1', 'description': 'dsc'}
@@ -84,6 +127,14 @@ class TestPlanController(base.BaseTestCase):
         hand_get.assert_called_with('test_id')
         self.assertEqual(200, resp_mock.status)
 
+    def test_plan_get_json(self, PlanHandler, resp_mock, request_mock):
+        request_mock.pecan['content_type'] = 'application/json'
+        fake_plan = fakes.FakePlan()
+        PlanHandler.return_value.get.return_value = fake_plan
+        resp = json.loads(plan.PlanController('test_id').get())
+        self.assertEqual(fake_plan.raw_content['name'], resp['name'])
+        self.assertEqual(200, resp_mock.status)
+
     def test_plan_get_not_found(self, PlanHandler, resp_mock, request_mock):
         hand_get = PlanHandler.return_value.get
         hand_get.side_effect = exception.ResourceNotFound(name='plan',
@@ -203,7 +254,16 @@ class TestPlansController(base.BaseTestCase):
         resp_yml = yaml.load(resp)
         self.assertEqual(fake_plan.raw_content['name'], resp_yml[0]['name'])
         self.assertEqual(200, resp_mock.status)
-        hand_get.assert_called_with()
+        hand_get.assert_called_with(marker=None, limit=100,
+                                    sort_key=None, sort_dir=None)
+
+    def test_plans_get_all_json(self, PlanHandler, resp_mock, request_mock):
+        request_mock.pecan['content_type'] = 'application/json'
+        fake_plan = fakes.FakePlan()
+        PlanHandler.return_value.get_all.return_value = [fake_plan]
+        resp = json.loads(plan.PlansController().get_all())
+        self.assertEqual(fake_plan.raw_content['name'], resp[0]['name'])
+        self.assertEqual(200, resp_mock.status)
 
     def test_plans_post(self, PlanHandler, resp_mock, request_mock):
         request_mock.body = 'version: 1\nname: ex_plan1\ndescription: dsc1.'
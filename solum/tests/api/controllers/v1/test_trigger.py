@@ -25,83 +25,79 @@ from solum.tests import fakes
 
 @mock.patch('pecan.request', new_callable=fakes.FakePecanRequest)
 @mock.patch('pecan.response', new_callable=fakes.FakePecanResponse)
-@mock.patch('solum.api.controllers.v1.trigger.assembly_handler'
-            '.AssemblyHandler')
-@mock.patch('solum.api.controllers.v1.trigger.pipeline_handler'
-            '.PipelineHandler')
+@mock.patch('solum.api.controllers.v1.trigger.conductor_api.API')
+@mock.patch('solum.objects.registry')
 class TestTriggerController(base.BaseTestCase):
-    def test_trigger_post(self, pipe_mock, assem_mock,
+    def test_trigger_post(self, reg_mock, cond_mock,
                           resp_mock, request_mock):
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(202, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', '', None)
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='',
+            status_url=None, collab_url=None, event=None, ref=None)
 
-    def test_trigger_post_on_github_webhook(self, pipe_mock, assem_mock,
+    def test_trigger_post_on_github_webhook(self, reg_mock, cond_mock,
                                             resp_mock, request_mock):
         status_url = 'https://api.github.com/repos/u/r/statuses/{sha}'
         body_dict = {'sender': {'url': 'https://api.github.com'},
-                     'pull_request': {'head': {'sha': 'asdf'}},
+                     'pull_request': {'head': {'sha': 'asdf'}, 'number': 7},
                      'repository': {'statuses_url': status_url}}
         expected_st_url = 'https://api.github.com/repos/u/r/statuses/asdf'
         request_mock.body = json.dumps(body_dict)
+        request_mock.headers = {'X-GitHub-Event': 'pull_request'}
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(202, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', 'asdf', expected_st_url)
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='asdf',
+            status_url=expected_st_url, collab_url=None,
+            event='pull_request', ref='pull/7')
 
-    def test_trigger_post_on_github_comment_webhook(self, pipe_mock,
-                                                    assem_mock, resp_mock,
-                                                    request_mock):
-        cfg.CONF.api.rebuild_phrase = "solum retry tests"
-        status_url = 'https://api.github.com/repos/u/r/statuses/{sha}'
-        collab_url = ('https://api.github.com/repos/u/r/' +
-                      'collaborators{/collaborator}')
+    def test_trigger_post_on_github_push_webhook(self, reg_mock, cond_mock,
+                                                 resp_mock, request_mock):
         body_dict = {'sender': {'url': 'https://api.github.com'},
-                     'comment': {'commit_id': 'asdf',
-                                 'body': '  SOLUM retry tests ',
-                                 'user': {'login': 'u'}},
-                     'repository': {'statuses_url': status_url,
-                                    'collaborators_url': collab_url,
-                                    'private': True}}
-        expected_st_url = 'https://api.github.com/repos/u/r/statuses/asdf'
+                     'ref': 'refs/heads/feature',
+                     'repository': {'statuses_url': 'unused'}}
         request_mock.body = json.dumps(body_dict)
+        request_mock.headers = {'X-GitHub-Event': 'push'}
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(202, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', 'asdf', expected_st_url)
-
-    @mock.patch('httplib2.Http.request')
-    def test_trigger_post_on_invalid_commenter_pub_repo(self, http_mock,
-                                                        pipe_mock,
-                                                        assem_mock, resp_mock,
-                                                        request_mock):
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='', status_url=None,
+            collab_url=None, event='push', ref='refs/heads/feature')
+
+    def test_trigger_post_on_github_comment_webhook(self, reg_mock,
+                                                    cond_mock, resp_mock,
+                                                    request_mock):
         cfg.CONF.api.rebuild_phrase = "solum retry tests"
         status_url = 'https://api.github.com/repos/u/r/statuses/{sha}'
         collab_url = ('https://api.github.com/repos/u/r/' +
                       'collaborators{/collaborator}')
         body_dict = {'sender': {'url': 'https://api.github.com'},
                      'comment': {'commit_id': 'asdf',
-                                 'body': 'solum retry tests',
+                                 'body': '  SOLUM retry tests ',
                                  'user': {'login': 'u'}},
                      'repository': {'statuses_url': status_url,
                                     'collaborators_url': collab_url,
-                                    'private': False}}
+                                    'private': True}}
+        expected_st_url = 'https://api.github.com/repos/u/r/statuses/asdf'
         request_mock.body = json.dumps(body_dict)
-        http_mock.return_value = ({'status': '404'}, '')  # Not a collaborator
         obj = trigger.TriggerController()
         obj.post('test_id')
-        self.assertEqual(403, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        assert not tw.called
-
-    @mock.patch('httplib2.Http.request')
-    def test_trigger_post_on_mismatch_comment_pub_repo(self, http_mock,
-                                                       pipe_mock,
-                                                       assem_mock, resp_mock,
+        self.assertEqual(202, resp_mock.status)
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='asdf',
+            status_url=expected_st_url, collab_url=None, event=None,
+            ref='asdf')
+
+    def test_trigger_post_on_mismatch_comment_pub_repo(self, reg_mock,
+                                                       cond_mock, resp_mock,
                                                        request_mock):
         cfg.CONF.api.rebuild_phrase = "solum retry tests"
         status_url = 'https://api.github.com/repos/u/r/statuses/{sha}'
@@ -115,18 +111,14 @@ class TestTriggerController(base.BaseTestCase):
                                     'collaborators_url': collab_url,
                                     'private': False}}
         request_mock.body = json.dumps(body_dict)
-        http_mock.return_value = ({'status': '204'}, '')  # a collaborator
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(403, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        assert not tw.called
+        tw = cond_mock.return_value.trigger_workflow
+        self.assertFalse(tw.called)
 
-    @mock.patch('httplib2.Http.request')
-    def test_trigger_post_on_valid_comment_pub_repo(self, http_mock,
-                                                    pipe_mock,
-                                                    assem_mock, resp_mock,
-                                                    request_mock):
+    def test_trigger_post_on_comment_pub_repo(self, reg_mock, cond_mock,
+                                              resp_mock, request_mock):
         cfg.CONF.api.rebuild_phrase = "solum retry tests"
         status_url = 'https://api.github.com/repos/u/r/statuses/{sha}'
         collab_url = ('https://api.github.com/repos/u/r/' +
@@ -140,15 +132,19 @@ class TestTriggerController(base.BaseTestCase):
                                     'private': False}}
         expected_st_url = 'https://api.github.com/repos/u/r/statuses/asdf'
         request_mock.body = json.dumps(body_dict)
-        http_mock.return_value = ({'status': '204'}, '')  # Valid collaborator
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(202, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', 'asdf', expected_st_url)
-
-    def test_trigger_post_on_comment_missing_login(self, pipe_mock,
-                                                   assem_mock, resp_mock,
+        # the conductor checks the commenter is a collaborator
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='asdf',
+            status_url=expected_st_url,
+            collab_url='https://api.github.com/repos/u/r/collaborators/u',
+            event=None, ref='asdf')
+
+    def test_trigger_post_on_comment_missing_login(self, reg_mock,
+                                                   cond_mock, resp_mock,
                                                    request_mock):
         cfg.CONF.api.rebuild_phrase = "solum retry tests"
         status_url = 'https://api.github.com/repos/u/r/statuses/{sha}'
@@ -165,10 +161,12 @@ class TestTriggerController(base.BaseTestCase):
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(202, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', '', None)
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='',
+            status_url=None, collab_url=None, event=None, ref=None)
 
-    def test_trigger_post_on_wrong_github_webhook(self, pipe_mock, assem_mock,
+    def test_trigger_post_on_wrong_github_webhook(self, reg_mock, cond_mock,
                                                   resp_mock, request_mock):
         status_url = 'https://api.github.com/repos/u/r/statuses/{sha}'
         body_dict = {'sender': {'url': 'https://api.github.com'},
@@ -178,49 +176,57 @@ class TestTriggerController(base.BaseTestCase):
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(202, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', 'asdf', None)
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='asdf',
+            status_url=None, collab_url=None, event=None, ref=None)
 
-    def test_trigger_post_on_unknown_git_webhook(self, pipe_mock, assem_mock,
+    def test_trigger_post_on_unknown_git_webhook(self, reg_mock, cond_mock,
                                                  resp_mock, request_mock):
         request_mock.body = ('"pull_request": {"head": {"sha": "asdf"}}}')
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(202, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', '', None)
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='',
+            status_url=None, collab_url=None, event=None, ref=None)
 
-    def test_trigger_post_on_non_github_webhook(self, pipe_mock, assem_mock,
+    def test_trigger_post_on_non_github_webhook(self, reg_mock, cond_mock,
                                                 resp_mock, request_mock):
         request_mock.body = ('{"sender": {"url" :"https://non-github.com"},' +
                              '"pull_request": {"head": {"sha": "asdf"}}}')
         obj = trigger.TriggerController()
         obj.post('test_id')
         self.assertEqual(202, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', '', None)
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='',
+            status_url=None, collab_url=None, event=None, ref=None)
 
-    def test_trigger_post_pipeline(self, pipe_mock, assem_mock,
+    def test_trigger_post_pipeline(self, reg_mock, cond_mock,
                                    resp_mock, request_mock):
         obj = trigger.TriggerController()
-        assem_mock.return_value.trigger_workflow.side_effect = (
+        reg_mock.Assembly.get_by_trigger_id.side_effect = (
             exception.ResourceNotFound(name='trigger', id='test_id'))
         obj.post('test_id')
 
         self.assertEqual(202, resp_mock.status)
-        tw = pipe_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id')
-
-    def test_trigger_post_none(self, pipe_mock, assem_mock,
+        reg_mock.Pipeline.get_by_trigger_id.assert_called_once_with(
+            None, 'test_id')
+        tw = cond_mock.return_value.trigger_workflow
+        tw.assert_called_once_with(
+            trigger_id='test_id', commit_sha='',
+            status_url=None, collab_url=None, event=None, ref=None)
+
+    def test_trigger_post_none(self, reg_mock, cond_mock,
                                resp_mock, request_mock):
         obj = trigger.TriggerController()
-        assem_mock.return_value.trigger_workflow.side_effect = (
+        reg_mock.Assembly.get_by_trigger_id.side_effect = (
             exception.ResourceNotFound(name='trigger', id='test_id'))
-        pipe_mock.return_value.trigger_workflow.side_effect = (
+        reg_mock.Pipeline.get_by_trigger_id.side_effect = (
             exception.ResourceNotFound(name='trigger', id='test_id'))
         obj.post('test_id')
         self.assertEqual(404, resp_mock.status)
-        tw = assem_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id', '', None)
-        tw = pipe_mock.return_value.trigger_workflow
-        tw.assert_called_once_with('test_id')
+        tw = cond_mock.return_value.trigger_workflow
+        self.assertFalse(tw.called)
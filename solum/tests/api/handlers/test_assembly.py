@@ -13,6 +13,7 @@
 # under the License.
 
 import mock
+from oslo.config import cfg
 
 from solum.api.handlers import assembly_handler
 from solum.objects import assembly
@@ -47,6 +48,38 @@ class TestAssemblyHandler(base.BaseTestCase):
         self.assertIsNotNone(res)
         mock_registry.AssemblyList.get_all.assert_called_once_with(self.ctx)
 
+    @mock.patch('solum.common.watch.Poller.wait')
+    def test_watch(self, mock_wait, mock_registry):
+        building = fakes.FakeAssembly()
+        building.status = STATES.BUILDING
+        ready = fakes.FakeAssembly()
+        ready.status = STATES.READY
+        get_by_uuid = mock_registry.Assembly.get_by_uuid
+        get_by_uuid.side_effect = [building, building, ready]
+        handler = assembly_handler.AssemblyHandler(self.ctx)
+        res = handler.watch('test_id', STATES.BUILDING)
+        self.assertEqual(ready, res)
+        self.assertEqual(2, mock_wait.call_count)
+        self.assertEqual((building.uuid, STATES.BUILDING),
+                         mock_wait.call_args[0][:2])
+
+    def test_watch_changed(self, mock_registry):
+        db_obj = fakes.FakeAssembly()
+        db_obj.status = STATES.READY
+        mock_registry.Assembly.get_by_uuid.return_value = db_obj
+        handler = assembly_handler.AssemblyHandler(self.ctx)
+        self.assertEqual(db_obj, handler.watch('test_id', STATES.BUILDING))
+
+    @mock.patch('solum.common.watch.Poller.wait')
+    def test_watch_timeout(self, mock_wait, mock_registry):
+        cfg.CONF.set_override('watch_timeout', 0, group='api')
+        db_obj = fakes.FakeAssembly()
+        db_obj.status = STATES.BUILDING
+        mock_registry.Assembly.get_by_uuid.return_value = db_obj
+        handler = assembly_handler.AssemblyHandler(self.ctx)
+        self.assertEqual(db_obj, handler.watch('test_id', STATES.BUILDING))
+        self.assertFalse(mock_wait.called)
+
     def test_update(self, mock_registry):
         data = {'user_id': 'new_user_id',
                 'plan_uuid': 'input_plan_uuid'}
@@ -150,9 +183,10 @@ class TestAssemblyHandler(base.BaseTestCase):
 
         mock_kc.return_value.create_trust_context.assert_called_once_with()
 
+    @mock.patch('solum.worker.api.API.cancel')
     @mock.patch('solum.common.solum_keystoneclient.KeystoneClientV3')
     @mock.patch('solum.deployer.api.API.destroy')
-    def test_delete(self, mock_deploy, mock_kc, mock_registry):
+    def test_delete(self, mock_deploy, mock_kc, mock_cancel, mock_registry):
         db_obj = fakes.FakeAssembly()
         mock_registry.Assembly.get_by_uuid.return_value = db_obj
         handler = assembly_handler.AssemblyHandler(self.ctx)
@@ -163,8 +197,27 @@ class TestAssemblyHandler(base.BaseTestCase):
         mock_kc.return_value.delete_trust.assert_called_once_with(
             'trust_worthy')
         mock_deploy.assert_called_once_with(assem_id=db_obj.id)
+        mock_cancel.assert_called_once_with(assembly_id=db_obj.id)
         self.assertEqual(STATES.DELETING, db_obj.status)
 
+    @mock.patch('solum.worker.api.API.perform_action')
+    @mock.patch('solum.worker.api.API.cancel')
+    def test_build_artifact_supersedes(self, mock_cancel, mock_pa,
+                                       mock_registry):
+        image = fakes.FakeImage()
+        mock_registry.Image.return_value = image
+        artifact = {'name': 'nodeus',
+                    'content': {'href': 'https://example.com/ex.git'}}
+        handler = assembly_handler.AssemblyHandler(self.ctx)
+        assem = fakes.FakeAssembly()
+        handler._build_artifact(assem, artifact)
+        self.assertFalse(mock_cancel.called)
+        handler._build_artifact(assem, artifact, supersede=True)
+        mock_cancel.assert_called_once_with(assembly_id=assem.id,
+                                            name='nodeus',
+                                            before_build_id=image.id)
+        self.assertEqual(2, mock_pa.call_count)
+
     def test_trigger_workflow(self, mock_registry):
         trigger_id = 1
         artifacts = [{"name": "Test",
@@ -185,9 +238,22 @@ class TestAssemblyHandler(base.BaseTestCase):
             artifact=artifacts[0],
             commit_sha='',
             status_url=None,
-            deploy_keys_ref=plan_obj.deploy_keys_uri)
+            deploy_keys_ref=plan_obj.deploy_keys_uri,
+            supersede=True)
         handler._context_from_trust_id.assert_called_once_with('trust_worthy')
         mock_registry.Assembly.get_by_trigger_id.assert_called_once_with(
             None, trigger_id)
         mock_registry.Plan.get_by_id.assert_called_once_with(self.ctx,
                                                              db_obj.plan_id)
+
+    @mock.patch('solum.common.github.is_repo_collaborator')
+    def test_trigger_workflow_not_collaborator(self, mock_collab,
+                                               mock_registry):
+        mock_collab.return_value = False
+        mock_registry.Assembly.get_by_trigger_id.return_value = (
+            fakes.FakeAssembly())
+        handler = assembly_handler.AssemblyHandler(None)
+        handler._context_from_trust_id = mock.MagicMock()
+        handler.trigger_workflow('tid', 'sha', 'status', 'collab')
+        mock_collab.assert_called_once_with('collab')
+        self.assertFalse(handler._context_from_trust_id.called)
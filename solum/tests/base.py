@@ -18,6 +18,8 @@ from oslo.config import cfg
 from oslotest import base
 import testscenarios
 
+from solum.common import clients
+
 
 class BaseTestCase(testscenarios.WithScenarios, base.BaseTestCase):
     """Test base class."""
@@ -25,3 +27,4 @@ class BaseTestCase(testscenarios.WithScenarios, base.BaseTestCase):
     def setUp(self):
         super(BaseTestCase, self).setUp()
         self.addCleanup(cfg.CONF.reset)
+        self.addCleanup(clients._client_cache.clear)
@@ -39,3 +39,13 @@ class APITest(base.BaseTestCase):
         rpc_api._cast = mock.MagicMock()
         rpc_api.echo('foo')
         rpc_api._cast.assert_called_once_with('echo', message='foo')
+
+    def test_fanout_cast(self):
+        topic = 'fake_topic'
+        rpc_api = service.API(context={}, topic=topic)
+        rpc_api._client = mock.MagicMock()
+        rpc_api._fanout_cast('control_topic', 'cancel', assembly_id=7)
+        rpc_api._client.prepare.assert_called_once_with(
+            topic='control_topic', fanout=True)
+        rpc_api._client.prepare.return_value.cast.assert_called_once_with(
+            {}, 'cancel', assembly_id=7)
@@ -12,7 +12,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import os.path
+import os
+import tempfile
 
 import mock
 
@@ -55,3 +56,33 @@ class TestCatalog(base.BaseTestCase):
             m_open.side_effect = IOError('test')
             self.assertRaises(exception.ObjectNotFound,
                               catalog.get, 'test', 'test_data')
+
+    def _write(self, path, content, mtime):
+        with open(path, 'w') as fd:
+            fd.write(content)
+        os.utime(path, (mtime, mtime))
+
+    def test_cached_until_mtime_changes(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(catalog._cache.clear)
+        path = os.path.join(tmpdir, 'basic.yaml')
+        self._write(path, 'description: one\n', 1000)
+        with mock.patch.object(catalog, '_path', return_value=path):
+            self.assertEqual('description: one\n',
+                             catalog.get('templates', 'basic'))
+            parsed = catalog.get_parsed('templates', 'basic')
+            self.assertEqual({'description': 'one'}, parsed)
+            self.assertIs(parsed, catalog.get_parsed('templates', 'basic'))
+
+            with mock.patch('solum.common.catalog.open',
+                            create=True) as m_open:
+                catalog.get('templates', 'basic')
+                self.assertFalse(m_open.called)
+
+            self._write(path, 'description: two\n', 2000)
+            self.assertEqual({'description': 'two'},
+                             catalog.get_parsed('templates', 'basic'))
+            self.assertEqual('description: two\n',
+                             catalog.get('templates', 'basic'))
+        os.remove(path)
+        os.rmdir(tmpdir)
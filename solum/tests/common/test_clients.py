@@ -24,6 +24,7 @@ from swiftclient import client as swiftclient
 from zaqarclient.queues.v1 import client as zaqarclient
 
 from solum.common import clients
+from solum.common import context
 from solum.common import exception
 from solum.tests import base
 
@@ -341,3 +342,138 @@ class ClientsTest(base.BaseTestCase):
         zaqar = obj.zaqar()
         zaqar_cached = obj.zaqar()
         self.assertEqual(zaqar, zaqar_cached)
+
+    @mock.patch.object(clients.OpenStackClients, 'keystone')
+    def test_url_for_cached(self, mock_keystone):
+        obj = clients.OpenStackClients(None)
+        mock_cat = mock_keystone.return_value.client.service_catalog
+        mock_cat.url_for.return_value = 'http://heat'
+        for i in range(2):
+            self.assertEqual('http://heat',
+                             obj.url_for(service_type='orchestration'))
+        self.assertEqual(1, mock_cat.url_for.call_count)
+
+
+class ClientCacheTest(base.BaseTestCase):
+
+    def _context(self, token='token1', tenant='tenant1', trust_id=None):
+        return context.RequestContext(auth_token=token, tenant=tenant,
+                                      trust_id=trust_id)
+
+    def test_same_token_reuses_clients(self):
+        osc = clients.get_clients(self._context())
+        self.assertIs(osc, clients.get_clients(self._context()))
+        self.assertIsNot(osc, clients.get_clients(self._context('token2')))
+        self.assertIsNot(osc, clients.get_clients(
+            self._context(tenant='tenant2')))
+
+    def test_no_credentials_not_cached(self):
+        ctx = self._context(token=None)
+        self.assertIsNot(clients.get_clients(ctx), clients.get_clients(ctx))
+        self.assertIsNot(clients.get_clients(None), clients.get_clients(None))
+
+    def test_disabled(self):
+        cfg.CONF.set_override('client_cache_ttl', 0)
+        ctx = self._context()
+        self.assertIsNot(clients.get_clients(ctx), clients.get_clients(ctx))
+
+    @mock.patch('time.time')
+    def test_ttl(self, mock_time):
+        cfg.CONF.set_override('client_cache_ttl', 10)
+        mock_time.return_value = 100
+        osc = clients.get_clients(self._context())
+        mock_time.return_value = 109
+        self.assertIs(osc, clients.get_clients(self._context()))
+        mock_time.return_value = 111
+        self.assertIsNot(osc, clients.get_clients(self._context()))
+
+    def test_token_expiring(self):
+        osc = clients.get_clients(self._context())
+        osc._keystone = mock.MagicMock()
+        auth_ref = osc._keystone._client.auth_ref
+        auth_ref.will_expire_soon.return_value = False
+        self.assertIs(osc, clients.get_clients(self._context()))
+        auth_ref.will_expire_soon.return_value = True
+        self.assertIsNot(osc, clients.get_clients(self._context()))
+
+    def test_size(self):
+        cfg.CONF.set_override('client_cache_size', 1)
+        osc = clients.get_clients(self._context())
+        clients.get_clients(self._context('token2'))
+        self.assertIsNot(osc, clients.get_clients(self._context()))
+
+    @mock.patch('solum.common.solum_keystoneclient.KeystoneClientV3')
+    def test_trust_context_gets_cached_token(self, mock_ks):
+        first = self._context(token=None, tenant=None, trust_id='trust')
+        osc = clients.get_clients(first)
+        keystone = mock_ks.return_value
+        keystone._client.auth_ref.will_expire_soon.return_value = False
+        keystone.context = context.RequestContext(
+            auth_token='trust_token', tenant='tenant1', user='user1',
+            auth_url='http://keystone/v3', trust_id='trust')
+
+        second = self._context(token=None, tenant=None, trust_id='trust')
+        self.assertIs(osc, clients.get_clients(second))
+        self.assertEqual('trust_token', second.auth_token)
+        self.assertEqual('tenant1', second.tenant)
+        self.assertEqual('user1', second.user)
+        self.assertEqual('http://keystone/v3', second.auth_url)
+        mock_ks.assert_called_once_with(first)
+
+    @mock.patch('time.time')
+    def test_known_expiry_outlives_ttl(self, mock_time):
+        cfg.CONF.set_override('client_cache_ttl', 10)
+        mock_time.return_value = 100
+        osc = clients.get_clients(self._context())
+        osc._keystone = mock.MagicMock()
+        osc._keystone._client.auth_ref.will_expire_soon.return_value = False
+        mock_time.return_value = 1000
+        self.assertIs(osc, clients.get_clients(self._context()))
+
+    @mock.patch('eventlet.spawn_n')
+    @mock.patch('solum.common.solum_keystoneclient.KeystoneClientV3')
+    def test_trust_token_refreshed_in_background(self, mock_ks, mock_spawn):
+        cfg.CONF.set_override('trust_token_refresh', 300)
+        auth_ref = mock.MagicMock()
+        auth_ref.will_expire_soon.side_effect = lambda secs: secs >= 300
+
+        def authenticate(ctx):
+            ctx.auth_token = 'trust_token'
+            keystone = mock.MagicMock(context=ctx)
+            keystone._client.auth_ref = auth_ref
+            return keystone
+        mock_ks.side_effect = authenticate
+
+        ctx = clients.get_trust_context('trust')
+        self.assertEqual('trust_token', ctx.auth_token)
+        self.assertFalse(mock_spawn.called)
+
+        osc = clients.get_clients(ctx)
+        clients.get_clients(ctx)
+        mock_spawn.assert_called_once_with(
+            clients._client_cache._refresh_trust, ('trust', 'trust'),
+            'trust')
+
+        refresh, key, trust_id = mock_spawn.call_args[0]
+        auth_ref.will_expire_soon.side_effect = None
+        auth_ref.will_expire_soon.return_value = False
+        refresh(key, trust_id)
+        new_osc = clients.get_clients(ctx)
+        self.assertIsNot(osc, new_osc)
+        self.assertEqual('trust', new_osc.context.trust_id)
+        self.assertEqual(1, mock_spawn.call_count)
+
+    @mock.patch('solum.common.solum_keystoneclient.KeystoneClientV3')
+    def test_trust_token_refresh_failure(self, mock_ks):
+        mock_ks.return_value._client.auth_ref.will_expire_soon.return_value = (
+            False)
+        osc = clients.get_clients(self._context(token=None,
+                                                trust_id='trust'))
+        osc.keystone()
+        mock_ks.side_effect = exception.AuthorizationFailure(
+            client='keystone', message='denied')
+        cache = clients._client_cache
+        cache._refresh_trust(('trust', 'trust'), 'trust')
+        self.assertEqual(set(), cache._refreshing)
+        self.assertIs(osc, clients.get_clients(
+            self._context(token=None, trust_id='trust')))
@@ -0,0 +1,89 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import socket
+
+import httplib2
+import mock
+from oslo.config import cfg
+
+from solum.common import github
+from solum.tests import base
+
+COLLAB_URL = 'https://api.github.com/repos/u/r/collaborators/u'
+
+
+@mock.patch('httplib2.Http.request')
+class IsRepoCollaboratorTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(IsRepoCollaboratorTest, self).setUp()
+        self.addCleanup(github._collaborators.clear)
+
+    def test_collaborator(self, mock_request):
+        mock_request.return_value = ({'status': '204'}, '')
+        self.assertTrue(github.is_repo_collaborator(COLLAB_URL))
+        mock_request.assert_called_once_with(COLLAB_URL)
+
+    def test_not_collaborator(self, mock_request):
+        mock_request.return_value = ({'status': '404'}, '')
+        self.assertFalse(github.is_repo_collaborator(COLLAB_URL))
+
+    def test_error(self, mock_request):
+        mock_request.side_effect = httplib2.HttpLib2Error()
+        self.assertFalse(github.is_repo_collaborator(COLLAB_URL))
+
+    def test_timeout_not_cached(self, mock_request):
+        mock_request.side_effect = socket.timeout()
+        self.assertFalse(github.is_repo_collaborator(COLLAB_URL))
+        mock_request.side_effect = None
+        mock_request.return_value = ({'status': '204'}, '')
+        self.assertTrue(github.is_repo_collaborator(COLLAB_URL))
+
+    @mock.patch('time.time')
+    def test_cached(self, mock_time, mock_request):
+        cfg.CONF.set_override('github_collaborator_cache_ttl', 300)
+        cfg.CONF.set_override('github_collaborator_negative_ttl', 60)
+        mock_time.return_value = 1000
+        mock_request.return_value = ({'status': '204'}, '')
+        self.assertTrue(github.is_repo_collaborator(COLLAB_URL))
+        other_url = COLLAB_URL + 'x'
+        mock_request.return_value = ({'status': '404'}, '')
+        self.assertFalse(github.is_repo_collaborator(other_url))
+        self.assertEqual(2, mock_request.call_count)
+
+        mock_time.return_value = 1059
+        self.assertTrue(github.is_repo_collaborator(COLLAB_URL))
+        self.assertFalse(github.is_repo_collaborator(other_url))
+        self.assertEqual(2, mock_request.call_count)
+
+        mock_time.return_value = 1061
+        self.assertFalse(github.is_repo_collaborator(other_url))
+        self.assertTrue(github.is_repo_collaborator(COLLAB_URL))
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_cache_disabled(self, mock_request):
+        cfg.CONF.set_override('github_collaborator_cache_ttl', 0)
+        mock_request.return_value = ({'status': '204'}, '')
+        github.is_repo_collaborator(COLLAB_URL)
+        github.is_repo_collaborator(COLLAB_URL)
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_cache_size(self, mock_request):
+        cfg.CONF.set_override('github_collaborator_cache_size', 1)
+        mock_request.return_value = ({'status': '204'}, '')
+        github.is_repo_collaborator(COLLAB_URL)
+        github.is_repo_collaborator(COLLAB_URL + 'x')
+        github.is_repo_collaborator(COLLAB_URL)
+        self.assertEqual(3, mock_request.call_count)
@@ -0,0 +1,133 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import io
+
+from Crypto.PublicKey import RSA
+import mock
+
+from solum.common import keypool
+from solum.tests import base
+
+
+class TestKeyPool(base.BaseTestCase):
+
+    @mock.patch.object(keypool, 'generate_key')
+    @mock.patch('eventlet.spawn_n')
+    def test_get_from_pool(self, mock_spawn, mock_gen):
+        pool = keypool.KeyPool(2)
+        pool._keys.extend([('priv1', 'pub1'), ('priv2', 'pub2')])
+        self.assertEqual(('priv1', 'pub1'), pool.get())
+        self.assertEqual(1, len(pool))
+        self.assertFalse(mock_gen.called)
+        mock_spawn.assert_called_once_with(pool._refill)
+
+    @mock.patch.object(keypool, 'generate_key')
+    @mock.patch('eventlet.spawn_n')
+    def test_get_empty_falls_back_inline(self, mock_spawn, mock_gen):
+        mock_gen.return_value = ('priv', 'pub')
+        pool = keypool.KeyPool(2, bits=1024)
+        self.assertEqual(('priv', 'pub'), pool.get())
+        mock_gen.assert_called_once_with(1024)
+        self.assertTrue(mock_spawn.called)
+
+    @mock.patch.object(keypool, 'generate_key')
+    @mock.patch('eventlet.spawn_n')
+    def test_disabled_pool_never_refills(self, mock_spawn, mock_gen):
+        mock_gen.return_value = ('priv', 'pub')
+        pool = keypool.KeyPool(0)
+        self.assertEqual(('priv', 'pub'), pool.get())
+        self.assertFalse(mock_spawn.called)
+
+    @mock.patch.object(keypool, 'generate_key')
+    @mock.patch('eventlet.spawn_n')
+    def test_refill_below_low_water(self, mock_spawn, mock_gen):
+        pool = keypool.KeyPool(4, low_water=2)
+        pool._keys.extend([('priv%d' % i, 'pub') for i in range(4)])
+        pool.get()
+        pool.get()
+        self.assertFalse(mock_spawn.called)
+        pool.get()
+        mock_spawn.assert_called_once_with(pool._refill)
+
+    @mock.patch('eventlet.spawn_n')
+    def test_prewarm(self, mock_spawn):
+        self.addCleanup(setattr, keypool, '_pool', None)
+        keypool._pool = keypool.KeyPool(2)
+        keypool.prewarm()
+        mock_spawn.assert_called_once_with(keypool._pool._refill)
+
+    @mock.patch('eventlet.spawn_n')
+    def test_refill_once_at_a_time(self, mock_spawn):
+        pool = keypool.KeyPool(2)
+        pool.refill()
+        pool.refill()
+        self.assertEqual(1, mock_spawn.call_count)
+
+    @mock.patch.object(keypool, 'generate_keys_in_subprocess')
+    def test_refill_tops_up(self, mock_gen):
+        mock_gen.return_value = [('priv2', 'pub2'), ('priv3', 'pub3')]
+        pool = keypool.KeyPool(3, bits=1024)
+        pool._keys.append(('priv1', 'pub1'))
+        pool._refilling = True
+        pool._refill()
+        mock_gen.assert_called_once_with(1024, 2)
+        self.assertEqual(3, len(pool))
+        self.assertFalse(pool._refilling)
+
+    @mock.patch.object(keypool, 'generate_keys_in_subprocess')
+    def test_refill_failure(self, mock_gen):
+        mock_gen.side_effect = RuntimeError
+        pool = keypool.KeyPool(3)
+        pool._refilling = True
+        pool._refill()
+        self.assertEqual(0, len(pool))
+        self.assertFalse(pool._refilling)
+
+    @mock.patch.object(keypool, 'generate_key')
+    @mock.patch('eventlet.spawn_n')
+    @mock.patch('os.getpid')
+    def test_forked_pool_is_discarded(self, mock_pid, mock_spawn, mock_gen):
+        mock_pid.return_value = 1
+        mock_gen.return_value = ('fresh', 'pub')
+        pool = keypool.KeyPool(1)
+        pool._keys.append(('inherited', 'pub'))
+        mock_pid.return_value = 2
+        self.assertEqual(('fresh', 'pub'), pool.get())
+
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_generate_keys_in_subprocess(self, mock_popen):
+        key = RSA.generate(1024)
+        pem = key.exportKey('PEM')
+        proc = mock_popen.return_value
+        proc.communicate.return_value = (pem + b'\n' + pem + b'\n', None)
+        proc.returncode = 0
+        keys = keypool.generate_keys_in_subprocess(1024, 2)
+        expected = (pem, key.publickey().exportKey('OpenSSH'))
+        self.assertEqual([expected, expected], keys)
+
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_generate_keys_in_subprocess_failure(self, mock_popen):
+        proc = mock_popen.return_value
+        proc.communicate.return_value = ('', None)
+        proc.returncode = 1
+        self.assertRaises(RuntimeError,
+                          keypool.generate_keys_in_subprocess, 1024, 2)
+
+    @mock.patch('sys.stdout', new_callable=io.BytesIO)
+    @mock.patch('sys.argv', ['keypool', '1024', '2'])
+    def test_main(self, mock_stdout):
+        keypool.main()
+        self.assertEqual(2, len(keypool.PEM_RE.findall(
+            mock_stdout.getvalue())))
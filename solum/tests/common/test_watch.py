@@ -0,0 +1,69 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+import mock
+
+from solum.common import watch
+from solum.tests import base
+
+
+class TestWatch(base.BaseTestCase):
+
+    def test_wait_times_out(self):
+        self.assertFalse(watch.wait('key', 0.01))
+        self.assertNotIn('key', watch._waiters)
+
+    def test_notify_wakes_waiters(self):
+        waiters = [eventlet.spawn(watch.wait, 'key', 5) for i in range(3)]
+        other = eventlet.spawn(watch.wait, 'other', 0.05)
+        eventlet.sleep(0)
+        watch.notify('key')
+        self.assertEqual([True] * 3, [w.wait() for w in waiters])
+        self.assertFalse(other.wait())
+        self.assertEqual({}, dict(watch._waiters))
+
+    def test_notify_without_waiters(self):
+        watch.notify('key')
+        self.assertNotIn('key', watch._waiters)
+
+
+class TestPoller(base.BaseTestCase):
+
+    def test_wakes_on_change(self):
+        states = {'a': 'BUILDING', 'b': 'BUILDING'}
+        fetch = mock.MagicMock(side_effect=lambda keys: dict(states))
+        poller = watch.Poller(fetch, 0.01)
+        waiter = eventlet.spawn(poller.wait, 'a', 'BUILDING', 5)
+        other = eventlet.spawn(poller.wait, 'b', 'BUILDING', 0.1)
+        eventlet.sleep(0.03)
+        self.assertFalse(waiter.dead)
+        states['a'] = 'READY'
+        self.assertTrue(waiter.wait())
+        self.assertFalse(other.wait())
+        # a single query covers every waiter
+        self.assertEqual(['a', 'b'], sorted(fetch.call_args_list[0][0][0]))
+        eventlet.sleep(0.03)
+        self.assertIsNone(poller._thread)
+        self.assertEqual({}, dict(poller._watched))
+
+    def test_wakes_on_delete(self):
+        poller = watch.Poller(lambda keys: {}, 0.01)
+        self.assertTrue(poller.wait('a', 'READY', 5))
+
+    def test_fetch_failure(self):
+        fetch = mock.MagicMock(side_effect=[ValueError, {'a': 'READY'}])
+        poller = watch.Poller(fetch, 0.01)
+        self.assertTrue(poller.wait('a', 'BUILDING', 5))
+        self.assertEqual(2, fetch.call_count)
@@ -0,0 +1,198 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import errno
+import signal
+
+import mock
+from oslo.config import cfg
+
+from solum.common import wsgi
+from solum.tests import base
+
+
+class TestServer(base.BaseTestCase):
+
+    @mock.patch('eventlet.listen')
+    def test_start(self, mock_listen):
+        server = wsgi.Server('app', '127.0.0.1', 9777)
+        server.start()
+        mock_listen.assert_called_once_with(('127.0.0.1', 9777),
+                                            backlog=4096)
+
+    def _stop_after(self, server, rounds):
+        calls = []
+
+        def fake_server(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == rounds:
+                server.running = False
+        return fake_server
+
+    @mock.patch('signal.signal')
+    @mock.patch('eventlet.wsgi.server')
+    @mock.patch('eventlet.listen')
+    def test_single_process(self, mock_listen, mock_server, mock_signal):
+        server = wsgi.Server('app', '127.0.0.1', 9777, pool_size=10)
+        mock_server.side_effect = self._stop_after(server, 1)
+        server.serve()
+        self.assertEqual(1, mock_server.call_count)
+        args, kwargs = mock_server.call_args
+        self.assertEqual((mock_listen.return_value.dup.return_value, 'app'),
+                         args)
+        self.assertEqual(10, kwargs['custom_pool'].size)
+        handlers = dict(c[0] for c in mock_signal.call_args_list)
+        self.assertEqual(server._handle_single_stop,
+                         handlers[signal.SIGTERM])
+        self.assertEqual(server._handle_single_stop, handlers[signal.SIGINT])
+        self.assertEqual(server._handle_single_reload,
+                         handlers[signal.SIGHUP])
+
+    @mock.patch.object(cfg.CONF, 'reload_config_files')
+    @mock.patch('signal.signal')
+    @mock.patch('eventlet.wsgi.server')
+    @mock.patch('eventlet.listen')
+    def test_single_process_reload(self, mock_listen, mock_server,
+                                   mock_signal, mock_reload):
+        init = mock.MagicMock()
+        server = wsgi.Server('app', '127.0.0.1', 9777, initializer=init)
+        stop = self._stop_after(server, 2)
+
+        def fake_server(*args, **kwargs):
+            if mock_server.call_count == 1:
+                self.assertRaises(SystemExit, server._handle_single_reload,
+                                  signal.SIGHUP, None)
+                self.assertFalse(mock_reload.called)
+            stop(*args, **kwargs)
+
+        mock_server.side_effect = fake_server
+        server.serve()
+        # a reload serves again on the same listening socket, with the
+        # configuration read again
+        self.assertEqual(2, mock_server.call_count)
+        self.assertEqual(2, init.call_count)
+        mock_reload.assert_called_once_with()
+        self.assertFalse(mock_listen.return_value.close.called)
+
+    def test_single_process_stop(self):
+        server = wsgi.Server('app', '127.0.0.1', 9777)
+        server.running = True
+        self.assertRaises(SystemExit, server._handle_single_stop,
+                          signal.SIGTERM, None)
+        self.assertFalse(server.running)
+
+    @mock.patch('signal.signal')
+    @mock.patch('eventlet.wsgi.server')
+    @mock.patch('eventlet.listen')
+    def test_initializer(self, mock_listen, mock_server, mock_signal):
+        init = mock.MagicMock()
+        server = wsgi.Server('app', '127.0.0.1', 9777, initializer=init)
+
+        def fake_server(*args, **kwargs):
+            self.assertTrue(init.called)
+            server.running = False
+
+        mock_server.side_effect = fake_server
+        server.serve()
+        init.assert_called_once_with()
+
+    @mock.patch('signal.signal')
+    @mock.patch('os.wait')
+    @mock.patch('os.fork')
+    @mock.patch('eventlet.listen')
+    def test_workers_are_restarted(self, mock_listen, mock_fork, mock_wait,
+                                   mock_signal):
+        server = wsgi.Server('app', '127.0.0.1', 9777, workers=2)
+        mock_fork.side_effect = [101, 102, 103]
+
+        def child_exits():
+            if mock_wait.call_count == 1:
+                # first worker dies and gets replaced.
+                return 101, 1
+            server.running = False
+            server.children.clear()
+            return 0, 0
+
+        mock_wait.side_effect = child_exits
+        server.serve()
+        self.assertEqual(3, mock_fork.call_count)
+        handled = [c[0][0] for c in mock_signal.call_args_list]
+        self.assertEqual([signal.SIGTERM, signal.SIGINT, signal.SIGHUP],
+                         handled)
+
+    @mock.patch('os.kill')
+    def test_stop_signals_children(self, mock_kill):
+        server = wsgi.Server('app', '127.0.0.1', 9777, workers=2)
+        server.running = True
+        server.children = set([101])
+        server._handle_stop(signal.SIGTERM, None)
+        self.assertFalse(server.running)
+        mock_kill.assert_called_once_with(101, signal.SIGTERM)
+
+    @mock.patch('os.kill')
+    def test_reload_keeps_running(self, mock_kill):
+        server = wsgi.Server('app', '127.0.0.1', 9777, workers=2)
+        server.running = True
+        server.children = set([101])
+        server._handle_reload(signal.SIGHUP, None)
+        self.assertTrue(server.running)
+        # the supervise loop replaces the workers
+        self.assertFalse(mock_kill.called)
+
+    @mock.patch.object(cfg.CONF, 'reload_config_files')
+    @mock.patch('signal.signal')
+    @mock.patch('os.kill')
+    @mock.patch('os.wait')
+    @mock.patch('os.fork')
+    @mock.patch('eventlet.listen')
+    def test_reload_replaces_workers_one_at_a_time(self, mock_listen,
+                                                   mock_fork, mock_wait,
+                                                   mock_kill, mock_signal,
+                                                   mock_reload):
+        server = wsgi.Server('app', '127.0.0.1', 9777, workers=2)
+        events = []
+        pids = iter([101, 102, 103, 104])
+
+        def fork():
+            pid = next(pids)
+            events.append(('fork', pid))
+            return pid
+
+        def kill(pid, signo):
+            events.append(('kill', pid))
+
+        def wait():
+            if mock_wait.call_count == 1:
+                server._handle_reload(signal.SIGHUP, None)
+                raise OSError(errno.EINTR, 'interrupted')
+            if mock_wait.call_count <= 3:
+                # the worker just told to stop exits
+                return events[-1][1], 0
+            server.running = False
+            server.children.clear()
+            return 0, 0
+
+        mock_fork.side_effect = fork
+        mock_kill.side_effect = kill
+        mock_wait.side_effect = wait
+        server.serve()
+
+        mock_reload.assert_called_once_with()
+        self.assertEqual([('fork', 101), ('fork', 102), ('fork', 103)],
+                         events[:3])
+        self.assertEqual('kill', events[3][0])
+        self.assertEqual(('fork', 104), events[4])
+        self.assertEqual('kill', events[5][0])
+        self.assertEqual(set([101, 102]), set([events[3][1], events[5][1]]))
+        self.assertEqual(6, len(events))
@@ -13,15 +13,101 @@
 # under the License.
 
 import mock
+from oslo.config import cfg
 
+from solum.common import exception
 from solum.conductor.handlers import default
+from solum.objects import registry
 from solum.tests import base
+from solum.tests import utils
 
 
 class HandlerTest(base.BaseTestCase):
+    def setUp(self):
+        super(HandlerTest, self).setUp()
+        self.useFixture(utils.Database())
+
+    def _pending(self):
+        return [(e.trigger_id, e.commit_sha, e.claimed_by)
+                for e in registry.TriggerEventList.get_all(None)]
 
     def test_create(self):
         handler = default.Handler()
         handler.echo = mock.MagicMock()
         handler.echo({}, 'foo')
         handler.echo.assert_called_once_with({}, 'foo')
+
+    @mock.patch('solum.api.handlers.pipeline_handler.PipelineHandler')
+    @mock.patch('solum.api.handlers.assembly_handler.AssemblyHandler')
+    def test_trigger_workflow(self, mock_assem, mock_pipe):
+        cfg.CONF.set_override('trigger_debounce', 0, group='conductor')
+        handler = default.Handler()
+        handler.trigger_workflow({}, 'tid', 'sha', 'status', 'collab')
+        mock_assem.return_value.trigger_workflow.assert_called_once_with(
+            'tid', 'sha', 'status', 'collab')
+        self.assertFalse(mock_pipe.called)
+        self.assertEqual([], self._pending())
+
+    @mock.patch('solum.api.handlers.pipeline_handler.PipelineHandler')
+    @mock.patch('solum.api.handlers.assembly_handler.AssemblyHandler')
+    def test_trigger_workflow_pipeline(self, mock_assem, mock_pipe):
+        cfg.CONF.set_override('trigger_debounce', 0, group='conductor')
+        mock_assem.return_value.trigger_workflow.side_effect = (
+            exception.ResourceNotFound(name='trigger', id='tid'))
+        handler = default.Handler()
+        handler.trigger_workflow({}, 'tid')
+        mock_pipe.return_value.trigger_workflow.assert_called_once_with('tid')
+
+    @mock.patch('eventlet.spawn_after')
+    def test_trigger_workflow_debounced(self, mock_spawn):
+        cfg.CONF.set_override('trigger_debounce', 5, group='conductor')
+        handler = default.Handler()
+        handler.trigger_workflow({}, 'tid', 'sha', 'status', None, 'push')
+        handler.trigger_workflow({}, 'tid', 'sha', 'status', None, 'push')
+        self.assertEqual(1, mock_spawn.call_count)
+        self.assertEqual(5, mock_spawn.call_args[0][0])
+        handler.trigger_workflow({}, 'tid', 'sha2', 'status', None, 'push',
+                                 'refs/heads/other')
+        self.assertEqual(2, mock_spawn.call_count)
+        self.assertFalse(mock_spawn.return_value.cancel.called)
+        self.assertEqual([('tid', 'sha', None), ('tid', 'sha2', None)],
+                         self._pending())
+
+    @mock.patch('solum.api.handlers.pipeline_handler.PipelineHandler')
+    @mock.patch('solum.api.handlers.assembly_handler.AssemblyHandler')
+    @mock.patch('eventlet.spawn_after')
+    def test_resume_triggers(self, mock_spawn, mock_assem, mock_pipe):
+        cfg.CONF.set_override('trigger_debounce', 5, group='conductor')
+        default.Handler().trigger_workflow({}, 'tid', 'sha', 'status')
+
+        # the conductor restarts before the event's workflow ran
+        handler = default.Handler()
+        handler.resume_triggers()
+        self.assertEqual(2, mock_spawn.call_count)
+        func, args = mock_spawn.call_args[0][3:5]
+        func(*args)
+        mock_assem.return_value.trigger_workflow.assert_called_once_with(
+            'tid', 'sha', 'status', None)
+        self.assertEqual([], self._pending())
+
+    @mock.patch('solum.api.handlers.pipeline_handler.PipelineHandler')
+    @mock.patch('solum.api.handlers.assembly_handler.AssemblyHandler')
+    @mock.patch('eventlet.spawn_after')
+    def test_trigger_runs_on_one_conductor(self, mock_spawn, mock_assem,
+                                           mock_pipe):
+        cfg.CONF.set_override('trigger_debounce', 5, group='conductor')
+        default.Handler().trigger_workflow({}, 'tid', 'sha', 'status')
+        other = default.Handler()
+        other.resume_triggers()
+        runs = [c[0][3:5] for c in mock_spawn.call_args_list]
+        self.assertEqual(2, len(runs))
+
+        # both conductors wait on the event, the first to claim it runs it
+        mock_assem.return_value.trigger_workflow.side_effect = (
+            lambda *args: self.assertEqual([('tid', 'sha', 'localhost')],
+                                           self._pending()))
+        for func, args in runs:
+            func(*args)
+        self.assertEqual(1, mock_assem.return_value.trigger_workflow.
+                         call_count)
+        self.assertEqual([], self._pending())
@@ -0,0 +1,92 @@
+# Copyright 2014 - Rackspace Hosting
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import mock
+
+from solum.conductor import debounce
+from solum.tests import base
+
+
+@mock.patch('eventlet.spawn_after')
+class DebouncerTest(base.BaseTestCase):
+
+    def _run_pending(self, mock_spawn):
+        window, run, key, func, args, kwargs = mock_spawn.call_args[0]
+        run(key, func, args, kwargs)
+
+    def test_disabled(self, mock_spawn):
+        func = mock.MagicMock()
+        deb = debounce.Debouncer(0)
+        self.assertTrue(deb.submit(('t', 'dev', 'sha', 'push'), func, 1))
+        self.assertTrue(deb.submit(('t', 'dev', 'sha', 'push'), func, 1))
+        self.assertEqual(2, func.call_count)
+        self.assertFalse(mock_spawn.called)
+
+    def test_delayed(self, mock_spawn):
+        func = mock.MagicMock()
+        deb = debounce.Debouncer(5)
+        self.assertTrue(deb.submit(('t', 'dev', 'sha', 'push'), func, 1, a=2))
+        self.assertFalse(func.called)
+        self._run_pending(mock_spawn)
+        func.assert_called_once_with(1, a=2)
+        self.assertEqual({}, deb._pending)
+
+    @mock.patch('time.time')
+    def test_duplicate_dropped(self, mock_time, mock_spawn):
+        func = mock.MagicMock()
+        deb = debounce.Debouncer(5)
+        mock_time.return_value = 100
+        deb.submit(('t', 'dev', 'sha', 'push'), func)
+        self._run_pending(mock_spawn)
+
+        mock_time.return_value = 104
+        self.assertFalse(deb.submit(('t', 'dev', 'sha', 'push'), func))
+        self.assertTrue(deb.submit(('t', 'dev', 'sha', 'pull_request'), func))
+        self.assertTrue(deb.submit(('t2', 'dev', 'sha', 'push'), func))
+
+        mock_time.return_value = 106
+        self.assertTrue(deb.submit(('t', 'dev', 'sha', 'push'), func))
+
+    def test_superseded(self, mock_spawn):
+        func = mock.MagicMock()
+        deb = debounce.Debouncer(5)
+        deb.submit(('t', 'dev', 'sha1', 'push'), func, 'sha1')
+        first = mock_spawn.return_value
+        mock_spawn.return_value = mock.MagicMock()
+        deb.submit(('t', 'dev', 'sha2', 'push'), func, 'sha2')
+        first.cancel.assert_called_once_with()
+        self._run_pending(mock_spawn)
+        func.assert_called_once_with('sha2')
+
+    def test_failure_logged(self, mock_spawn):
+        func = mock.MagicMock(side_effect=ValueError)
+        deb = debounce.Debouncer(5)
+        deb.submit(('t', 'dev', 'sha', 'push'), func)
+        self._run_pending(mock_spawn)
+        func.assert_called_once_with()
+
+    def test_other_ref_not_superseded(self, mock_spawn):
+        func = mock.MagicMock()
+        deb = debounce.Debouncer(5)
+        deb.submit(('t', 'dev', 'sha1', 'push'), func, 'sha1')
+        first = mock_spawn.return_value
+        mock_spawn.return_value = mock.MagicMock()
+        deb.submit(('t', 'pull/7', 'sha2', 'pull_request'), func, 'sha2')
+        self.assertFalse(first.cancel.called)
+        for call in mock_spawn.call_args_list:
+            window, run, key, f, args, kwargs = call[0]
+            run(key, f, args, kwargs)
+        self.assertEqual([mock.call('sha1'), mock.call('sha2')],
+                         func.call_args_list)
+        self.assertEqual({}, deb._pending)
@@ -14,6 +14,7 @@
 
 import json
 
+from heatclient import exc
 import mock
 from oslo.config import cfg
 
@@ -38,6 +39,8 @@ class HandlerTest(base.BaseTestCase):
         handler.echo({}, 'foo')
         handler.echo.assert_called_once_with({}, 'foo')
 
+    @mock.patch('solum.common.catalog.get_parsed',
+                mock.MagicMock(return_value={'description': 'test'}))
     @mock.patch('solum.common.catalog.get')
     @mock.patch('solum.objects.registry')
     @mock.patch('solum.common.clients.OpenStackClients')
@@ -84,6 +87,8 @@ class HandlerTest(base.BaseTestCase):
                                                        'http://fake.ref',
                                                        'fake_id')
 
+    @mock.patch('solum.common.catalog.get_parsed',
+                mock.MagicMock(return_value={'description': 'test'}))
     @mock.patch('solum.common.catalog.get')
     @mock.patch('solum.objects.registry')
     @mock.patch('solum.common.clients.OpenStackClients')
@@ -109,6 +114,8 @@ class HandlerTest(base.BaseTestCase):
                           assign_and_create_mock.assert_called_once_with,
                           comp_name)
 
+    @mock.patch('solum.common.catalog.get_parsed',
+                mock.MagicMock(return_value={'description': 'test'}))
     @mock.patch('solum.common.catalog.get')
     @mock.patch('solum.objects.registry')
     @mock.patch('solum.common.clients.OpenStackClients')
@@ -149,11 +156,14 @@ class HandlerTest(base.BaseTestCase):
         handler = heat_handler.Handler()
         fake_assembly = fakes.FakeAssembly()
         stack = mock.MagicMock()
+        stack.id = 'fake_id'
         stack.status = 'COMPLETE'
+        mock_clients.heat().stacks.list.return_value = [stack]
         mock_clients.heat().stacks.get.return_value = stack
         handler._parse_server_url = mock.MagicMock(return_value=('xyz'))
         handler._update_assembly_status(self.ctx, fake_assembly, mock_clients,
                                         'fake_id')
+        handler.stack_watcher.poll()
         self.assertEqual(fake_assembly.status, 'READY')
         fake_assembly.save.assert_called_once_with(self.ctx)
 
@@ -162,10 +172,12 @@ class HandlerTest(base.BaseTestCase):
         handler = heat_handler.Handler()
         fake_assembly = fakes.FakeAssembly()
         stack = mock.MagicMock()
+        stack.id = 'fake_id'
         stack.status = 'FAILED'
-        mock_clients.heat().stacks.get.return_value = stack
+        mock_clients.heat().stacks.list.return_value = [stack]
         handler._update_assembly_status(self.ctx, fake_assembly, mock_clients,
                                         'fake_id')
+        handler.stack_watcher.poll()
         self.assertEqual(fake_assembly.status, 'ERROR')
         fake_assembly.save.assert_called_once_with(self.ctx)
 
@@ -201,16 +213,19 @@ class HandlerTest(base.BaseTestCase):
         handler = heat_handler.Handler()
 
         handler._find_id_if_stack_exists = mock.MagicMock(return_value='42')
-        handler._get_stack_id_from_heat = mock.MagicMock(return_value=None)
+        stacks = mock_client.return_value.heat.return_value.stacks
+        stacks.list.return_value = []
 
         cfg.CONF.deployer.max_attempts = 1
         cfg.CONF.deployer.wait_interval = 0
         cfg.CONF.deployer.growth_factor = 1.2
 
         handler.destroy(self.ctx, fake_assem.id)
+        handler.stack_watcher.poll()
 
-        mock_client.heat.stacks.delete.assert_called_once()
-        fake_assem.destroy.assert_called_once()
+        stacks.delete.assert_called_once_with('42')
+        fake_assem.destroy.assert_called_once_with(self.ctx)
+        self.assertEqual(0, len(handler.stack_watcher))
 
     @mock.patch('solum.objects.registry')
     @mock.patch('solum.common.clients.OpenStackClients')
@@ -220,14 +235,21 @@ class HandlerTest(base.BaseTestCase):
 
         handler = heat_handler.Handler()
         handler._find_id_if_stack_exists = mock.MagicMock(return_value='42')
+        stacks = mock_client.return_value.heat.return_value.stacks
+        stack = mock.MagicMock()
+        stack.id = '42'
+        stack.action = 'DELETE'
+        stack.status = 'IN_PROGRESS'
+        stacks.list.return_value = [stack]
 
         cfg.CONF.deployer.max_attempts = 1
         cfg.CONF.deployer.wait_interval = 0
         cfg.CONF.deployer.growth_factor = 1.2
 
         handler.destroy(self.ctx, fake_assem.id)
+        handler.stack_watcher.poll()
 
-        mock_client.heat.stacks.delete.assert_called_once()
+        stacks.delete.assert_called_once_with('42')
         fake_assem.save.assert_called_once_with(self.ctx)
         self.assertEqual(STATES.ERROR_STACK_DELETE_FAILED, fake_assem.status)
 
@@ -243,3 +265,105 @@ class HandlerTest(base.BaseTestCase):
 
         assert not mock_client.heat.stacks.delete.called
         fake_assem.destroy.assert_called_once()
+
+
+class StackWatcherTest(base.BaseTestCase):
+    def setUp(self):
+        super(StackWatcherTest, self).setUp()
+        cfg.CONF.set_override('wait_interval', 10, group='deployer')
+        cfg.CONF.set_override('growth_factor', 2.0, group='deployer')
+        cfg.CONF.set_override('max_attempts', 3, group='deployer')
+        self.osc = mock.MagicMock()
+        self.stack = mock.MagicMock()
+        self.stack.id = 'fake_id'
+        self.osc.heat().stacks.list.return_value = [self.stack]
+        self.watcher = heat_handler.StackWatcher()
+        self.watcher._running = True
+
+    @mock.patch('time.time')
+    def test_backoff_until_settled(self, mock_time):
+        mock_time.return_value = 100
+        on_status = mock.MagicMock(side_effect=[False, False, True])
+        on_timeout = mock.MagicMock()
+        self.watcher.watch(self.osc, 'fake_id', on_status, on_timeout)
+
+        self.watcher.poll()
+        self.assertEqual(1, on_status.call_count)
+        mock_time.return_value = 109
+        self.watcher.poll()
+        self.assertEqual(1, on_status.call_count)
+        mock_time.return_value = 110
+        self.watcher.poll()
+        self.assertEqual(2, on_status.call_count)
+        mock_time.return_value = 130
+        self.watcher.poll()
+        self.assertEqual(3, on_status.call_count)
+
+        self.assertEqual(0, len(self.watcher))
+        self.assertFalse(on_timeout.called)
+        on_status.assert_called_with(self.stack)
+
+    @mock.patch('time.time')
+    def test_timeout(self, mock_time):
+        mock_time.return_value = 100
+        on_status = mock.MagicMock(return_value=False)
+        on_timeout = mock.MagicMock()
+        self.watcher.watch(self.osc, 'fake_id', on_status, on_timeout)
+        for now in (100, 110, 130):
+            mock_time.return_value = now
+            self.watcher.poll()
+        self.assertEqual(3, on_status.call_count)
+        on_timeout.assert_called_once_with()
+        self.assertEqual(0, len(self.watcher))
+
+    @mock.patch('time.time')
+    def test_timeout_failure_keeps_polling(self, mock_time):
+        cfg.CONF.set_override('max_attempts', 1, group='deployer')
+        mock_time.return_value = 100
+        on_status = mock.MagicMock(return_value=False)
+        on_timeout = mock.MagicMock(side_effect=Exception('db gone'))
+        self.watcher.watch(self.osc, 'fake_id', on_status, on_timeout)
+        other_status = mock.MagicMock(return_value=True)
+        self.watcher.watch(self.osc, 'fake_id', other_status,
+                           mock.MagicMock())
+        self.watcher.poll()
+        on_timeout.assert_called_once_with()
+        other_status.assert_called_once_with(self.stack)
+        self.assertEqual(0, len(self.watcher))
+
+    @mock.patch('time.time')
+    def test_missing_stack(self, mock_time):
+        mock_time.return_value = 100
+        self.osc.heat().stacks.list.return_value = []
+        on_status = mock.MagicMock(return_value=True)
+        self.watcher.watch(self.osc, 'fake_id', on_status, mock.MagicMock())
+        self.watcher.poll()
+        on_status.assert_called_once_with(None)
+
+    @mock.patch('time.time')
+    def test_one_list_per_tenant(self, mock_time):
+        mock_time.return_value = 100
+        other = mock.MagicMock()
+        other.id = 'other_id'
+        stacks = self.osc.heat().stacks
+        stacks.list.return_value = [self.stack, other]
+        on_status = mock.MagicMock(return_value=True)
+        self.watcher.watch(self.osc, 'fake_id', on_status, mock.MagicMock())
+        self.watcher.watch(self.osc, 'other_id', on_status, mock.MagicMock())
+        self.watcher.poll()
+
+        stacks.list.assert_called_once_with(
+            filters={'id': ['fake_id', 'other_id']})
+        self.assertFalse(stacks.get.called)
+        self.assertEqual([mock.call(self.stack), mock.call(other)],
+                         on_status.call_args_list)
+
+    @mock.patch('time.time')
+    def test_list_failure_retries(self, mock_time):
+        mock_time.return_value = 100
+        self.osc.heat().stacks.list.side_effect = exc.HTTPInternalServerError
+        on_status = mock.MagicMock()
+        self.watcher.watch(self.osc, 'fake_id', on_status, mock.MagicMock())
+        self.watcher.poll()
+        self.assertFalse(on_status.called)
+        self.assertEqual(1, len(self.watcher))
@@ -42,6 +42,7 @@ class FakePecanRequest(mock.Mock):
         self.path = '/v1/services'
         self.headers = fakeAuthTokenHeaders
         self.environ = {}
+        self.pecan = {'content_type': None}
 
     def __setitem__(self, index, value):
         setattr(self, index, value)
@@ -52,6 +53,7 @@ class FakePecanResponse(mock.Mock):
     def __init__(self, **kwargs):
         super(FakePecanResponse, self).__init__(**kwargs)
         self.status = None
+        self.headers = {}
 
 
 class FakeApp:
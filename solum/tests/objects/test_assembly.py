@@ -14,6 +14,8 @@
 
 import uuid
 
+import mock
+
 from solum.common import exception
 from solum.objects import registry
 from solum.objects.sqlalchemy import assembly
@@ -45,7 +47,42 @@ class TestAssembly(base.BaseTestCase):
 
     def test_get_all(self):
         lst = assembly.AssemblyList()
-        self.assertEqual(1, len(lst.get_all(self.ctx)))
+        ctx = utils.dummy_context(tenant_id=self.data[0]['project_id'])
+        self.assertEqual(1, len(lst.get_all(ctx)))
+
+    def test_statuses_by_uuid(self):
+        assem_uuid = self.data[0]['uuid']
+        self.assertEqual({assem_uuid: 'BUILDING'},
+                         assembly.Assembly.statuses_by_uuid([assem_uuid,
+                                                             'gone']))
+
+    def test_get_all_resolves_plan_uuid_in_one_query(self):
+        plan = registry.Plan()
+        plan.uuid = str(uuid.uuid4())
+        plan.project_id = self.ctx.tenant
+        plan.create(self.ctx)
+        for i in range(3):
+            assem = registry.Assembly()
+            assem.uuid = str(uuid.uuid4())
+            assem.project_id = self.ctx.tenant
+            assem.plan_id = plan.id
+            assem.create(self.ctx)
+
+        with mock.patch.object(registry.Plan, 'get_by_id') as mock_get:
+            assemblies = assembly.AssemblyList.get_all(self.ctx)
+            self.assertEqual([plan.uuid] * 3,
+                             [a.as_dict()['plan_uuid'] for a in assemblies])
+            self.assertFalse(mock_get.called)
+
+        # a changed plan_id is looked up again rather than served stale
+        other = registry.Plan()
+        other.uuid = str(uuid.uuid4())
+        other.project_id = self.ctx.tenant
+        other.create(self.ctx)
+        assemblies[0].plan_id = other.id
+        self.assertEqual(other.uuid, assemblies[0].plan_uuid)
+        assemblies[1].plan_uuid = other.uuid
+        self.assertEqual(other.id, assemblies[1].plan_id)
 
     def test_check_data(self):
         ta = assembly.Assembly().get_by_id(self.ctx, self.data[0]['id'])
@@ -58,6 +95,15 @@ class TestAssembly(base.BaseTestCase):
         for key, value in self.data[0].items():
             self.assertEqual(value, getattr(ta, key))
 
+    @mock.patch('solum.common.watch.notify')
+    def test_save_notifies_watchers(self, mock_notify):
+        ta = registry.Assembly().get_by_id(self.ctx, self.data[0]['id'])
+        ta.status = 'READY'
+        ta.save(self.ctx)
+        mock_notify.assert_called_once_with(self.data[0]['uuid'])
+        ta.destroy(self.ctx)
+        self.assertEqual(2, mock_notify.call_count)
+
     def test_del_assem_with_comps(self):
         ta = registry.Assembly().get_by_id(self.ctx, self.data[0]['id'])
         comp = registry.Component()
@@ -67,7 +67,8 @@ class TestComponent(base.BaseTestCase):
 
     def test_get_all(self):
         lst = component.ComponentList()
-        self.assertEqual(2, len(lst.get_all(self.ctx)))
+        ctx = utils.dummy_context(tenant_id=self.data[0]['project_id'])
+        self.assertEqual(1, len(lst.get_all(ctx)))
 
     def test_check_data(self):
         ta = component.Component().get_by_id(self.ctx, self.data[0]['id'])
@@ -37,7 +37,8 @@ class TestImage(base.BaseTestCase):
 
     def test_get_all(self):
         lst = image.ImageList()
-        self.assertEqual(1, len(lst.get_all(self.ctx)))
+        ctx = utils.dummy_context(tenant_id=self.data[0]['project_id'])
+        self.assertEqual(1, len(lst.get_all(ctx)))
 
     def test_check_data(self):
         test_srvc = image.Image().get_by_id(self.ctx, self.data[0]['id'])
@@ -49,8 +50,10 @@ class TestStates(base.BaseTestCase):
     def test_as_dict(self):
         self.assertEqual(objects.image.States.as_dict(),
                          {'BUILDING': 'BUILDING', 'COMPLETE': 'COMPLETE',
-                          'ERROR': 'ERROR', 'PENDING': 'PENDING'})
+                          'ERROR': 'ERROR', 'PENDING': 'PENDING',
+                          'CANCELLED': 'CANCELLED'})
 
     def test_values(self):
         self.assertEqual(sorted(objects.image.States.values()),
-                         sorted(['BUILDING', 'COMPLETE', 'PENDING', 'ERROR']))
+                         sorted(['BUILDING', 'COMPLETE', 'PENDING', 'ERROR',
+                                 'CANCELLED']))
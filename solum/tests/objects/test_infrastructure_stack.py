@@ -39,7 +39,8 @@ class TestInfrastructureStack(base.BaseTestCase):
 
     def test_get_all(self):
         lst = infrastructure_stack.InfrastructureStackList()
-        self.assertEqual(1, len(lst.get_all(self.ctx)))
+        ctx = utils.dummy_context(tenant_id=self.data[0]['project_id'])
+        self.assertEqual(1, len(lst.get_all(ctx)))
 
     def test_check_data(self):
         pl = infrastructure_stack.InfrastructureStack().get_by_id(
@@ -115,3 +115,48 @@ class TestObjectsSqlalchemy(tests.BaseTestCase):
         component.save(self.ctx)
 
         self.assertThat(next_time, matchers.GreaterThan(component.created_at))
+
+    def _create_components(self, count, project_id):
+        created = []
+        for i in range(count):
+            component = objects.registry.Component()
+            component.uuid = str(uuid.uuid4())
+            component.name = 'component%d' % i
+            component.project_id = project_id
+            component.create(self.ctx)
+            created.append(component)
+        return created
+
+    def test_get_all_tenant_scoped(self):
+        mine = self._create_components(2, self.ctx.tenant)
+        self._create_components(1, 'other_tenant')
+
+        components = objects.registry.ComponentList.get_all(self.ctx)
+        self.assertEqual([c.uuid for c in mine],
+                         [c.uuid for c in components])
+        self.assertEqual(3, len(objects.registry.ComponentList.get_all(None)))
+
+    def test_get_all_paginated(self):
+        created = self._create_components(3, self.ctx.tenant)
+        ComponentList = objects.registry.ComponentList
+
+        first = ComponentList.get_all(self.ctx, limit=2)
+        self.assertEqual([c.uuid for c in created[:2]],
+                         [c.uuid for c in first])
+        rest = ComponentList.get_all(self.ctx, limit=2,
+                                     marker=first[-1].uuid)
+        self.assertEqual([created[2].uuid], [c.uuid for c in rest])
+
+        by_name = ComponentList.get_all(self.ctx, sort_key='name',
+                                        sort_dir='desc')
+        self.assertEqual([c.uuid for c in reversed(created)],
+                         [c.uuid for c in by_name])
+
+    def test_get_all_invalid_pagination(self):
+        ComponentList = objects.registry.ComponentList
+        self.assertRaises(exception.BadRequest, ComponentList.get_all,
+                          self.ctx, sort_key='no_such_column')
+        self.assertRaises(exception.BadRequest, ComponentList.get_all,
+                          self.ctx, sort_dir='sideways')
+        self.assertRaises(exception.BadRequest, ComponentList.get_all,
+                          self.ctx, marker='no-such-uuid')
@@ -37,7 +37,8 @@ class TestOperation(base.BaseTestCase):
 
     def test_get_all(self):
         lst = operation.OperationList()
-        self.assertEqual(1, len(lst.get_all(self.ctx)))
+        ctx = utils.dummy_context(tenant_id=self.data[0]['project_id'])
+        self.assertEqual(1, len(lst.get_all(ctx)))
 
     def test_check_data(self):
         pl = operation.Operation().get_by_id(self.ctx, self.data[0]['id'])
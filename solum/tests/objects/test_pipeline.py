@@ -41,7 +41,8 @@ class TestPipeline(base.BaseTestCase):
 
     def test_get_all(self):
         lst = pipeline.PipelineList()
-        self.assertEqual(1, len(lst.get_all(self.ctx)))
+        ctx = utils.dummy_context(tenant_id=self.data[0]['project_id'])
+        self.assertEqual(1, len(lst.get_all(ctx)))
 
     def test_check_data(self):
         ta = pipeline.Pipeline().get_by_id(self.ctx, self.data[0]['id'])
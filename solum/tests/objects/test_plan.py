@@ -12,6 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+
+import mock
+from oslo.config import cfg
+
+from solum.common import exception
+from solum.common import yamlutils
 from solum.objects import registry
 from solum.objects.sqlalchemy import plan
 from solum.tests import base
@@ -39,7 +46,8 @@ class TestPlan(base.BaseTestCase):
 
     def test_get_all(self):
         lst = plan.PlanList()
-        self.assertEqual(1, len(lst.get_all(self.ctx)))
+        ctx = utils.dummy_context(tenant_id=self.data[0]['project_id'])
+        self.assertEqual(1, len(lst.get_all(ctx)))
 
     def test_check_data_by_id(self):
         pl = plan.Plan().get_by_id(self.ctx, self.data[0]['id'])
@@ -50,3 +58,127 @@ class TestPlan(base.BaseTestCase):
         pl = plan.Plan().get_by_uuid(self.ctx, self.data[0]['uuid'])
         for key, value in self.data[0].items():
             self.assertEqual(value, getattr(pl, key))
+
+    def _stored(self, uuid):
+        return plan.Plan.get_session().query(
+            plan.Plan.raw_content_yaml, plan.Plan.raw_content_json).filter_by(
+            uuid=uuid).one()
+
+    def _create(self, uuid, content):
+        pl = plan.Plan(uuid=uuid, project_id='bla', raw_content=content)
+        pl.create(self.ctx)
+        return pl
+
+    def test_schema_modes(self):
+        content = {'name': 'plan', 'artifacts': []}
+        cfg.CONF.set_override('schema_mode', 'old', group='database')
+        self._create('old', content)
+        yml, jsn = self._stored('old')
+        self.assertIsNotNone(yml)
+        self.assertIsNone(jsn)
+
+        cfg.CONF.set_override('schema_mode', 'transition', group='database')
+        self._create('trans', content)
+        yml, jsn = self._stored('trans')
+        self.assertIsNotNone(yml)
+        self.assertEqual(content, json.loads(jsn))
+
+        # new keeps writing YAML for services not yet upgraded
+        cfg.CONF.set_override('schema_mode', 'new', group='database')
+        self._create('dual', content)
+        yml, jsn = self._stored('dual')
+        self.assertIsNotNone(yml)
+        self.assertEqual(content, json.loads(jsn))
+
+        cfg.CONF.set_override('plan_json_only', True, group='database')
+        self._create('new', content)
+        yml, jsn = self._stored('new')
+        self.assertIsNone(yml)
+        self.assertEqual(content, json.loads(jsn))
+        cfg.CONF.clear_override('plan_json_only', group='database')
+
+        # plans stored in any mode can be read in any mode
+        for mode in ('old', 'transition', 'new'):
+            cfg.CONF.set_override('schema_mode', mode, group='database')
+            for uuid in ('old', 'trans', 'dual', 'new'):
+                pl = plan.Plan.get_by_uuid(self.ctx, uuid)
+                self.assertEqual(content, pl.raw_content)
+
+    def test_yaml_update_from_old_service(self):
+        cfg.CONF.set_override('schema_mode', 'new', group='database')
+        self._create('mixed', {'name': 'before'})
+        # a service from before the move only updates the YAML column
+        plan.Plan.get_session().query(plan.Plan).filter_by(
+            uuid='mixed').update({'raw_content': 'name: after\n'})
+        pl = plan.Plan.get_by_uuid(self.ctx, 'mixed')
+        self.assertEqual({'name': 'after'}, pl.raw_content)
+
+    def test_save_stores_new_content(self):
+        pl = plan.Plan.get_by_uuid(self.ctx, self.data[0]['uuid'])
+        pl.raw_content = {'name': 'changed'}
+        pl.save(self.ctx)
+        pl = plan.Plan.get_by_uuid(self.ctx, self.data[0]['uuid'])
+        self.assertEqual({'name': 'changed'}, pl.raw_content)
+
+    def test_parsed_content_cached(self):
+        self.addCleanup(plan._parsed.clear)
+        uuid = self.data[0]['uuid']
+        first = plan.Plan.get_by_uuid(self.ctx, uuid).raw_content
+        self.assertIs(first, plan.Plan.get_by_uuid(self.ctx, uuid).raw_content)
+
+        cfg.CONF.set_override('plan_cache_size', 0, group='database')
+        self.assertIsNot(first,
+                         plan.Plan.get_by_uuid(self.ctx, uuid).raw_content)
+
+    def test_parsed_content_checks_text(self):
+        self.addCleanup(plan._parsed.clear)
+        loads = mock.MagicMock(side_effect=json.loads)
+        self.assertEqual({'a': 1}, plan._parse('u', 1, '{"a": 1}', loads))
+        self.assertEqual({'a': 1}, plan._parse('u', 1, '{"a": 1}', loads))
+        self.assertEqual(1, loads.call_count)
+        self.assertEqual({'a': 2}, plan._parse('u', 1, '{"a": 2}', loads))
+        self.assertEqual(2, loads.call_count)
+
+    def test_refined_content_leaves_raw_content(self):
+        pl = plan.Plan.get_by_uuid(self.ctx, self.data[0]['uuid'])
+        self.assertEqual('test-uuid-123', pl.refined_content()['uuid'])
+        self.assertNotIn('uuid', pl.raw_content)
+
+    def test_migrate_raw_content(self):
+        cfg.CONF.set_override('schema_mode', 'old', group='database')
+        for i in range(3):
+            self._create('plan-%d' % i, {'name': 'p%d' % i})
+        self.assertEqual(3, plan.Plan.migrate_raw_content(batch_size=2))
+        for i in range(3):
+            yml, jsn = self._stored('plan-%d' % i)
+            self.assertEqual({'name': 'p%d' % i}, json.loads(jsn))
+        self.assertEqual(0, plan.Plan.migrate_raw_content())
+
+    def test_dates_stored_as_text(self):
+        cfg.CONF.set_override('schema_mode', 'new', group='database')
+        content = yamlutils.load('name: p\nrelease: 2014-01-01\n')
+        self._create('dated', content)
+        yml, jsn = self._stored('dated')
+        self.assertEqual({'name': 'p', 'release': '2014-01-01'},
+                         json.loads(jsn))
+
+    def test_unstorable_content_rejected(self):
+        cfg.CONF.set_override('schema_mode', 'new', group='database')
+        content = yamlutils.load('name: p\ntags: !!set {a, b}\n')
+        self.assertRaises(exception.BadRequest, self._create, 'set',
+                          content)
+
+    def test_migrate_dates(self):
+        cfg.CONF.set_override('schema_mode', 'old', group='database')
+        self._create('dated', {'name': 'p'})
+        self._create('set', {'name': 'q'})
+        query = plan.Plan.get_session().query(plan.Plan)
+        query.filter_by(uuid='dated').update(
+            {'raw_content': 'release: 2014-01-01 12:00:00\n'})
+        query.filter_by(uuid='set').update(
+            {'raw_content': 'tags: !!set {a, b}\n'})
+        self.assertEqual(1, plan.Plan.migrate_raw_content())
+        yml, jsn = self._stored('dated')
+        self.assertEqual({'release': '2014-01-01T12:00:00'}, json.loads(jsn))
+        # left to be read from the YAML
+        self.assertIsNone(self._stored('set')[1])
@@ -40,7 +40,8 @@ class TestSensor(base.BaseTestCase):
 
     def test_get_all(self):
         lst = sensor.SensorList()
-        self.assertEqual(1, len(lst.get_all(self.ctx)))
+        ctx = utils.dummy_context(tenant_id=self.data[0]['project_id'])
+        self.assertEqual(1, len(lst.get_all(ctx)))
 
     def test_check_data_by_id(self):
         s = sensor.Sensor().get_by_id(self.ctx, self.data[0]['id'])
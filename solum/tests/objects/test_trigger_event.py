@@ -0,0 +1,78 @@
+# Copyright 2014 - Rackspace
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+
+from solum.objects import registry
+from solum.objects.sqlalchemy import trigger_event
+from solum.openstack.common import timeutils
+from solum.tests import base
+from solum.tests import utils
+
+
+class TestTriggerEvent(base.BaseTestCase):
+    def setUp(self):
+        super(TestTriggerEvent, self).setUp()
+        self.db = self.useFixture(utils.Database())
+        self.ctx = utils.dummy_context()
+
+    def _enqueue(self, commit_sha, ref='refs/heads/master', event='push'):
+        return trigger_event.TriggerEvent.enqueue(
+            self.ctx, 'tid', ref, commit_sha, event, 'status_url')
+
+    def _pending(self):
+        return [(e.ref, e.commit_sha) for e in
+                trigger_event.TriggerEventList.get_all(self.ctx)]
+
+    def test_objects_registered(self):
+        self.assertTrue(registry.TriggerEvent)
+        self.assertTrue(registry.TriggerEventList)
+
+    def test_enqueue_drops_duplicates(self):
+        first = self._enqueue('sha')
+        self.assertEqual('status_url', first.status_url)
+        self.assertIsNone(self._enqueue('sha'))
+        self.assertEqual([('refs/heads/master', 'sha')], self._pending())
+
+    def test_enqueue_replaces_waiting_event(self):
+        self._enqueue('sha')
+        self._enqueue('other', ref='refs/heads/other')
+        self._enqueue('sha2')
+        self.assertEqual([('refs/heads/other', 'other'),
+                          ('refs/heads/master', 'sha2')], self._pending())
+
+    def test_enqueue_keeps_running_event(self):
+        running = self._enqueue('sha')
+        self.assertTrue(running.claim(self.ctx, 'host', 600))
+        self._enqueue('sha2')
+        self.assertEqual([('refs/heads/master', 'sha'),
+                          ('refs/heads/master', 'sha2')], self._pending())
+
+    def test_claim_once(self):
+        pending = self._enqueue('sha')
+        self.assertTrue(pending.claim(self.ctx, 'host', 600))
+        self.assertFalse(pending.claim(self.ctx, 'other', 600))
+
+    def test_claim_replaced_event(self):
+        pending = self._enqueue('sha')
+        self._enqueue('sha2')
+        self.assertFalse(pending.claim(self.ctx, 'host', 600))
+
+    def test_claim_stale(self):
+        pending = self._enqueue('sha')
+        self.assertTrue(pending.claim(self.ctx, 'host', 600))
+        timeutils.set_time_override(timeutils.utcnow() +
+                                    datetime.timedelta(seconds=601))
+        self.addCleanup(timeutils.clear_time_override)
+        self.assertTrue(pending.claim(self.ctx, 'other', 600))
@@ -62,3 +62,17 @@ class TestCli(base.BaseTestCase):
             test_method = getattr(manager, self.func_name)
             test_method.assert_called_once_with(*self.exp_args,
                                                 **self.exp_kwargs)
+
+
+class TestMigratePlans(base.BaseTestCase):
+
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.objects.load')
+    @mock.patch.object(cli, 'get_manager')
+    def test_migrate_plans(self, mock_get_manager, mock_load, mock_registry):
+        self.addCleanup(cli.CONF.reset)
+        mock_registry.Plan.migrate_raw_content.return_value = 2
+        with mock.patch.object(sys, 'argv', ['prog', 'migrate-plans']):
+            cli.main()
+        mock_load.assert_called_once_with()
+        mock_registry.Plan.migrate_raw_content.assert_called_once_with()
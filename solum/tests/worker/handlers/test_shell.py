@@ -13,12 +13,18 @@
 # under the License.
 
 import base64
+import io
 import json
 import os.path
+import resource
+import signal
+import time
 import uuid
 
+import fixtures
 import mock
 from oslo.config import cfg
+import six
 
 from solum.openstack.common.gettextutils import _
 from solum.tests import base
@@ -78,25 +84,52 @@ class HandlerTest(base.BaseTestCase):
     def setUp(self):
         super(HandlerTest, self).setUp()
         self.ctx = utils.dummy_context()
+        # most tests check the scripts are run, not the git checkout
+        patcher = mock.patch.object(shell_handler.Handler,
+                                    '_prepare_workspace', return_value=None)
+        self.prepare_workspace = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.prepare_workspace_patcher = patcher
 
     @mock.patch('solum.worker.handlers.shell.LOG')
     def test_echo(self, fake_LOG):
         shell_handler.Handler().echo({}, 'foo')
         fake_LOG.debug.assert_called_once_with(_('%s') % 'foo')
 
+    @mock.patch('solum.worker.workspace.Workspace.prepare')
+    @mock.patch('solum.worker.git_mirror.GitMirrorCache.get')
+    @mock.patch('solum.worker.handlers.shell.Handler._get_private_key')
+    def test_prepare_workspace(self, mock_key, mock_mirror, mock_prepare):
+        self.prepare_workspace_patcher.stop()
+        self.addCleanup(self.prepare_workspace_patcher.start)
+        mirrors = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('git_mirror_dir', mirrors, group='worker')
+        mock_key.return_value = 'key'
+        mock_mirror.return_value = os.path.join(mirrors, 'x.git')
+        os.mkdir(mock_mirror.return_value)
+        mock_prepare.return_value = True
+        git_info = mock_git_info()
+        git_info['commit_sha'] = 'abc123'
+        ws = shell_handler.Handler()._prepare_workspace(5, git_info, 'ref')
+        self.assertIsNotNone(ws)
+        mock_key.assert_called_once_with('ref', 'git://example.com/foo')
+        mock_mirror.assert_called_once_with('git://example.com/foo', 'key')
+        mock_prepare.assert_called_once_with(
+            'git://example.com/foo', 'abc123', 'key', mock_mirror.return_value)
+
     @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
     @mock.patch('solum.objects.registry')
     @mock.patch('solum.conductor.api.API.build_job_update')
     @mock.patch('solum.deployer.api.API.deploy')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     def test_build(self, mock_popen, mock_deploy, mock_b_update, mock_registry,
                    mock_get_env):
         handler = shell_handler.Handler()
         fake_assembly = fakes.FakeAssembly()
         fake_glance_id = str(uuid.uuid4())
         mock_registry.Assembly.get_by_id.return_value = fake_assembly
-        mock_popen.return_value.communicate.return_value = [
-            'foo\ncreated_image_id=%s' % fake_glance_id, None]
+        mock_popen.return_value.stdout = six.StringIO(
+            'foo\ncreated_image_id=%s' % fake_glance_id)
         test_env = mock_environment()
         mock_get_env.return_value = test_env
         git_info = mock_git_info()
@@ -112,7 +145,9 @@ class HandlerTest(base.BaseTestCase):
         mock_popen.assert_called_once_with([script, 'git://example.com/foo',
                                             'new_app', self.ctx.tenant,
                                             '1-2-3-4', ''], env=test_env,
-                                           stdout=-1)
+                                           stdout=-1, universal_newlines=True,
+                                           preexec_fn=(
+                                               shell_handler.limit_child))
         expected = [mock.call(5, 'BUILDING', 'Starting the image build',
                               None, 44),
                     mock.call(5, 'COMPLETE', 'built successfully',
@@ -127,7 +162,7 @@ class HandlerTest(base.BaseTestCase):
     @mock.patch('solum.objects.registry')
     @mock.patch('solum.conductor.api.API.build_job_update')
     @mock.patch('solum.deployer.api.API.deploy')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     @mock.patch('solum.common.clients.OpenStackClients.barbican')
     @mock.patch('ast.literal_eval')
     def test_build_with_private_github_repo(
@@ -138,8 +173,8 @@ class HandlerTest(base.BaseTestCase):
         fake_glance_id = str(uuid.uuid4())
         mock_registry.Assembly.get_by_id.return_value = fake_assembly
         handler._update_assembly_status = mock.MagicMock()
-        mock_popen.return_value.communicate.return_value = [
-            'foo\ncreated_image_id=%s' % fake_glance_id, None]
+        mock_popen.return_value.stdout = six.StringIO(
+            'foo\ncreated_image_id=%s' % fake_glance_id)
         test_env = mock_environment()
         mock_get_env.return_value = test_env
         cfg.CONF.set_override('barbican_disabled', False,
@@ -159,7 +194,10 @@ class HandlerTest(base.BaseTestCase):
         mock_popen.assert_called_once_with([script, 'git://example.com/foo',
                                             'new_app', self.ctx.tenant,
                                             '1-2-3-4', 'some-private-key'],
-                                           env=test_env, stdout=-1)
+                                           env=test_env, stdout=-1,
+                                           universal_newlines=True,
+                                           preexec_fn=(
+                                               shell_handler.limit_child))
         expected = [mock.call(5, 'BUILDING', 'Starting the image build',
                               None, 44),
                     mock.call(5, 'COMPLETE', 'built successfully',
@@ -174,7 +212,7 @@ class HandlerTest(base.BaseTestCase):
     @mock.patch('solum.objects.registry')
     @mock.patch('solum.conductor.api.API.build_job_update')
     @mock.patch('solum.deployer.api.API.deploy')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     @mock.patch('shelve.open')
     @mock.patch('ast.literal_eval')
     def test_build_with_private_github_repo_with_barbican_disabled(
@@ -185,8 +223,8 @@ class HandlerTest(base.BaseTestCase):
         fake_glance_id = str(uuid.uuid4())
         mock_registry.Assembly.get_by_id.return_value = fake_assembly
         handler._update_assembly_status = mock.MagicMock()
-        mock_popen.return_value.communicate.return_value = [
-            'foo\ncreated_image_id=%s' % fake_glance_id, None]
+        mock_popen.return_value.stdout = six.StringIO(
+            'foo\ncreated_image_id=%s' % fake_glance_id)
         test_env = mock_environment()
         mock_get_env.return_value = test_env
         cfg.CONF.set_override('barbican_disabled', True,
@@ -212,7 +250,10 @@ class HandlerTest(base.BaseTestCase):
         mock_popen.assert_called_once_with([script, 'git://example.com/foo',
                                             'new_app', self.ctx.tenant,
                                             '1-2-3-4', 'some-private-key'],
-                                           env=test_env, stdout=-1)
+                                           env=test_env, stdout=-1,
+                                           universal_newlines=True,
+                                           preexec_fn=(
+                                               shell_handler.limit_child))
         expected = [mock.call(5, 'BUILDING', 'Starting the image build',
                               None, 44),
                     mock.call(5, 'COMPLETE', 'built successfully',
@@ -226,14 +267,14 @@ class HandlerTest(base.BaseTestCase):
     @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
     @mock.patch('solum.objects.registry')
     @mock.patch('solum.conductor.api.API.build_job_update')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     def test_build_fail(self, mock_popen, mock_b_update, mock_registry,
                         mock_get_env):
         handler = shell_handler.Handler()
         fake_assembly = fakes.FakeAssembly()
         mock_registry.Assembly.get_by_id.return_value = fake_assembly
-        mock_popen.return_value.communicate.return_value = [
-            'foo\ncreated_image_id= \n', None]
+        mock_popen.return_value.stdout = six.StringIO(
+            'foo\ncreated_image_id= \n')
         test_env = mock_environment()
         mock_get_env.return_value = test_env
         git_info = mock_git_info()
@@ -247,7 +288,10 @@ class HandlerTest(base.BaseTestCase):
         mock_popen.assert_called_once_with([script, 'git://example.com/foo',
                                             'new_app', self.ctx.tenant,
                                             '1-2-3-4', ''],
-                                           env=test_env, stdout=-1)
+                                           env=test_env, stdout=-1,
+                                           universal_newlines=True,
+                                           preexec_fn=(
+                                               shell_handler.limit_child))
 
         expected = [mock.call(5, 'BUILDING', 'Starting the image build',
                               None, 44),
@@ -257,7 +301,7 @@ class HandlerTest(base.BaseTestCase):
 
     @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
     @mock.patch('solum.objects.registry')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     @mock.patch('solum.worker.handlers.shell.update_assembly_status')
     def test_unittest(self, mock_a_update, mock_popen, mock_registry,
                       mock_get_env):
@@ -267,6 +311,7 @@ class HandlerTest(base.BaseTestCase):
         test_env = mock_environment()
         mock_get_env.return_value = test_env
         mock_popen.return_value.wait.return_value = 0
+        mock_popen.return_value.stdout = six.StringIO()
         git_info = mock_git_info()
         handler.unittest(self.ctx, build_id=5, name='new_app',
                          base_image_id='1-2-3-4', source_format='chef',
@@ -280,14 +325,17 @@ class HandlerTest(base.BaseTestCase):
                               'contrib/lp-chef/docker/unittest-app')
         mock_popen.assert_called_once_with([script, 'git://example.com/foo',
                                             '', self.ctx.tenant, '',
-                                            'tox'], env=test_env, stdout=-1)
+                                            'tox'], env=test_env, stdout=-1,
+                                           universal_newlines=True,
+                                           preexec_fn=(
+                                               shell_handler.limit_child))
         expected = [mock.call(self.ctx, 8, 'UNIT_TESTING')]
 
         self.assertEqual(expected, mock_a_update.call_args_list)
 
     @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
     @mock.patch('solum.objects.registry')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     @mock.patch('solum.worker.handlers.shell.update_assembly_status')
     def test_unittest_failure(self, mock_a_update, mock_popen,
                               mock_registry, mock_get_env):
@@ -297,6 +345,7 @@ class HandlerTest(base.BaseTestCase):
         test_env = mock_environment()
         mock_get_env.return_value = test_env
         mock_popen.return_value.wait.return_value = 1
+        mock_popen.return_value.stdout = six.StringIO()
         git_info = mock_git_info()
         handler.unittest(self.ctx, build_id=5, name='new_app',
                          assembly_id=fake_assembly.id,
@@ -311,7 +360,10 @@ class HandlerTest(base.BaseTestCase):
                               'contrib/lp-chef/docker/unittest-app')
         mock_popen.assert_called_once_with([script, 'git://example.com/foo',
                                             '', self.ctx.tenant, '',
-                                            'tox'], env=test_env, stdout=-1)
+                                            'tox'], env=test_env, stdout=-1,
+                                           universal_newlines=True,
+                                           preexec_fn=(
+                                               shell_handler.limit_child))
         expected = [mock.call(self.ctx, 8, 'UNIT_TESTING'),
                     mock.call(self.ctx, 8, 'UNIT_TESTING_FAILED')]
 
@@ -319,7 +371,7 @@ class HandlerTest(base.BaseTestCase):
 
     @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
     @mock.patch('solum.objects.registry')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     @mock.patch('solum.conductor.api.API.build_job_update')
     @mock.patch('solum.worker.handlers.shell.update_assembly_status')
     @mock.patch('solum.deployer.api.API.deploy')
@@ -331,9 +383,14 @@ class HandlerTest(base.BaseTestCase):
         fake_assembly = fakes.FakeAssembly()
         fake_glance_id = str(uuid.uuid4())
         mock_registry.Assembly.get_by_id.return_value = fake_assembly
-        mock_popen.return_value.wait.return_value = 0
-        mock_popen.return_value.communicate.return_value = [
-            'foo\ncreated_image_id=%s' % fake_glance_id, None]
+        mock_test = mock.MagicMock()
+        mock_test.wait.return_value = 0
+        mock_test.stdout = six.StringIO('tests passed\n')
+        mock_build = mock.MagicMock()
+        mock_build.wait.return_value = 0
+        mock_build.stdout = six.StringIO(
+            'foo\ncreated_image_id=%s' % fake_glance_id)
+        mock_popen.side_effect = [mock_test, mock_build]
         test_env = mock_environment()
         mock_get_env.return_value = test_env
         git_info = mock_git_info()
@@ -351,10 +408,12 @@ class HandlerTest(base.BaseTestCase):
         expected = [
             mock.call([u_script, 'git://example.com/foo', '',
                        self.ctx.tenant, '', 'faketests'], env=test_env,
-                      stdout=-1),
+                      stdout=-1, universal_newlines=True,
+                      preexec_fn=shell_handler.limit_child),
             mock.call([b_script, 'git://example.com/foo', 'new_app',
                        self.ctx.tenant, '1-2-3-4', ''], env=test_env,
-                      stdout=-1)]
+                      stdout=-1, universal_newlines=True,
+                      preexec_fn=shell_handler.limit_child)]
         self.assertEqual(expected, mock_popen.call_args_list)
 
         expected = [mock.call(5, 'BUILDING', 'Starting the image build',
@@ -371,7 +430,7 @@ class HandlerTest(base.BaseTestCase):
         self.assertEqual(expected, mock_deploy.call_args_list)
 
     @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     @mock.patch('solum.worker.handlers.shell.update_assembly_status')
     @mock.patch('solum.objects.registry')
     def test_unittest_no_build(self, mock_registry, mock_a_update, mock_popen,
@@ -380,6 +439,7 @@ class HandlerTest(base.BaseTestCase):
         mock_assembly = mock.MagicMock()
         mock_registry.Assembly.get_by_id.return_value = mock_assembly
         mock_popen.return_value.wait.return_value = 1
+        mock_popen.return_value.stdout = six.StringIO()
         test_env = mock_environment()
         mock_get_env.return_value = test_env
         git_info = mock_git_info()
@@ -396,13 +456,388 @@ class HandlerTest(base.BaseTestCase):
         expected = [
             mock.call([u_script, 'git://example.com/foo', '',
                        self.ctx.tenant, '', 'faketests'], env=test_env,
-                      stdout=-1)]
+                      stdout=-1, universal_newlines=True,
+                      preexec_fn=shell_handler.limit_child)]
         self.assertEqual(expected, mock_popen.call_args_list)
 
         expected = [mock.call(self.ctx, 44, 'UNIT_TESTING'),
                     mock.call(self.ctx, 44, 'UNIT_TESTING_FAILED')]
         self.assertEqual(expected, mock_a_update.call_args_list)
 
+    @mock.patch('solum.common.clients.get_clients')
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.deployer.api.API.deploy')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_build_reuses_cached_image(self, mock_popen, mock_deploy,
+                                       mock_b_update, mock_registry,
+                                       mock_get_env, mock_clients):
+        tmp = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('build_cache_file',
+                              os.path.join(tmp, 'cache.db'), group='worker')
+        self.prepare_workspace.return_value = mock.MagicMock(path='/tmp/w')
+        glance = mock_clients.return_value.glance.return_value
+        glance.images.get.return_value = mock.MagicMock(status='active')
+        handler = shell_handler.Handler()
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        fake_glance_id = str(uuid.uuid4())
+        mock_popen.return_value.wait.return_value = 0
+        mock_popen.return_value.stdout = six.StringIO(
+            'built_commit_sha=abc123\ncreated_image_id=%s' % fake_glance_id)
+        mock_get_env.return_value = mock_environment()
+        git_info = mock_git_info()
+        git_info['commit_sha'] = 'abc123'
+        for build_id in (5, 6):
+            handler.build(self.ctx, build_id=build_id, git_info=git_info,
+                          name='new_app', base_image_id='1-2-3-4',
+                          source_format='heroku', image_format='docker',
+                          assembly_id=44, test_cmd=None)
+
+        self.assertEqual(1, mock_popen.call_count)
+        expected = [mock.call(5, 'BUILDING', 'Starting the image build',
+                              None, 44),
+                    mock.call(5, 'COMPLETE', 'built successfully',
+                              fake_glance_id, 44),
+                    mock.call(6, 'COMPLETE', 'reused earlier build',
+                              fake_glance_id, 44)]
+        self.assertEqual(expected, mock_b_update.call_args_list)
+        expected = [mock.call(assembly_id=44, image_id=fake_glance_id)] * 2
+        self.assertEqual(expected, mock_deploy.call_args_list)
+        glance.images.get.assert_called_once_with(fake_glance_id)
+
+    @mock.patch('solum.common.clients.get_clients')
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.deployer.api.API.deploy')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_build_cached_image_gone(self, mock_popen, mock_deploy,
+                                     mock_b_update, mock_registry,
+                                     mock_get_env, mock_clients):
+        tmp = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('build_cache_file',
+                              os.path.join(tmp, 'cache.db'), group='worker')
+        self.prepare_workspace.return_value = mock.MagicMock(path='/tmp/w')
+        glance = mock_clients.return_value.glance.return_value
+        glance.images.get.side_effect = Exception('not found')
+        handler = shell_handler.Handler()
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        mock_get_env.return_value = mock_environment()
+        git_info = mock_git_info()
+        git_info['commit_sha'] = 'abc123'
+        for build_id in (5, 6):
+            mock_popen.return_value.wait.return_value = 0
+            mock_popen.return_value.stdout = six.StringIO(
+                'built_commit_sha=abc123\ncreated_image_id=%s' %
+                uuid.uuid4())
+            handler.build(self.ctx, build_id=build_id, git_info=git_info,
+                          name='new_app', base_image_id='1-2-3-4',
+                          source_format='heroku', image_format='docker',
+                          assembly_id=44, test_cmd=None)
+
+        self.assertEqual(2, mock_popen.call_count)
+        self.assertEqual(2, mock_deploy.call_count)
+
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.deployer.api.API.deploy')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_build_other_commit_not_cached(self, mock_popen, mock_deploy,
+                                           mock_b_update, mock_registry,
+                                           mock_get_env):
+        tmp = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('build_cache_file',
+                              os.path.join(tmp, 'cache.db'), group='worker')
+        self.prepare_workspace.return_value = mock.MagicMock(path='/tmp/w')
+        handler = shell_handler.Handler()
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        mock_get_env.return_value = mock_environment()
+        git_info = mock_git_info()
+        git_info['commit_sha'] = 'abc123'
+        # a language pack that says nothing about what it built, then one
+        # that built another commit than the workspace's
+        for build_id, built in ((5, ''), (6, 'built_commit_sha=def456\n'),
+                                (7, '')):
+            mock_popen.return_value.wait.return_value = 0
+            mock_popen.return_value.stdout = six.StringIO(
+                '%screated_image_id=%s' % (built, uuid.uuid4()))
+            handler.build(self.ctx, build_id=build_id, git_info=git_info,
+                          name='new_app', base_image_id='1-2-3-4',
+                          source_format='heroku', image_format='qcow2',
+                          assembly_id=44, test_cmd=None)
+
+        self.assertEqual(3, mock_popen.call_count)
+        for call in mock_popen.call_args_list:
+            self.assertIn('vm-slug', call[0][0][0])
+        self.assertEqual(3, mock_deploy.call_count)
+
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.deployer.api.API.deploy')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_build_without_workspace_not_cached(self, mock_popen,
+                                                mock_deploy, mock_b_update,
+                                                mock_registry, mock_get_env):
+        tmp = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('build_cache_file',
+                              os.path.join(tmp, 'cache.db'), group='worker')
+        handler = shell_handler.Handler()
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        mock_get_env.return_value = mock_environment()
+        git_info = mock_git_info()
+        git_info['commit_sha'] = 'abc123'
+        for build_id in (5, 6):
+            mock_popen.return_value.wait.return_value = 0
+            mock_popen.return_value.stdout = six.StringIO(
+                'created_image_id=%s' % uuid.uuid4())
+            handler.build(self.ctx, build_id=build_id, git_info=git_info,
+                          name='new_app', base_image_id='1-2-3-4',
+                          source_format='heroku', image_format='docker',
+                          assembly_id=44, test_cmd=None)
+
+        # the checkout failed, so the default branch was built instead
+        self.assertEqual(2, mock_popen.call_count)
+
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.worker.handlers.shell.update_assembly_status')
+    @mock.patch('solum.deployer.api.API.deploy')
+    def test_unittest_and_build_share_workspace(self, mock_deploy,
+                                                mock_a_update,
+                                                mock_b_update, mock_popen,
+                                                mock_registry, mock_get_env):
+        handler = shell_handler.Handler()
+        ws = mock.MagicMock(path='/tmp/solum-build-5')
+        self.prepare_workspace.return_value = ws
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        workspaces = []
+
+        def fake_popen(command, env, **kwargs):
+            workspaces.append(env.get('SOLUM_WORKSPACE'))
+            proc = mock.MagicMock()
+            proc.wait.return_value = 0
+            proc.stdout = six.StringIO('created_image_id=%s' % uuid.uuid4())
+            return proc
+
+        mock_popen.side_effect = fake_popen
+        mock_get_env.side_effect = lambda ctxt: mock_environment()
+        git_info = mock_git_info()
+        git_info['commit_sha'] = 'abc123'
+        handler.build(self.ctx, build_id=5, git_info=git_info, name='new_app',
+                      base_image_id='1-2-3-4', source_format='heroku',
+                      image_format='docker', assembly_id=44,
+                      test_cmd='faketests', source_creds_ref=None)
+
+        self.prepare_workspace.assert_called_once_with(5, git_info, None)
+        self.assertEqual(['/tmp/solum-build-5'] * 2, workspaces)
+        ws.cleanup.assert_called_once_with()
+
+    @mock.patch('solum.worker.git_mirror.GitMirrorCache.get')
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.deployer.api.API.deploy')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_build_uses_git_mirror(self, mock_popen, mock_deploy,
+                                   mock_b_update, mock_registry,
+                                   mock_get_env, mock_mirror):
+        mirrors = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('git_mirror_dir', mirrors, group='worker')
+        mock_mirror.return_value = os.path.join(mirrors, 'abc.git')
+        os.mkdir(mock_mirror.return_value)
+        handler = shell_handler.Handler()
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        mock_popen.return_value.stdout = six.StringIO('')
+        mock_get_env.return_value = mock_environment()
+        handler.build(self.ctx, build_id=5, git_info=mock_git_info(),
+                      name='new_app', base_image_id='1-2-3-4',
+                      source_format='heroku', image_format='docker',
+                      assembly_id=44, test_cmd=None)
+
+        mock_mirror.assert_called_once_with('git://example.com/foo', '')
+        env = mock_popen.call_args[1]['env']
+        self.assertEqual(mock_mirror.return_value, env['GIT_MIRROR'])
+
+    @mock.patch('solum.worker.git_mirror.GitMirrorCache.get')
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.deployer.api.API.deploy')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_build_evicted_git_mirror(self, mock_popen, mock_deploy,
+                                      mock_b_update, mock_registry,
+                                      mock_get_env, mock_mirror):
+        mirrors = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('git_mirror_dir', mirrors, group='worker')
+        mock_mirror.return_value = os.path.join(mirrors, 'abc.git')
+        handler = shell_handler.Handler()
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        mock_popen.return_value.stdout = six.StringIO('')
+        mock_get_env.return_value = mock_environment()
+        handler.build(self.ctx, build_id=5, git_info=mock_git_info(),
+                      name='new_app', base_image_id='1-2-3-4',
+                      source_format='heroku', image_format='docker',
+                      assembly_id=44, test_cmd=None)
+
+        # evicted before the script started, so it clones from the url
+        env = mock_popen.call_args[1]['env']
+        self.assertNotIn('GIT_MIRROR', env)
+
+    @mock.patch('solum.worker.handlers.shell.kill_process_group')
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.deployer.api.API.deploy')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_cancel_running_build(self, mock_popen, mock_deploy,
+                                  mock_b_update, mock_registry, mock_get_env,
+                                  mock_kill):
+        handler = shell_handler.Handler()
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        mock_get_env.return_value = mock_environment()
+        proc = mock.MagicMock()
+        proc.wait.return_value = -15
+        proc.stdout = six.StringIO('')
+
+        def fake_popen(command, **kwargs):
+            handler.cancel(self.ctx, 44, name='other_app')
+            self.assertFalse(handler._builds[5]['cancelled'])
+            handler.cancel(self.ctx, 44, before_build_id=6)
+            return proc
+
+        mock_popen.side_effect = fake_popen
+        handler.build(self.ctx, build_id=5, git_info=mock_git_info(),
+                      name='new_app', base_image_id='1-2-3-4',
+                      source_format='heroku', image_format='docker',
+                      assembly_id=44, test_cmd=None)
+
+        mock_kill.assert_called_once_with(proc)
+        expected = [mock.call(5, 'BUILDING', 'Starting the image build',
+                              None, 44),
+                    mock.call(5, 'CANCELLED', 'build cancelled', None, None)]
+        self.assertEqual(expected, mock_b_update.call_args_list)
+        self.assertFalse(mock_deploy.called)
+        self.assertEqual({}, handler._builds)
+
+    @mock.patch('solum.worker.handlers.shell.process_tree')
+    @mock.patch('eventlet.spawn_after')
+    @mock.patch('os.kill')
+    @mock.patch('os.killpg')
+    def test_kill_process_group(self, mock_killpg, mock_kill,
+                                mock_spawn_after, mock_tree):
+        mock_tree.side_effect = [[1235], [1235], [1236]]
+        proc = mock.MagicMock(pid=1234)
+        shell_handler.kill_process_group(proc, grace=3)
+        mock_killpg.assert_called_once_with(1234, signal.SIGTERM)
+        mock_kill.assert_called_once_with(1235, signal.SIGTERM)
+        self.assertEqual(3, mock_spawn_after.call_args[0][0])
+        mock_killpg.side_effect = OSError()
+        mock_kill.side_effect = OSError()
+        mock_spawn_after.call_args[0][1](signal.SIGKILL)
+        mock_killpg.assert_called_with(1234, signal.SIGKILL)
+        self.assertEqual(
+            [mock.call(1235, signal.SIGKILL), mock.call(1236, signal.SIGKILL)],
+            sorted(mock_kill.call_args_list[1:]))
+
+    @mock.patch('os.listdir')
+    def test_process_tree(self, mock_listdir):
+        stats = {'/proc/10/stat': '10 (build-app) S 1 10',
+                 '/proc/11/stat': '11 (sh) S 10 10',
+                 '/proc/12/stat': '12 (a (weird) name) S 11 12',
+                 '/proc/13/stat': '13 (other) S 1 13'}
+        mock_listdir.return_value = ['10', '11', '12', '13', '14', 'self']
+
+        def fake_open(path):
+            if path not in stats:
+                raise IOError()
+            return io.StringIO(six.text_type(stats[path]))
+
+        with mock.patch('six.moves.builtins.open', side_effect=fake_open):
+            self.assertEqual([11, 12],
+                             sorted(shell_handler.process_tree(10)))
+            self.assertEqual([], shell_handler.process_tree(12))
+
+    @mock.patch('resource.setrlimit')
+    @mock.patch('resource.getrlimit')
+    @mock.patch('os.setsid')
+    def test_limit_child(self, mock_setsid, mock_getrlimit, mock_setrlimit):
+        cfg.CONF.set_override('build_cpu_limit', 600, group='worker')
+        cfg.CONF.set_override('build_memory_limit_mb', 2, group='worker')
+        mock_getrlimit.side_effect = lambda res: {
+            resource.RLIMIT_CPU: (-1, resource.RLIM_INFINITY),
+            resource.RLIMIT_AS: (-1, 1024 * 1024)}[res]
+        shell_handler.limit_child()
+        mock_setsid.assert_called_once_with()
+        self.assertEqual(
+            [mock.call(resource.RLIMIT_CPU, (600, 600)),
+             mock.call(resource.RLIMIT_AS, (1024 * 1024, 1024 * 1024))],
+            mock_setrlimit.call_args_list)
+
+    def test_run_command_timeout(self):
+        cfg.CONF.set_override('build_timeout', 1, group='worker')
+        handler = shell_handler.Handler()
+        with handler._tracked(5, 44, 'new_app'):
+            start = time.time()
+            returncode, image_id = handler._run_command(
+                ['sh', '-c', 'sleep 30 & sleep 30'], os.environ.copy(), 5,
+                'build')
+            self.assertTrue(handler._builds[5]['timed_out'])
+        self.assertEqual(-signal.SIGTERM, returncode)
+        self.assertIsNone(image_id)
+        self.assertTrue(time.time() - start < 10)
+
+    @mock.patch('solum.worker.handlers.shell.kill_process_group')
+    @mock.patch('solum.worker.handlers.shell.Handler._get_environment')
+    @mock.patch('solum.objects.registry')
+    @mock.patch('solum.conductor.api.API.build_job_update')
+    @mock.patch('solum.deployer.api.API.deploy')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_build_timeout(self, mock_popen, mock_deploy, mock_b_update,
+                           mock_registry, mock_get_env, mock_kill):
+        handler = shell_handler.Handler()
+        mock_registry.Assembly.get_by_id.return_value = fakes.FakeAssembly()
+        mock_get_env.return_value = mock_environment()
+        proc = mock.MagicMock()
+        proc.wait.return_value = -15
+        proc.stdout = six.StringIO('created_image_id=%s' % uuid.uuid4())
+
+        def fake_popen(command, **kwargs):
+            handler._timed_out(proc, 5, 'build', 1)
+            return proc
+
+        mock_popen.side_effect = fake_popen
+        handler.build(self.ctx, build_id=5, git_info=mock_git_info(),
+                      name='new_app', base_image_id='1-2-3-4',
+                      source_format='heroku', image_format='docker',
+                      assembly_id=44, test_cmd=None)
+
+        mock_kill.assert_called_once_with(proc)
+        self.assertEqual(mock.call(5, 'ERROR', 'build timed out', None, 44),
+                         mock_b_update.call_args_list[-1])
+        self.assertFalse(mock_deploy.called)
+
+    @mock.patch('solum.worker.handlers.shell.LOG')
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_run_command_streams_output(self, mock_popen, mock_log):
+        handler = shell_handler.Handler()
+        fake_glance_id = str(uuid.uuid4())
+        mock_popen.return_value.wait.return_value = 0
+        mock_popen.return_value.stdout = six.StringIO(
+            'step 1\ncreated_image_id=%s\nstep 2\n' % fake_glance_id)
+        test_env = mock_environment()
+        returncode, image_id = handler._run_command(['build-app'], test_env,
+                                                    5, 'build')
+        self.assertEqual(0, returncode)
+        self.assertEqual(fake_glance_id, image_id)
+        self.assertEqual(3, mock_log.debug.call_count)
+        mock_log.debug.assert_any_call('build 5: step 2')
+        self.assertTrue(mock_popen.return_value.stdout.closed)
+
 
 class TestNotifications(base.BaseTestCase):
     def setUp(self):
@@ -17,11 +17,13 @@ import uuid
 
 import mock
 from oslo.config import cfg
+import six
 
 from solum.tests import base
 from solum.tests import fakes
 from solum.tests import utils
 from solum.tests.worker.handlers import test_shell
+from solum.worker.handlers import shell
 from solum.worker.handlers import shell_nobuild as shell_handler
 
 
@@ -43,7 +45,7 @@ class HandlerTest(base.BaseTestCase):
     @mock.patch('solum.worker.handlers.shell_nobuild.Handler._get_environment')
     @mock.patch('httplib2.Http.request')
     @mock.patch('solum.objects.registry')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     @mock.patch('solum.conductor.api.API.build_job_update')
     @mock.patch('solum.worker.handlers.shell.update_assembly_status')
     @mock.patch('solum.worker.handlers.shell_nobuild.update_assembly_status')
@@ -55,8 +57,8 @@ class HandlerTest(base.BaseTestCase):
         fake_glance_id = str(uuid.uuid4())
         mock_registry.Assembly.get_by_id.return_value = fake_assembly
         mock_popen.return_value.wait.return_value = 0
-        mock_popen.return_value.communicate.return_value = [
-            'foo\ncreated_image_id=%s' % fake_glance_id, None]
+        mock_popen.return_value.stdout = six.StringIO(
+            'foo\ncreated_image_id=%s' % fake_glance_id)
         test_env = test_shell.mock_environment()
         mock_get_env.return_value = test_env
         git_info = test_shell.mock_git_info()
@@ -90,7 +92,8 @@ class HandlerTest(base.BaseTestCase):
         expected = [
             mock.call([u_script, 'git://example.com/foo', '',
                        self.ctx.tenant, '', 'faketests'], env=test_env,
-                      stdout=-1)]
+                      stdout=-1, universal_newlines=True,
+                      preexec_fn=shell.limit_child)]
         self.assertEqual(expected, mock_popen.call_args_list)
 
         # The UNIT_TESTING update happens from shell...
@@ -103,7 +106,7 @@ class HandlerTest(base.BaseTestCase):
 
     @mock.patch('solum.worker.handlers.shell_nobuild.Handler._get_environment')
     @mock.patch('httplib2.Http.request')
-    @mock.patch('subprocess.Popen')
+    @mock.patch('eventlet.green.subprocess.Popen')
     @mock.patch('solum.worker.handlers.shell.update_assembly_status')
     @mock.patch('solum.objects.registry')
     def test_unittest_no_build(self, mock_registry, mock_a_update,
@@ -112,6 +115,7 @@ class HandlerTest(base.BaseTestCase):
         fake_assembly = fakes.FakeAssembly()
         mock_registry.Assembly.get_by_id.return_value = fake_assembly
         mock_popen.return_value.wait.return_value = 1
+        mock_popen.return_value.stdout = six.StringIO()
         test_env = test_shell.mock_environment()
         mock_get_env.return_value = test_env
         git_info = test_shell.mock_git_info()
@@ -145,7 +149,8 @@ class HandlerTest(base.BaseTestCase):
         expected = [
             mock.call([u_script, 'git://example.com/foo', '',
                        self.ctx.tenant, '', 'faketests'], env=test_env,
-                      stdout=-1)]
+                      stdout=-1, universal_newlines=True,
+                      preexec_fn=shell.limit_child)]
         self.assertEqual(expected, mock_popen.call_args_list)
 
         expected = [mock.call(self.ctx, 44, 'UNIT_TESTING'),
@@ -0,0 +1,55 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os.path
+
+import fixtures
+
+from solum.tests import base
+from solum.worker import build_cache
+
+
+BUILD_KEY = ('tenant', 'git://example.com/foo', 'abc123', 'auto',
+             'heroku', 'docker')
+
+
+class TestBuildCache(base.BaseTestCase):
+    def setUp(self):
+        super(TestBuildCache, self).setUp()
+        tmp = self.useFixture(fixtures.TempDir()).path
+        self.cache = build_cache.BuildCache(os.path.join(tmp, 'cache.db'))
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get(BUILD_KEY))
+
+    def test_put_and_get(self):
+        self.cache.put(BUILD_KEY, 'image-1')
+        self.assertEqual('image-1', self.cache.get(BUILD_KEY))
+
+    def test_key_covers_every_input(self):
+        self.cache.put(BUILD_KEY, 'image-1')
+        other_tenant = ('other',) + BUILD_KEY[1:]
+        self.assertIsNone(self.cache.get(other_tenant))
+        other_commit = BUILD_KEY[:2] + ('def456',) + BUILD_KEY[3:]
+        self.assertIsNone(self.cache.get(other_commit))
+
+    def test_disabled(self):
+        cache = build_cache.BuildCache('')
+        cache.put(BUILD_KEY, 'image-1')
+        self.assertIsNone(cache.get(BUILD_KEY))
+
+    def test_unreadable_file_is_a_miss(self):
+        cache = build_cache.BuildCache('/nonexistent/dir/cache.db')
+        cache.put(BUILD_KEY, 'image-1')
+        self.assertIsNone(cache.get(BUILD_KEY))
@@ -0,0 +1,272 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+from eventlet import event
+import mock
+from oslo.config import cfg
+
+from solum.tests import base
+from solum.tests import utils
+from solum.worker import executor
+
+
+class FakeHandler(object):
+    def __init__(self):
+        self.started = []
+        self.gate = event.Event()
+
+    def echo(self, ctxt, message):
+        return message
+
+    def build(self, ctxt, build_id, **kwargs):
+        self.started.append(build_id)
+        self.gate.wait()
+
+    def unittest(self, ctxt, build_id, **kwargs):
+        raise ValueError('boom')
+
+
+class TestBuildExecutor(base.BaseTestCase):
+    def setUp(self):
+        super(TestBuildExecutor, self).setUp()
+        self.ctx = utils.dummy_context()
+
+    def test_sync_methods_pass_through(self):
+        handler = FakeHandler()
+        pool = executor.BuildExecutor(handler, size=2)
+        self.assertEqual('foo', pool.echo(self.ctx, 'foo'))
+        self.assertRaises(AttributeError, getattr, pool, 'target')
+
+    def test_builds_run_concurrently(self):
+        handler = FakeHandler()
+        pool = executor.BuildExecutor(handler, size=2)
+        pool.build(self.ctx, build_id=1)
+        pool.build(self.ctx, build_id=2)
+        eventlet.sleep(0)
+        self.assertEqual([1, 2], handler.started)
+        self.assertEqual(2, pool.running)
+        handler.gate.send()
+        pool.waitall()
+        self.assertEqual(0, pool.running)
+
+    def test_default_size_from_config(self):
+        cfg.CONF.set_override('max_concurrent_builds', 3, group='worker')
+        pool = executor.BuildExecutor(FakeHandler())
+        self.assertEqual(3, pool._pool.size)
+
+    @mock.patch('solum.worker.executor.LOG')
+    def test_job_failure_is_logged(self, mock_log):
+        pool = executor.BuildExecutor(FakeHandler(), size=1)
+        pool.unittest(self.ctx, build_id=1)
+        pool.waitall()
+        self.assertEqual(1, mock_log.exception.call_count)
+
+
+class OrderedHandler(object):
+    def __init__(self):
+        self.started = []
+        self.gates = {}
+
+        self.cancels = []
+        self.dropped = []
+
+    def build(self, ctxt, build_id, **kwargs):
+        self.started.append((ctxt.tenant, build_id))
+        self.gates.setdefault(build_id, event.Event()).wait()
+
+    def cancel(self, ctxt, assembly_id, name=None, before_build_id=None):
+        self.cancels.append((assembly_id, name, before_build_id))
+
+    def cancelled(self, ctxt, build_id, assembly_id):
+        self.dropped.append(build_id)
+
+    def finish(self, build_id):
+        self.gates.setdefault(build_id, event.Event()).send()
+        eventlet.sleep(0)
+
+
+class TestFairShareExecutor(base.BaseTestCase):
+    def setUp(self):
+        super(TestFairShareExecutor, self).setUp()
+        self.busy = utils.dummy_context(tenant_id='busy')
+        self.quiet = utils.dummy_context(tenant_id='quiet')
+        self.handler = OrderedHandler()
+
+    def test_tenants_take_turns(self):
+        pool = executor.FairShareExecutor(self.handler, size=1,
+                                          max_per_tenant=0, queue_size=10,
+                                          weights={})
+        for build_id in range(1, 5):
+            pool.build(self.busy, build_id=build_id)
+        pool.build(self.quiet, build_id=10)
+        pool.build(self.quiet, build_id=11)
+        eventlet.sleep(0)
+        for build_id in (1, 2, 10, 3, 11, 4):
+            self.handler.finish(build_id)
+        pool.waitall()
+        self.assertEqual([('busy', 1), ('busy', 2), ('quiet', 10),
+                          ('busy', 3), ('quiet', 11), ('busy', 4)],
+                         self.handler.started)
+
+    def test_weights(self):
+        pool = executor.FairShareExecutor(self.handler, size=1,
+                                          max_per_tenant=0, queue_size=10,
+                                          weights={'quiet': '2'})
+        pool.build(self.busy, build_id=1)
+        eventlet.sleep(0)
+        for build_id in (2, 3):
+            pool.build(self.busy, build_id=build_id)
+        for build_id in (10, 11, 12):
+            pool.build(self.quiet, build_id=build_id)
+        for build_id in (1, 10, 2, 11, 12, 3):
+            self.handler.finish(build_id)
+        pool.waitall()
+        self.assertEqual([1, 10, 2, 11, 12, 3],
+                         [b for t, b in self.handler.started])
+
+    def test_per_tenant_cap(self):
+        pool = executor.FairShareExecutor(self.handler, size=3,
+                                          max_per_tenant=1, queue_size=10,
+                                          weights={})
+        pool.build(self.busy, build_id=1)
+        pool.build(self.busy, build_id=2)
+        pool.build(self.quiet, build_id=10)
+        eventlet.sleep(0)
+        self.assertEqual([('busy', 1), ('quiet', 10)], self.handler.started)
+        stats = pool.stats()
+        self.assertTrue(stats['tenants']['busy'].pop('waiting') >= 0)
+        self.assertEqual({'queued': 1, 'running': 2,
+                          'tenants': {'busy': {'queued': 1, 'running': 1},
+                                      'quiet': {'queued': 0, 'running': 1,
+                                                'waiting': 0.0}}},
+                         stats)
+        self.handler.finish(1)
+        self.assertEqual(('busy', 2), self.handler.started[-1])
+        for build_id in (2, 10):
+            self.handler.finish(build_id)
+        pool.waitall()
+        self.assertEqual({'queued': 0, 'running': 0, 'tenants': {}},
+                         pool.stats())
+        self.assertEqual({}, pool._finish)
+
+    @mock.patch('time.time')
+    def test_wait_metrics_logged(self, mock_time):
+        mock_time.return_value = 100
+        pool = executor.FairShareExecutor(self.handler, size=1,
+                                          max_per_tenant=0, queue_size=10,
+                                          weights={})
+        pool.build(self.busy, build_id=1)
+        pool.build(self.quiet, build_id=10)
+        eventlet.sleep(0)
+        mock_time.return_value = 130
+        self.assertEqual(30, pool.stats()['tenants']['quiet']['waiting'])
+        with mock.patch.object(executor.LOG, 'info') as mock_info:
+            self.handler.finish(1)
+        self.assertIn('job of tenant quiet after waiting 30.0s',
+                      mock_info.call_args[0][0])
+        self.handler.finish(10)
+        pool.waitall()
+
+    def test_full_queue_blocks_dispatch(self):
+        pool = executor.FairShareExecutor(self.handler, size=1,
+                                          max_per_tenant=0, queue_size=1,
+                                          weights={})
+        pool.build(self.busy, build_id=1)
+        pool.build(self.busy, build_id=2)
+        blocked = eventlet.spawn(pool.build, self.busy, build_id=3)
+        eventlet.sleep(0)
+        self.assertFalse(blocked.dead)
+        self.handler.finish(1)
+        blocked.wait()
+        for build_id in (2, 3):
+            self.handler.finish(build_id)
+        pool.waitall()
+        self.assertEqual([1, 2, 3], [b for t, b in self.handler.started])
+
+    def test_cancel_while_queue_full(self):
+        pool = executor.FairShareExecutor(self.handler, size=1,
+                                          max_per_tenant=0, queue_size=1,
+                                          weights={})
+        pool.build(self.busy, build_id=1, assembly_id=7)
+        pool.build(self.busy, build_id=2, assembly_id=7)
+        blocked = eventlet.spawn(pool.build, self.busy, build_id=3,
+                                 assembly_id=7)
+        eventlet.sleep(0)
+        self.assertFalse(blocked.dead)
+
+        # the cancel does not wait for the full queue to drain
+        pool.cancel(self.busy, 7, before_build_id=4)
+        self.assertEqual([2, 3], sorted(self.handler.dropped))
+        self.assertEqual([(7, None, 4)], self.handler.cancels)
+        self.handler.finish(1)
+        blocked.wait()
+        pool.waitall()
+        self.assertEqual([1], [b for t, b in self.handler.started])
+        self.assertEqual({'queued': 0, 'running': 0, 'tenants': {}},
+                         pool.stats())
+        # the dropped jobs gave their space back
+        pool.build(self.busy, build_id=5)
+        pool.build(self.busy, build_id=6)
+        eventlet.sleep(0)
+        self.handler.finish(5)
+        self.handler.finish(6)
+        pool.waitall()
+        self.assertEqual([1, 5, 6], [b for t, b in self.handler.started])
+
+    def test_defaults_from_config(self):
+        cfg.CONF.set_override('max_builds_per_tenant', 2, group='worker')
+        cfg.CONF.set_override('tenant_build_weights', {'busy': '0.5'},
+                              group='worker')
+        pool = executor.FairShareExecutor(self.handler)
+        self.assertEqual(2, pool.max_per_tenant)
+        self.assertEqual({'busy': 0.5}, pool.weights)
+
+    def test_cancel_drops_queued_jobs(self):
+        pool = executor.FairShareExecutor(self.handler, size=1,
+                                          max_per_tenant=0, queue_size=10,
+                                          weights={})
+        pool.build(self.busy, build_id=1, assembly_id=7, name='web')
+        pool.build(self.busy, build_id=2, assembly_id=7, name='web')
+        pool.build(self.busy, build_id=3, assembly_id=7, name='db')
+        pool.build(self.quiet, build_id=10, assembly_id=8, name='web')
+        pool.build(self.busy, build_id=4, assembly_id=7, name='web')
+        eventlet.sleep(0)
+        pool.cancel(self.busy, 7, name='web', before_build_id=4)
+        self.assertEqual([2], self.handler.dropped)
+        self.assertEqual([(7, 'web', 4)], self.handler.cancels)
+        for build_id in (1, 3, 10, 4):
+            self.handler.finish(build_id)
+        pool.waitall()
+        self.assertEqual([1, 10, 3, 4],
+                         [b for t, b in self.handler.started])
+        self.assertEqual({}, pool._finish)
+
+
+class TestCancelMatches(base.BaseTestCase):
+    job = {'build_id': 5, 'assembly_id': 7, 'name': 'web'}
+
+    def test_assembly(self):
+        self.assertTrue(executor.cancel_matches(self.job, 7))
+        self.assertFalse(executor.cancel_matches(self.job, 8))
+
+    def test_name(self):
+        self.assertTrue(executor.cancel_matches(self.job, 7, name='web'))
+        self.assertFalse(executor.cancel_matches(self.job, 7, name='db'))
+
+    def test_before_build_id(self):
+        self.assertTrue(executor.cancel_matches(self.job, 7,
+                                                before_build_id=6))
+        self.assertFalse(executor.cancel_matches(self.job, 7,
+                                                 before_build_id=5))
@@ -0,0 +1,136 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+
+import fixtures
+import mock
+
+from solum.tests import base
+from solum.worker import git_mirror
+
+
+def _fake_git(command, env=None, cwd=None):
+    # stand in for git clone --mirror by creating the target directory
+    if command[1] == 'clone':
+        os.makedirs(command[-1])
+        with open(os.path.join(command[-1], 'packed'), 'w') as f:
+            f.write('x' * 1024 * 1024)
+
+
+class TestGitMirrorCache(base.BaseTestCase):
+    def setUp(self):
+        super(TestGitMirrorCache, self).setUp()
+        self.root = self.useFixture(fixtures.TempDir()).path
+        self.cache = git_mirror.GitMirrorCache(self.root, 10)
+        patcher = mock.patch.object(git_mirror, 'run_git',
+                                    side_effect=_fake_git)
+        self.git = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_disabled(self):
+        cache = git_mirror.GitMirrorCache('', 10)
+        self.assertIsNone(cache.get('git://example.com/foo'))
+        self.assertFalse(self.git.called)
+
+    def test_clone_then_update(self):
+        path = self.cache.get('git://example.com/foo')
+        self.assertTrue(os.path.isdir(path))
+        self.assertEqual(['git', 'clone', '--mirror',
+                          'git://example.com/foo', path + '.tmp'],
+                         self.git.call_args[0][0])
+        self.assertEqual(path, self.cache.get('git://example.com/foo'))
+        self.assertEqual(['git', '--git-dir', path, 'remote', 'update',
+                          '--prune'], self.git.call_args[0][0])
+
+    def test_keyed_by_private_key(self):
+        public = self.cache.get('git://example.com/foo')
+        private = self.cache.get('git://example.com/foo', 'key')
+        self.assertNotEqual(public, private)
+        env = self.git.call_args[0][1]
+        self.assertIn('GIT_SSH', env)
+        self.assertFalse(os.path.exists(env['GIT_SSH']))
+
+    def test_fetch_failure(self):
+        self.git.side_effect = RuntimeError('boom')
+        self.assertIsNone(self.cache.get('git://example.com/foo'))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.budget = 2 * 1024 * 1024
+        first = self.cache.get('git://example.com/first')
+        second = self.cache.get('git://example.com/second')
+        os.utime(first, (1, 1))
+        third = self.cache.get('git://example.com/third')
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.isdir(second))
+        self.assertTrue(os.path.isdir(third))
+
+    def test_evict_uses_recorded_sizes(self):
+        first = self.cache.get('git://example.com/first')
+        self.assertTrue(os.path.exists(first[:-4] + '.size'))
+        with mock.patch.object(self.cache, '_size',
+                               return_value=0) as mock_size:
+            self.cache.get('git://example.com/second')
+        # only the mirror just fetched is measured
+        self.assertEqual(1, mock_size.call_count)
+
+        self.cache.budget = 0
+        self.cache.evict()
+        self.assertFalse(os.path.exists(first))
+        self.assertFalse(os.path.exists(first[:-4] + '.size'))
+
+    def test_keeps_mirror_in_use(self):
+        self.cache.budget = 0
+        path = self.cache.get('git://example.com/foo')
+        self.assertTrue(os.path.isdir(path))
+
+    def test_keeps_mirror_held_by_another_build(self):
+        self.cache.budget = 1024 * 1024
+        first = self.cache.get('git://example.com/first')
+        with self.cache.hold(first) as held:
+            self.assertTrue(held)
+            # a second build overflows the budget while the first one is
+            # still cloning from its mirror
+            second = self.cache.get('git://example.com/second')
+            self.assertTrue(os.path.isdir(first))
+            self.assertTrue(os.path.isdir(second))
+        self.cache.evict(keep=second)
+        self.assertFalse(os.path.exists(first))
+        self.assertFalse(os.path.exists(first[:-4] + '.use'))
+        self.assertTrue(os.path.isdir(second))
+
+    def test_hold_evicted_mirror(self):
+        self.cache.budget = 0
+        path = self.cache.get('git://example.com/foo')
+        self.cache.evict()
+        with self.cache.hold(path) as held:
+            self.assertFalse(held)
+        with self.cache.hold(None) as held:
+            self.assertFalse(held)
+
+
+class TestRunGit(base.BaseTestCase):
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_run_git(self, mock_popen):
+        mock_popen.return_value.communicate.return_value = ('', None)
+        mock_popen.return_value.returncode = 0
+        git_mirror.run_git(['git', 'status'], cwd='/tmp')
+        self.assertEqual('/tmp', mock_popen.call_args[1]['cwd'])
+
+    @mock.patch('eventlet.green.subprocess.Popen')
+    def test_run_git_failure(self, mock_popen):
+        mock_popen.return_value.communicate.return_value = ('bad\n', None)
+        mock_popen.return_value.returncode = 128
+        self.assertRaises(RuntimeError, git_mirror.run_git,
+                          ['git', 'clone', 'url', 'dest'])
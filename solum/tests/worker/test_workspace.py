@@ -0,0 +1,64 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+
+import fixtures
+import mock
+
+from solum.tests import base
+from solum.worker import workspace
+
+
+class TestWorkspace(base.BaseTestCase):
+    def setUp(self):
+        super(TestWorkspace, self).setUp()
+        self.root = self.useFixture(fixtures.TempDir()).path
+        self.ws = workspace.Workspace(self.root, 5)
+        patcher = mock.patch('solum.worker.git_mirror.run_git')
+        self.git = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_path(self):
+        self.assertEqual(os.path.join(self.root, 'solum-build-5'),
+                         self.ws.path)
+
+    def test_prepare_commit(self):
+        self.assertTrue(self.ws.prepare('git://example.com/foo', 'abc123'))
+        commands = [c[0][0] for c in self.git.call_args_list]
+        self.assertEqual(
+            [['git', 'clone', '--no-checkout', 'git://example.com/foo',
+              self.ws.path],
+             ['git', 'checkout', '-q', '-B', 'solum_build', 'abc123']],
+            commands)
+
+    def test_prepare_from_mirror(self):
+        self.assertTrue(self.ws.prepare('git://example.com/foo', '',
+                                        mirror='/mirrors/foo.git'))
+        commands = [c[0][0] for c in self.git.call_args_list]
+        self.assertEqual('/mirrors/foo.git', commands[0][3])
+        self.assertEqual('HEAD', commands[1][-1])
+        self.assertEqual(['git', 'remote', 'set-url', 'origin',
+                          'git://example.com/foo'], commands[2])
+
+    def test_prepare_failure(self):
+        os.makedirs(self.ws.path)
+        self.git.side_effect = RuntimeError('boom')
+        self.assertFalse(self.ws.prepare('git://example.com/foo', 'abc123'))
+        self.assertFalse(os.path.exists(self.ws.path))
+
+    def test_cleanup(self):
+        os.makedirs(self.ws.path)
+        self.ws.cleanup()
+        self.assertFalse(os.path.exists(self.ws.path))
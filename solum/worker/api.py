@@ -23,6 +23,8 @@ class API(service.API):
     def __init__(self, transport=None, context=None):
         cfg.CONF.import_opt('topic', 'solum.worker.config',
                             group='worker')
+        cfg.CONF.import_opt('control_topic', 'solum.worker.config',
+                            group='worker')
         super(API, self).__init__(transport, context,
                                   topic=cfg.CONF.worker.topic)
 
@@ -34,3 +36,16 @@ class API(service.API):
                    source_format=source_format, image_format=image_format,
                    assembly_id=assembly_id, test_cmd=test_cmd,
                    source_creds_ref=source_creds_ref)
+
+    def cancel(self, assembly_id, name=None, before_build_id=None):
+        """Cancel the queued and running builds of an assembly.
+
+        Every worker is told, as any of them may hold a build. Only
+        builds of the artifact called name, and older than
+        before_build_id, are cancelled when those are given. Cancels go
+        to the control topic, which workers consume even while build
+        dispatch is blocked.
+        """
+        self._fanout_cast(cfg.CONF.worker.control_topic, 'cancel',
+                          assembly_id=assembly_id, name=name,
+                          before_build_id=before_build_id)
@@ -0,0 +1,77 @@
+# Copyright 2014 - Rackspace Hosting
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Persistent cache of finished image builds."""
+
+import hashlib
+import shelve
+
+from oslo.config import cfg
+import six
+
+from solum.openstack.common import lockutils
+from solum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class BuildCache(object):
+    """Map the inputs of a build to the image it created.
+
+    A build key is a tuple of the tenant, the source repository and commit,
+    the base image and the source and image formats, so a repeated build
+    of the same commit can reuse the image instead of building it again.
+    An empty path disables the cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def _digest(build_key):
+        raw = '\n'.join(six.text_type(p or '') for p in build_key)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _lock(self):
+        # Every worker process on a host shares the cache file, so lock
+        # across processes whenever a lock directory is configured.
+        return lockutils.lock('build-cache', lock_file_prefix='solum-',
+                              external=bool(cfg.CONF.lock_path))
+
+    def get(self, build_key):
+        if not self.path:
+            return None
+        try:
+            with self._lock():
+                db = shelve.open(self.path)
+                try:
+                    return db.get(self._digest(build_key))
+                finally:
+                    db.close()
+        except Exception as ex:
+            LOG.warn("Build cache %s unreadable: %s" % (self.path, ex))
+            return None
+
+    def put(self, build_key, created_image_id):
+        if not self.path:
+            return
+        try:
+            with self._lock():
+                db = shelve.open(self.path)
+                try:
+                    db[self._digest(build_key)] = created_image_id
+                finally:
+                    db.close()
+        except Exception as ex:
+            LOG.warn("Build cache %s not updated: %s" % (self.path, ex))
@@ -21,6 +21,11 @@ SERVICE_OPTS = [
     cfg.StrOpt('topic',
                default='solum-worker',
                help='The queue to add build tasks to'),
+    cfg.StrOpt('control_topic',
+               default='solum-worker-control',
+               help='The queue cancel requests are fanned out on. Workers '
+                    'consume it apart from the build queue, so that '
+                    'cancels are handled while builds wait for a slot'),
     cfg.StrOpt('host',
                default='localhost',
                help='The location of the build rpc queue'),
@@ -44,6 +49,64 @@ SERVICE_OPTS = [
     cfg.StrOpt('log_upload_swift_container',
                default='solum-logs',
                help='The name of the Swift container to upload logs to.'),
+    cfg.IntOpt('max_concurrent_builds',
+               default=1,
+               help=('The number of build and unittest jobs a single worker '
+                     'runs at the same time.')),
+    cfg.IntOpt('build_timeout',
+               default=3600,
+               help=('Seconds a unittest or build script may run before it '
+                     'and everything it started are killed. 0 means no '
+                     'timeout.')),
+    cfg.IntOpt('build_cpu_limit',
+               default=0,
+               help=('CPU seconds each process of a build script may use '
+                     '(RLIMIT_CPU). 0 means no limit.')),
+    cfg.IntOpt('build_memory_limit_mb',
+               default=0,
+               help=('Address space in megabytes each process of a build '
+                     'script may use (RLIMIT_AS). 0 means no limit.')),
+    cfg.IntOpt('build_open_files_limit',
+               default=0,
+               help=('Number of files each process of a build script may '
+                     'have open (RLIMIT_NOFILE). 0 keeps the worker\'s '
+                     'limit.')),
+    cfg.IntOpt('max_builds_per_tenant',
+               default=0,
+               help=('The number of build and unittest jobs of a single '
+                     'tenant a worker runs at the same time. 0 means no '
+                     'limit other than max_concurrent_builds.')),
+    cfg.IntOpt('max_queued_builds',
+               default=20,
+               help=('The number of jobs a worker takes off the queue and '
+                     'holds while all its slots are busy, to pick the next '
+                     'one fairly across tenants.')),
+    cfg.DictOpt('tenant_build_weights',
+                default={},
+                help=('Share of the build slots each tenant gets relative '
+                      'to the others while jobs are waiting, as '
+                      'tenant_id:weight pairs. Unlisted tenants have a '
+                      'weight of 1.')),
+    cfg.StrOpt('build_cache_file',
+               default='',
+               help=('File remembering the image built for each commit, so '
+                     'repeated builds of the same commit reuse it. Leave '
+                     'empty to always build.')),
+    cfg.StrOpt('git_mirror_dir',
+               default='',
+               help=('Directory holding bare mirrors of the repositories '
+                     'built on this host, which build scripts clone from '
+                     'instead of the network. Leave empty to always clone '
+                     'from the network.')),
+    cfg.IntOpt('git_mirror_budget_mb',
+               default=10240,
+               help=('Disk space in megabytes the git mirrors may use '
+                     'before the least recently used ones are removed.')),
+    cfg.StrOpt('workspace_dir',
+               default='',
+               help=('Directory for the checkout shared by the unittest and '
+                     'build stages of a build. Defaults to the system '
+                     'temporary directory.')),
 ]
 
 opt_group = cfg.OptGroup(
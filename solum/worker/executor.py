@@ -0,0 +1,274 @@
+# Copyright 2014 - Rackspace Hosting
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Bounded pool for running worker jobs concurrently."""
+
+import collections
+import functools
+import itertools
+import time
+
+import eventlet
+from eventlet import semaphore
+from oslo.config import cfg
+
+import solum
+from solum.common import trace_data
+from solum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+cfg.CONF.import_opt('max_concurrent_builds', 'solum.worker.config',
+                    group='worker')
+cfg.CONF.import_opt('max_builds_per_tenant', 'solum.worker.config',
+                    group='worker')
+cfg.CONF.import_opt('max_queued_builds', 'solum.worker.config',
+                    group='worker')
+cfg.CONF.import_opt('tenant_build_weights', 'solum.worker.config',
+                    group='worker')
+
+
+def cancel_matches(job, assembly_id, name=None, before_build_id=None):
+    """Return whether a cancel request covers the job with these kwargs."""
+    if job.get('assembly_id') != assembly_id:
+        return False
+    if name is not None and job.get('name') != name:
+        return False
+    if before_build_id is not None:
+        return job.get('build_id') < before_build_id
+    return True
+
+
+class BuildExecutor(object):
+    """Wrap a worker handler so that its jobs run on a green thread pool.
+
+    The RPC server dispatches every cast to its endpoints synchronously, so
+    a handler that builds inline consumes one message at a time.  Wrapping
+    the handler makes the long-running methods return as soon as a pool
+    slot is free.  When every slot is busy, dispatch blocks: the message
+    being dispatched has already been taken off the queue, but the server
+    takes no further ones, which stay there for other workers to pick up.
+
+    Every other attribute is proxied to the wrapped handler untouched.
+    """
+
+    async_methods = ('build', 'unittest')
+
+    def __init__(self, handler, size=None):
+        if size is None:
+            size = cfg.CONF.worker.max_concurrent_builds
+        self.handler = handler
+        self.size = size
+        self._pool = eventlet.GreenPool(size)
+
+    def __getattr__(self, name):
+        attr = getattr(self.handler, name)
+        if name in self.async_methods and callable(attr):
+            return functools.partial(self.spawn, attr)
+        return attr
+
+    @property
+    def running(self):
+        """The number of jobs currently holding a pool slot."""
+        return self._pool.running()
+
+    def spawn(self, func, *args, **kwargs):
+        return self._pool.spawn(self._run, func, *args, **kwargs)
+
+    def waitall(self):
+        self._pool.waitall()
+
+    def _run(self, func, *args, **kwargs):
+        # Each job gets its own trace record, so concurrent builds do not
+        # mix their support data.
+        solum.TLS.trace = trace_data.TraceData()
+        try:
+            return func(*args, **kwargs)
+        except Exception as ex:
+            LOG.exception(ex)
+
+
+class FairShareExecutor(BuildExecutor):
+    """A BuildExecutor that shares its slots fairly between tenants.
+
+    Jobs are held in an internal queue per tenant and admitted by
+    weighted fair queuing: every job gets a virtual finish time of
+    1/weight after the later of its tenant's previous job and the job
+    last admitted, and the queued job with the earliest one runs next.
+    A tenant pushing many commits therefore only delays the others by
+    its share of the slots. Tenants at max_per_tenant running jobs are
+    skipped. Once queue_size jobs are waiting, dispatch of the next one
+    blocks until a job starts, as with the plain executor.
+
+    Cancel requests must not wait for that, so solum-worker consumes them
+    on a control topic of their own. A cancel drops the matching queued
+    jobs, and also a matching job whose dispatch is still blocked, which
+    then never enters the queue.
+
+    The queue and wait time of a tenant are logged whenever one of its
+    jobs is queued or started.
+    """
+
+    def __init__(self, handler, size=None, max_per_tenant=None,
+                 queue_size=None, weights=None):
+        super(FairShareExecutor, self).__init__(handler, size)
+        conf = cfg.CONF.worker
+        if max_per_tenant is None:
+            max_per_tenant = conf.max_builds_per_tenant
+        if queue_size is None:
+            queue_size = conf.max_queued_builds
+        if weights is None:
+            weights = conf.tenant_build_weights
+        self.max_per_tenant = max_per_tenant
+        self.weights = dict((t, float(w)) for t, w in weights.items())
+        self._space = semaphore.Semaphore(max(queue_size, 1))
+        self._queues = collections.defaultdict(collections.deque)
+        self._running = collections.defaultdict(int)
+        self._finish = {}
+        self._vtime = 0.0
+        self._seq = itertools.count()
+        self._workers = 0
+        # jobs whose dispatch is blocked on a full queue
+        self._blocked = []
+
+    def stats(self):
+        """Return the queued and running jobs, in total and per tenant.
+
+        'waiting' is how many seconds the oldest queued job of a tenant
+        has been waiting for a slot.
+        """
+        now = time.time()
+        tenants = set(self._queues) | set(self._running)
+        stats = {
+            'queued': sum(len(q) for q in self._queues.values()),
+            'running': sum(self._running.values()),
+            'tenants': {},
+        }
+        for tenant in tenants:
+            queue = self._queues.get(tenant, ())
+            stats['tenants'][tenant] = {
+                'queued': len(queue),
+                'running': self._running.get(tenant, 0),
+                'waiting': now - min(j[1] for j in queue) if queue else 0.0,
+            }
+        return stats
+
+    def _log_stats(self, event, tenant, waited=None):
+        stats = self.stats()
+        tenant_stats = stats['tenants'].get(
+            tenant, {'queued': 0, 'running': 0, 'waiting': 0.0})
+        LOG.info("%(event)s job of tenant %(tenant)s%(waited)s: tenant has "
+                 "%(t_queued)d queued, oldest waiting %(t_waiting).1fs, "
+                 "and %(t_running)d running; %(queued)d queued and "
+                 "%(running)d running in total" %
+                 {'event': event, 'tenant': tenant,
+                  'waited': ('' if waited is None else
+                             ' after waiting %.1fs' % waited),
+                  't_queued': tenant_stats['queued'],
+                  't_waiting': tenant_stats['waiting'],
+                  't_running': tenant_stats['running'],
+                  'queued': stats['queued'], 'running': stats['running']})
+
+    def _forget(self, tenant):
+        # keep no state for tenants with nothing queued or running
+        if tenant not in self._queues and tenant not in self._running:
+            self._finish.pop(tenant, None)
+
+    def spawn(self, func, *args, **kwargs):
+        ctxt = args[0] if args else kwargs.get('ctxt')
+        tenant = getattr(ctxt, 'tenant', None)
+        if not self._space.acquire(blocking=False):
+            blocked = {'ctxt': ctxt, 'kwargs': kwargs, 'cancelled': False}
+            self._blocked.append(blocked)
+            try:
+                self._space.acquire()
+            finally:
+                self._blocked.remove(blocked)
+            if blocked['cancelled']:
+                self._space.release()
+                return
+        tag = (max(self._vtime, self._finish.get(tenant, 0.0)) +
+               1.0 / self.weights.get(tenant, 1.0))
+        self._finish[tenant] = tag
+        # ties go to the job queued first
+        self._queues[tenant].append(((tag, next(self._seq)), time.time(),
+                                     func, args, kwargs))
+        self._log_stats('Queued', tenant)
+        if self._workers < self.size:
+            job = self._next()
+            if job is not None:
+                self._workers += 1
+                self._pool.spawn_n(self._work, *job)
+
+    def cancel(self, ctxt, assembly_id, name=None, before_build_id=None):
+        """Drop the matching queued jobs, then cancel the running ones."""
+        for blocked in self._blocked:
+            if (not blocked['cancelled'] and
+                    cancel_matches(blocked['kwargs'], assembly_id, name,
+                                   before_build_id)):
+                blocked['cancelled'] = True
+                self.handler.cancelled(blocked['ctxt'] or ctxt,
+                                       blocked['kwargs'].get('build_id'),
+                                       assembly_id)
+        for tenant in list(self._queues):
+            queue = self._queues[tenant]
+            for job in list(queue):
+                tag, queued_at, func, args, kwargs = job
+                if cancel_matches(kwargs, assembly_id, name, before_build_id):
+                    queue.remove(job)
+                    self._space.release()
+                    self.handler.cancelled(args[0] if args else ctxt,
+                                           kwargs.get('build_id'),
+                                           assembly_id)
+            if not queue:
+                del self._queues[tenant]
+                self._forget(tenant)
+        self.handler.cancel(ctxt, assembly_id, name, before_build_id)
+
+    def _next(self):
+        """Pop the next job to run, or return None if none may run."""
+        best = None
+        for tenant, queue in self._queues.items():
+            if (self.max_per_tenant and
+                    self._running.get(tenant, 0) >= self.max_per_tenant):
+                continue
+            if best is None or queue[0][0] < self._queues[best][0][0]:
+                best = tenant
+        if best is None:
+            return None
+        (tag, seq), queued_at, func, args, kwargs = (
+            self._queues[best].popleft())
+        if not self._queues[best]:
+            del self._queues[best]
+        self._space.release()
+        self._vtime = tag
+        self._running[best] += 1
+        self._log_stats('Starting', best, time.time() - queued_at)
+        return best, func, args, kwargs
+
+    def _work(self, tenant, func, args, kwargs):
+        # A slot keeps running queued jobs until none may run, so a
+        # finishing job hands its slot straight to the next one.
+        job = (tenant, func, args, kwargs)
+        while job is not None:
+            tenant, func, args, kwargs = job
+            try:
+                self._run(func, *args, **kwargs)
+            finally:
+                self._running[tenant] -= 1
+                if not self._running[tenant]:
+                    del self._running[tenant]
+                    self._forget(tenant)
+            job = self._next()
+        self._workers -= 1
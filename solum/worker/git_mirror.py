@@ -0,0 +1,217 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Host-level cache of bare git mirrors."""
+
+import contextlib
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+
+from eventlet.green import subprocess
+from oslo.config import cfg
+
+from solum.openstack.common import lockutils
+from solum.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+GIT_SSH_SCRIPT = """#!/bin/sh
+exec ssh -i %s -o StrictHostKeyChecking=no \\
+    -o UserKnownHostsFile=/dev/null "$@"
+"""
+
+
+@contextlib.contextmanager
+def git_env(private_key=None):
+    """Yield an environment for git that authenticates with private_key."""
+    env = os.environ.copy()
+    if not private_key:
+        yield env
+        return
+    keydir = tempfile.mkdtemp()
+    try:
+        keyfile = os.path.join(keydir, 'id_rsa')
+        wrapper = os.path.join(keydir, 'ssh')
+        with os.fdopen(os.open(keyfile, os.O_WRONLY | os.O_CREAT, 0o600),
+                       'w') as f:
+            f.write(private_key)
+        with open(wrapper, 'w') as f:
+            f.write(GIT_SSH_SCRIPT % keyfile)
+        os.chmod(wrapper, 0o700)
+        env['GIT_SSH'] = wrapper
+        yield env
+    finally:
+        shutil.rmtree(keydir, ignore_errors=True)
+
+
+def run_git(command, env=None, cwd=None):
+    """Run a git command, raising RuntimeError when it fails."""
+    proc = subprocess.Popen(command, env=env, cwd=cwd,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    out = proc.communicate()[0]
+    if proc.returncode != 0:
+        raise RuntimeError("%s exited with %s: %s" %
+                           (' '.join(command[:3]), proc.returncode,
+                            out.strip()))
+
+
+class GitMirrorCache(object):
+    """Keep a bare mirror of every repository built on this host.
+
+    Build scripts clone from the local mirror instead of the network, so a
+    repository is fetched once per change rather than once per stage and
+    tenant. Mirrors of repositories fetched with a deploy key are keyed by
+    that key too, so they are only handed to builds holding the same key.
+    The least recently used mirrors are removed once the cache grows past
+    budget_mb megabytes, except for those held in use by a checkout or a
+    build script. The size of each mirror is measured after it is fetched
+    and kept beside it, so eviction never walks the mirrors. An empty root
+    disables the cache.
+    """
+
+    def __init__(self, root, budget_mb):
+        self.root = root
+        self.budget = budget_mb * 1024 * 1024
+
+    @staticmethod
+    def _digest(url, private_key):
+        raw = '%s\n%s' % (url, private_key or '')
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _lock(name):
+        # Every worker process on a host shares the mirrors, so lock
+        # across processes whenever a lock directory is configured.
+        return lockutils.lock(name, lock_file_prefix='solum-git-',
+                              external=bool(cfg.CONF.lock_path))
+
+    def get(self, url, private_key=None):
+        """Return the path of an up to date mirror of url.
+
+        Returns None when the cache is disabled or the mirror could not
+        be updated, in which case the caller should use url itself.
+        """
+        if not self.root:
+            return None
+        digest = self._digest(url, private_key)
+        path = os.path.join(self.root, digest + '.git')
+        try:
+            with self._lock(digest):
+                self._fetch(url, path, private_key)
+                os.utime(path, None)
+                self._record_size(path)
+        except Exception as ex:
+            LOG.warn("Could not mirror %s: %s" % (url, ex))
+            return None
+        self.evict(keep=path)
+        return path
+
+    @contextlib.contextmanager
+    def hold(self, path):
+        """Keep the mirror at path from being evicted while in use.
+
+        Every user holds a shared lock on the mirror's .use file, which
+        evict() has to take exclusively. Yields whether the mirror is
+        still there; it may have been evicted since it was returned by
+        get(), in which case the caller should use the url instead.
+        """
+        use = None
+        if path:
+            with self._lock(os.path.basename(path)[:-4]):
+                if os.path.isdir(path):
+                    use = open(path[:-4] + '.use', 'a')
+                    fcntl.flock(use, fcntl.LOCK_SH)
+        try:
+            yield use is not None
+        finally:
+            if use is not None:
+                use.close()
+
+    def _fetch(self, url, path, private_key):
+        with git_env(private_key) as env:
+            if os.path.isdir(path):
+                run_git(['git', '--git-dir', path, 'remote', 'update',
+                         '--prune'], env)
+            else:
+                if not os.path.isdir(self.root):
+                    os.makedirs(self.root)
+                tmp = path + '.tmp'
+                shutil.rmtree(tmp, ignore_errors=True)
+                run_git(['git', 'clone', '--mirror', url, tmp], env)
+                os.rename(tmp, path)
+
+    @staticmethod
+    def _size(path):
+        total = 0
+        for dirpath, dirnames, filenames in os.walk(path):
+            for name in filenames:
+                try:
+                    total += os.lstat(os.path.join(dirpath, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    def _record_size(self, path):
+        size = self._size(path)
+        with open(path[:-4] + '.size', 'w') as f:
+            f.write(str(size))
+        return size
+
+    def _recorded_size(self, path):
+        try:
+            with open(path[:-4] + '.size') as f:
+                return int(f.read())
+        except (IOError, ValueError):
+            # mirrored before sizes were recorded
+            return self._record_size(path)
+
+    def evict(self, keep=None):
+        """Remove least recently used mirrors until within the budget."""
+        with self._lock('evict'):
+            mirrors = []
+            for name in os.listdir(self.root):
+                path = os.path.join(self.root, name)
+                if name.endswith('.git') and os.path.isdir(path):
+                    mirrors.append((os.stat(path).st_mtime, path,
+                                    self._recorded_size(path)))
+            total = sum(m[2] for m in mirrors)
+            for mtime, path, size in sorted(mirrors):
+                if total <= self.budget:
+                    break
+                if path == keep:
+                    continue
+                with self._lock(os.path.basename(path)[:-4]):
+                    if not self._remove(path):
+                        LOG.debug("Git mirror %s is in use" % path)
+                        continue
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        with open(path[:-4] + '.use', 'a') as use:
+            try:
+                fcntl.flock(use, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except IOError:
+                return False
+            LOG.debug("Evicting git mirror %s" % path)
+            shutil.rmtree(path, ignore_errors=True)
+            for suffix in ('.size', '.use'):
+                try:
+                    os.remove(path[:-4] + suffix)
+                except OSError:
+                    pass
+        return True
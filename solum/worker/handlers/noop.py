@@ -40,3 +40,9 @@ class Handler(object):
                     image_format, assembly_id,
                     test_cmd, (source_creds_ref or '')))
         LOG.debug("%s" % message)
+
+    def cancel(self, ctxt, assembly_id, name=None, before_build_id=None):
+        LOG.debug("Cancel %s %s %s" % (assembly_id, name, before_build_id))
+
+    def cancelled(self, ctxt, build_id, assembly_id):
+        LOG.debug("Cancelled %s %s" % (build_id, assembly_id))
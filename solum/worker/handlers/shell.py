@@ -16,18 +16,22 @@
 
 import ast
 import base64
+import collections
+import contextlib
 import json
 import os
+import resource
 import shelve
-import subprocess
+import signal
 
+import eventlet
+from eventlet.green import subprocess
 import httplib2
 from oslo.config import cfg
 
 import solum
 from solum.common import clients
 from solum.common import exception
-from solum.common import solum_keystoneclient
 from solum.conductor import api as conductor_api
 from solum.deployer import api as deployer_api
 from solum.objects import assembly
@@ -37,17 +41,36 @@ from solum.openstack.common import uuidutils
 import solum.uploaders.common as uploader_common
 import solum.uploaders.local as local_uploader
 import solum.uploaders.swift as swift_uploader
+from solum.worker import build_cache
+from solum.worker import executor
+from solum.worker import git_mirror
+from solum.worker import workspace
 
 LOG = logging.getLogger(__name__)
 
 ASSEMBLY_STATES = assembly.States
 IMAGE_STATES = image.States
 
+# seconds a cancelled build script gets to clean up after SIGTERM
+KILL_GRACE = 10
+
 cfg.CONF.import_opt('task_log_dir', 'solum.worker.config', group='worker')
 cfg.CONF.import_opt('proj_dir', 'solum.worker.config', group='worker')
 cfg.CONF.import_opt('log_url_prefix', 'solum.worker.config', group='worker')
 cfg.CONF.import_opt('log_upload_strategy', 'solum.worker.config',
                     group='worker')
+cfg.CONF.import_opt('build_cache_file', 'solum.worker.config',
+                    group='worker')
+cfg.CONF.import_opt('git_mirror_dir', 'solum.worker.config', group='worker')
+cfg.CONF.import_opt('git_mirror_budget_mb', 'solum.worker.config',
+                    group='worker')
+cfg.CONF.import_opt('workspace_dir', 'solum.worker.config', group='worker')
+cfg.CONF.import_opt('build_timeout', 'solum.worker.config', group='worker')
+cfg.CONF.import_opt('build_cpu_limit', 'solum.worker.config', group='worker')
+cfg.CONF.import_opt('build_memory_limit_mb', 'solum.worker.config',
+                    group='worker')
+cfg.CONF.import_opt('build_open_files_limit', 'solum.worker.config',
+                    group='worker')
 
 
 def upload_task_log(ctxt, original_path, assembly_id, build_id, stage):
@@ -77,6 +100,76 @@ def get_assembly_by_id(ctxt, assembly_id):
     return solum.objects.registry.Assembly.get_by_id(ctxt, assembly_id)
 
 
+def limit_child():
+    """Prepare a build script process, between fork and exec.
+
+    The script leads a process group of its own, so everything it
+    starts can be signalled together, and gets the configured rlimits,
+    which every process it starts inherits.
+    """
+    os.setsid()
+    conf = cfg.CONF.worker
+    limits = ((resource.RLIMIT_CPU, conf.build_cpu_limit),
+              (resource.RLIMIT_AS, conf.build_memory_limit_mb * 1024 * 1024),
+              (resource.RLIMIT_NOFILE, conf.build_open_files_limit))
+    for res, value in limits:
+        if value:
+            hard = resource.getrlimit(res)[1]
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            resource.setrlimit(res, (value, value))
+
+
+def process_tree(pid):
+    """Return the pids of every live descendant of pid."""
+    children = collections.defaultdict(list)
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open('/proc/%s/stat' % entry) as f:
+                stat = f.read()
+        except IOError:
+            continue
+        # the command name may contain spaces, so split after it
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children[ppid].append(int(entry))
+    tree = []
+    parents = [pid]
+    while parents:
+        for child in children.get(parents.pop(), ()):
+            tree.append(child)
+            parents.append(child)
+    return tree
+
+
+def kill_process_group(proc, grace=KILL_GRACE):
+    """Terminate everything proc started, killing what is left after grace.
+
+    Besides proc's process group this reaches descendants that moved
+    to a group or session of their own.
+    """
+    pids = set(process_tree(proc.pid))
+
+    def signal_all(sig):
+        try:
+            os.killpg(proc.pid, sig)
+        except OSError:
+            pass
+        for pid in pids | set(process_tree(proc.pid)):
+            try:
+                os.kill(pid, sig)
+            except OSError:
+                pass
+
+    signal_all(signal.SIGTERM)
+    eventlet.spawn_after(grace, signal_all, signal.SIGKILL)
+
+
 def update_assembly_status(ctxt, assembly_id, status):
     # TODO(datsun180b): use conductor to update assembly status
     if assembly_id is None:
@@ -87,13 +180,57 @@ def update_assembly_status(ctxt, assembly_id, status):
 
 
 class Handler(object):
+    def __init__(self):
+        super(Handler, self).__init__()
+        # build_id -> the job's assembly_id and name, its running script
+        # whether it has been cancelled or timed out and the commit it built
+        self._builds = {}
+
     def echo(self, ctxt, message):
         LOG.debug("%s" % message)
 
+    @contextlib.contextmanager
+    def _tracked(self, build_id, assembly_id, name):
+        if build_id in self._builds:
+            yield
+            return
+        self._builds[build_id] = {'build_id': build_id,
+                                  'assembly_id': assembly_id,
+                                  'name': name, 'proc': None,
+                                  'cancelled': False,
+                                  'timed_out': False,
+                                  'built_commit_sha': None}
+        try:
+            yield
+        finally:
+            del self._builds[build_id]
+
+    def _cancelled(self, ctxt, build_id):
+        """Report build_id as cancelled if it was, and return whether."""
+        build = self._builds.get(build_id)
+        if build is None or not build['cancelled']:
+            return False
+        self.cancelled(ctxt, build_id, build['assembly_id'])
+        return True
+
+    def cancel(self, ctxt, assembly_id, name=None, before_build_id=None):
+        """Stop the matching builds of an assembly running here."""
+        for build in self._builds.values():
+            if executor.cancel_matches(build, assembly_id, name,
+                                       before_build_id):
+                LOG.debug("Cancelling build %s" % build['build_id'])
+                build['cancelled'] = True
+                if build['proc'] is not None:
+                    kill_process_group(build['proc'])
+
+    def cancelled(self, ctxt, build_id, assembly_id):
+        # The assembly may be gone, so it is left out of the update.
+        job_update_notification(ctxt, build_id, IMAGE_STATES.CANCELLED,
+                                description='build cancelled')
+
     @exception.wrap_keystone_exception
     def _get_environment(self, ctxt):
-        kc = solum_keystoneclient.KeystoneClientV3(ctxt)
-        image_url = kc.client.service_catalog.url_for(
+        image_url = clients.get_clients(ctxt).url_for(
             service_type='image',
             endpoint_type='publicURL')
 
@@ -112,6 +249,45 @@ class Handler(object):
         user_env['SOLUM_TASK_DIR'] = cfg.CONF.worker.task_log_dir
         return user_env
 
+    @property
+    def build_cache(self):
+        return build_cache.BuildCache(cfg.CONF.worker.build_cache_file)
+
+    @property
+    def git_mirror(self):
+        return git_mirror.GitMirrorCache(cfg.CONF.worker.git_mirror_dir,
+                                         cfg.CONF.worker.git_mirror_budget_mb)
+
+    def _add_source(self, user_env, source_uri, source_creds_ref, ws=None):
+        # Build scripts check out the code from SOLUM_WORKSPACE when it
+        # is set, and otherwise clone from GIT_MIRROR when that is.
+        if ws is not None:
+            user_env['SOLUM_WORKSPACE'] = ws.path
+            return
+        mirror = self._get_git_mirror(source_uri, source_creds_ref)
+        if mirror is not None:
+            user_env['GIT_MIRROR'] = mirror
+
+    def _get_git_mirror(self, source_uri, source_creds_ref):
+        if not cfg.CONF.worker.git_mirror_dir:
+            return None
+        private_key = self._get_private_key(source_creds_ref, source_uri)
+        return self.git_mirror.get(source_uri, private_key)
+
+    def _prepare_workspace(self, build_id, git_info, source_creds_ref):
+        """Check out the source once for every stage of a build."""
+        source_uri = git_info['source_url']
+        ws = workspace.Workspace(cfg.CONF.worker.workspace_dir, build_id)
+        private_key = self._get_private_key(source_creds_ref, source_uri)
+        mirror = None
+        if cfg.CONF.worker.git_mirror_dir:
+            mirror = self.git_mirror.get(source_uri, private_key)
+        with self.git_mirror.hold(mirror) as held:
+            if ws.prepare(source_uri, git_info.get('commit_sha', ''),
+                          private_key, mirror if held else None):
+                return ws
+        return None
+
     @property
     def proj_dir(self):
         if cfg.CONF.worker.proj_dir:
@@ -180,15 +356,125 @@ class Handler(object):
         else:
             LOG.debug("No url or token available to send back status")
 
+    def _run_command(self, command, user_env, build_id, stage):
+        """Run a build script, reading its output as it is produced.
+
+        Output is consumed line by line, so the pipe never fills up and
+        the full output is never held in memory.  Returns the script's
+        return code and the created_image_id it reported, if any.  The
+        commit the script says it built is kept on the tracked build.
+        The script's GIT_MIRROR is held in use until it exits.
+        """
+        with self.git_mirror.hold(user_env.get('GIT_MIRROR')) as held:
+            if not held:
+                user_env.pop('GIT_MIRROR', None)
+            return self._run_script(command, user_env, build_id, stage)
+
+    def _run_script(self, command, user_env, build_id, stage):
+        proc = subprocess.Popen(command, env=user_env,
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True,
+                                preexec_fn=limit_child)
+        build = self._builds.get(build_id)
+        if build is not None:
+            build['proc'] = proc
+            build['built_commit_sha'] = None
+            if build['cancelled']:
+                kill_process_group(proc)
+        timeout = cfg.CONF.worker.build_timeout
+        timer = None
+        if timeout:
+            timer = eventlet.spawn_after(timeout, self._timed_out, proc,
+                                         build_id, stage, timeout)
+        created_image_id = None
+        try:
+            for line in iter(proc.stdout.readline, ''):
+                line = line.rstrip('\n')
+                LOG.debug("%s %s: %s" % (stage, build_id, line))
+                # we expect one line in the output that looks like:
+                # created_image_id=<the glance_id>
+                if 'created_image_id' in line:
+                    solum.TLS.trace.support_info(build_out_line=line)
+                    created_image_id = line.split('=')[-1].strip()
+                # and, from language packs that build the workspace:
+                # built_commit_sha=<the commit archived>
+                elif (line.startswith('built_commit_sha=') and
+                      build is not None):
+                    build['built_commit_sha'] = line.split('=')[-1].strip()
+            proc.stdout.close()
+            returncode = proc.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if build is not None:
+                build['proc'] = None
+        if build is not None and build['timed_out']:
+            created_image_id = None
+        return returncode, created_image_id
+
+    def _timed_out(self, proc, build_id, stage, timeout):
+        LOG.error("%s %s timed out after %s seconds" %
+                  (stage, build_id, timeout))
+        build = self._builds.get(build_id)
+        if build is not None:
+            build['timed_out'] = True
+        kill_process_group(proc)
+
     def build(self, ctxt, build_id, git_info, name, base_image_id,
               source_format, image_format, assembly_id,
               test_cmd, source_creds_ref=None):
 
+        # Only a build pinned to a commit can be reused.
+        commit_sha = git_info.get('commit_sha', '')
+        build_key = (ctxt.tenant, git_info['source_url'], commit_sha,
+                     base_image_id, source_format, image_format)
+        if commit_sha:
+            created_image_id = self.build_cache.get(build_key)
+            if (created_image_id is not None and
+                    self._image_exists(ctxt, created_image_id)):
+                LOG.debug("Reusing image %s built from commit %s" %
+                          (created_image_id, commit_sha))
+                job_update_notification(ctxt, build_id,
+                                        IMAGE_STATES.COMPLETE,
+                                        description='reused earlier build',
+                                        created_image_id=created_image_id,
+                                        assembly_id=assembly_id)
+                deployer_api.API(context=ctxt).deploy(
+                    assembly_id=assembly_id, image_id=created_image_id)
+                return
+
+        with self._tracked(build_id, assembly_id, name):
+            ws = self._prepare_workspace(build_id, git_info,
+                                         source_creds_ref)
+            try:
+                self._build(ctxt, build_id, git_info, name, base_image_id,
+                            source_format, image_format, assembly_id,
+                            test_cmd, source_creds_ref, build_key, ws)
+            finally:
+                if ws is not None:
+                    ws.cleanup()
+
+    def _image_exists(self, ctxt, image_id):
+        """Whether a cached image can still be deployed."""
+        try:
+            img = clients.get_clients(ctxt).glance().images.get(image_id)
+        except Exception as ex:
+            LOG.debug("Cached image %s unusable: %s" % (image_id, ex))
+            return False
+        return getattr(img, 'status', 'active') == 'active'
+
+    def _build(self, ctxt, build_id, git_info, name, base_image_id,
+               source_format, image_format, assembly_id, test_cmd,
+               source_creds_ref, build_key, ws=None):
+        commit_sha = git_info.get('commit_sha', '')
+
         # TODO(datsun180b): This is only temporary, until Mistral becomes our
         # workflow engine.
         if self._run_unittest(ctxt, build_id, git_info, name, base_image_id,
                               source_format, image_format, assembly_id,
-                              test_cmd, source_creds_ref) != 0:
+                              test_cmd, source_creds_ref, ws) != 0:
+            return
+        if self._cancelled(ctxt, build_id):
             return
 
         update_assembly_status(ctxt, assembly_id, ASSEMBLY_STATES.BUILDING)
@@ -211,6 +497,7 @@ class Handler(object):
             job_update_notification(ctxt, build_id, IMAGE_STATES.ERROR,
                                     description=str(env_ex),
                                     assembly_id=assembly_id)
+        self._add_source(user_env, source_uri, source_creds_ref, ws)
 
         log_env = user_env.copy()
         if 'OS_AUTH_TOKEN' in log_env:
@@ -224,34 +511,37 @@ class Handler(object):
         logpath = "%s/%s.log" % (user_env['SOLUM_TASK_DIR'],
                                  user_env['BUILD_ID'])
         LOG.debug("Build logs stored at %s" % logpath)
-        out = None
         try:
-            out = subprocess.Popen(build_cmd,
-                                   env=user_env,
-                                   stdout=subprocess.PIPE).communicate()[0]
+            returncode, created_image_id = self._run_command(
+                build_cmd, user_env, build_id, 'build')
         except OSError as subex:
             LOG.exception(subex)
             job_update_notification(ctxt, build_id, IMAGE_STATES.ERROR,
                                     description=subex, assembly_id=assembly_id)
             return
+        if self._cancelled(ctxt, build_id):
+            return
+        if returncode != 0:
+            LOG.error("Build failed. Return code is %r" % returncode)
 
         assem = get_assembly_by_id(ctxt, assembly_id)
         assembly_uuid = assem.uuid
         upload_task_log(ctxt, logpath, assembly_uuid, user_env['BUILD_ID'],
                         'build')
 
-        # we expect one line in the output that looks like:
-        # created_image_id=<the glance_id>
-        created_image_id = None
-        for line in out.split('\n'):
-            if 'created_image_id' in line:
-                solum.TLS.trace.support_info(build_out_line=line)
-                created_image_id = line.split('=')[-1].strip()
         if not uuidutils.is_uuid_like(created_image_id):
+            description = 'image not created'
+            if self._builds.get(build_id, {}).get('timed_out'):
+                description = 'build timed out'
             job_update_notification(ctxt, build_id, IMAGE_STATES.ERROR,
-                                    description='image not created',
+                                    description=description,
                                     assembly_id=assembly_id)
             return
+        # Only language packs that report the commit they built are known
+        # to have used the workspace rather than cloning a branch themselves.
+        built = self._builds.get(build_id, {}).get('built_commit_sha')
+        if commit_sha and ws is not None and built == commit_sha:
+            self.build_cache.put(build_key, created_image_id)
         job_update_notification(ctxt, build_id, IMAGE_STATES.COMPLETE,
                                 description='built successfully',
                                 created_image_id=created_image_id,
@@ -262,7 +552,15 @@ class Handler(object):
 
     def _run_unittest(self, ctxt, build_id, git_info, name, base_image_id,
                       source_format, image_format, assembly_id,
-                      test_cmd, source_creds_ref=None):
+                      test_cmd, source_creds_ref=None, ws=None):
+        with self._tracked(build_id, assembly_id, name):
+            return self._unittest(ctxt, build_id, git_info, name,
+                                  base_image_id, source_format, image_format,
+                                  assembly_id, test_cmd, source_creds_ref, ws)
+
+    def _unittest(self, ctxt, build_id, git_info, name, base_image_id,
+                  source_format, image_format, assembly_id, test_cmd,
+                  source_creds_ref, ws):
         if test_cmd is None:
             LOG.debug("Unit test command is None; skipping unittests.")
             return 0
@@ -283,6 +581,7 @@ class Handler(object):
         solum.TLS.trace.import_context(ctxt)
 
         user_env = self._get_environment(ctxt)
+        self._add_source(user_env, git_url, source_creds_ref, ws)
         log_env = user_env.copy()
         if 'OS_AUTH_TOKEN' in log_env:
             del log_env['OS_AUTH_TOKEN']
@@ -294,12 +593,13 @@ class Handler(object):
 
         returncode = -1
         try:
-            runtest = subprocess.Popen(command, env=user_env,
-                                       stdout=subprocess.PIPE)
-            returncode = runtest.wait()
+            returncode = self._run_command(command, user_env, build_id,
+                                           'unittest')[0]
         except OSError as subex:
             LOG.exception("Exception running unit tests:")
             LOG.exception(subex)
+        if self._cancelled(ctxt, build_id):
+            return -1
 
         assem = get_assembly_by_id(ctxt, assembly_id)
         assembly_uuid = assem.uuid
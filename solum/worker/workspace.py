@@ -0,0 +1,68 @@
+# Copyright 2014 - Rackspace Hosting
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Checkout shared by the stages of one build."""
+
+import os
+import shutil
+import tempfile
+
+from solum.openstack.common import log as logging
+from solum.worker import git_mirror
+
+LOG = logging.getLogger(__name__)
+
+BRANCH = 'solum_build'
+
+
+class Workspace(object):
+    """A checkout of the commit being built, made once per build.
+
+    The unittest and build scripts both clone from it, so the image is
+    built from exactly the commit that was tested. The checkout is on
+    the BRANCH branch, which a clone of the workspace checks out too.
+    """
+
+    def __init__(self, root, build_id):
+        self.path = os.path.join(root or tempfile.gettempdir(),
+                                 'solum-build-%s' % build_id)
+
+    def prepare(self, source_url, commit_sha='', private_key=None,
+                mirror=None):
+        """Check out commit_sha, or the default branch when it is empty.
+
+        Clones from mirror when one is given. Returns False when the
+        checkout failed, leaving the scripts to clone for themselves.
+        """
+        self.cleanup()
+        try:
+            with git_mirror.git_env(private_key) as env:
+                git_mirror.run_git(['git', 'clone', '--no-checkout',
+                                    mirror or source_url, self.path], env)
+                git_mirror.run_git(['git', 'checkout', '-q', '-B', BRANCH,
+                                    commit_sha or 'HEAD'], env,
+                                   cwd=self.path)
+                if mirror:
+                    git_mirror.run_git(['git', 'remote', 'set-url',
+                                        'origin', source_url], env,
+                                       cwd=self.path)
+        except Exception as ex:
+            LOG.warn("Could not check out %s %s: %s" %
+                     (source_url, commit_sha, ex))
+            self.cleanup()
+            return False
+        return True
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)